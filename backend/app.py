@@ -15,9 +15,14 @@ load_dotenv()
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.infrastructure.config.app_config import AppConfig
+from src.infrastructure.service_container import ServiceContainer
 from src.presentation.controllers.raw_data_controller import raw_data_bp
 from src.presentation.controllers.market_data_controller import market_data_bp
 from src.presentation.controllers.data_upload_controller import data_upload_bp
+from src.presentation.controllers.admin_controller import admin_bp
+from src.presentation.middleware.compression import CompressionMiddleware
+from src.presentation.middleware.request_decompression import RequestDecompressionMiddleware
+from src.presentation.serializers.json_provider import configure_json_provider
 
 
 def create_app() -> Flask:
@@ -30,13 +35,30 @@ def create_app() -> Flask:
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
     )
     
+    # Use the native JSON encoder when available
+    configure_json_provider(app)
+    
     # Configure CORS
     CORS(app, origins=AppConfig.CORS_ORIGINS)
     
+    # Services and repositories are created once per process
+    service_container = ServiceContainer()
+    service_container.init_app(app)
+    service_container.start_background_tasks()
+    
+    # Configure response compression
+    if AppConfig.COMPRESSION_ENABLED:
+        CompressionMiddleware(app)
+    
+    # Decode compressed request bodies
+    if AppConfig.REQUEST_DECOMPRESSION_ENABLED:
+        RequestDecompressionMiddleware(app)
+    
     # Register blueprints
     app.register_blueprint(raw_data_bp)
     app.register_blueprint(market_data_bp)
     app.register_blueprint(data_upload_bp)
+    app.register_blueprint(admin_bp)
     
     # Health check endpoint
     @app.route('/api/health', methods=['GET'])
@@ -70,12 +92,22 @@ def create_app() -> Flask:
                 '/api/raw-data/categories',
                 '/api/raw-data/funds/<catalog>',
                 '/api/raw-data/download',
+                '/api/raw-data/export',
                 '/api/market-data/securities',
+                '/api/market-data/securities/search',
                 '/api/market-data/fields/<security>',
                 '/api/market-data/download',
+                '/api/market-data/download/bulk',
+                '/api/market-data/export',
                 '/api/data-upload/upload',
                 '/api/data-upload/types',
-                '/api/data-upload/status/<upload_id>'
+                '/api/data-upload/status/<upload_id>',
+                '/api/data-upload/sessions',
+                '/api/data-upload/sessions/<session_id>',
+                '/api/data-upload/sessions/<session_id>/chunks/<chunk_index>',
+                '/api/data-upload/sessions/<session_id>/commit',
+                '/api/admin/cache/invalidate',
+                '/api/admin/nifi/metrics'
             ]
         })
     
@@ -91,12 +123,22 @@ def create_app() -> Flask:
                 '/api/raw-data/categories',
                 '/api/raw-data/funds/<catalog>',
                 '/api/raw-data/download',
+                '/api/raw-data/export',
                 '/api/market-data/securities',
+                '/api/market-data/securities/search',
                 '/api/market-data/fields/<security>',
                 '/api/market-data/download',
+                '/api/market-data/download/bulk',
+                '/api/market-data/export',
                 '/api/data-upload/upload',
                 '/api/data-upload/types',
-                '/api/data-upload/status/<upload_id>'
+                '/api/data-upload/status/<upload_id>',
+                '/api/data-upload/sessions',
+                '/api/data-upload/sessions/<session_id>',
+                '/api/data-upload/sessions/<session_id>/chunks/<chunk_index>',
+                '/api/data-upload/sessions/<session_id>/commit',
+                '/api/admin/cache/invalidate',
+                '/api/admin/nifi/metrics'
             ]
         })
     
@@ -1,7 +1,7 @@
 """
 Data Transfer Objects for API communication.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import List, Any, Dict, Optional
 
@@ -19,6 +19,14 @@ class FundDto:
     catalog: str
 
 
+@dataclass
+class FundListDto:
+    """DTO for the fund list of a catalog with its freshness."""
+    catalog: str
+    funds: List[str]
+    refreshed_at: Optional[str]  # ISO timestamp (UTC) the list was last refreshed
+
+
 @dataclass
 class RawDataDownloadRequestDto:
     """DTO for raw data download request."""
@@ -26,6 +34,12 @@ class RawDataDownloadRequestDto:
     fund: str
     start_date: str  # ISO format date string
     end_date: str    # ISO format date string
+    columns: Optional[List[str]] = None               # Columns to return, all when omitted
+    filters: Optional[List[Dict[str, Any]]] = None    # {"column", "op": eq|in|range, "value"|"values"|"min"/"max"}
+    order_by: Optional[List[Dict[str, Any]]] = None   # {"column", "direction": asc|desc}
+    limit: Optional[int] = None                       # Maximum number of rows
+    date_format: str = 'iso'                          # iso strings or epoch milliseconds
+    native_types: bool = False                        # Keep driver value types, e.g. for Excel encoding
 
 
 @dataclass
@@ -39,6 +53,8 @@ class DataFieldDto:
     """DTO for data field information."""
     field: str
     security: str
+    min_date: Optional[str] = None  # ISO date of the first available value, if known
+    max_date: Optional[str] = None  # ISO date of the last available value, if known
 
 
 @dataclass
@@ -50,6 +66,23 @@ class MarketDataDownloadRequestDto:
     end_date: str    # ISO format date string
 
 
+@dataclass
+class BulkMarketDataDownloadRequestDto:
+    """DTO for a bulk market data download over several securities and fields."""
+    securities: List[str]
+    fields: List[str]
+    start_date: str  # ISO format date string
+    end_date: str    # ISO format date string
+
+
+@dataclass
+class MarketDataSeriesDto:
+    """DTO for the records of one (security, field) pair."""
+    security: str
+    field: str
+    data: List[Dict[str, Any]]  # Records with date and value, ordered by date
+
+
 @dataclass
 class DataRecordDto:
     """DTO for generic data record."""
@@ -62,4 +95,105 @@ class BatchedDataResponseDto:
     batch_id: int
     total_batches: int
     data: List[Dict[str, Any]]
-    has_more: bool
\ No newline at end of file
+    has_more: bool
+    snapshot_id: Optional[str] = None  # Snapshot the batch was served from, if any
+
+
+@dataclass
+class KeysetPageResponseDto:
+    """DTO for a keyset-paginated data response."""
+    data: List[Dict[str, Any]]
+    has_more: bool
+    continuation_token: Optional[str]
+    total_records: Optional[int]
+    total_batches: Optional[int]
+
+
+@dataclass
+class DataUploadRequestDto:
+    """DTO for a data upload from the Excel add-in."""
+    data_type: str
+    data: List[Any]                      # Record objects, or row arrays when columns is set
+    skip_duplicate_check: bool = False
+    delivery_date: Optional[str] = None
+    columns: Optional[List[str]] = None  # Column names of a columnar upload
+
+
+@dataclass
+class UploadTypeDto:
+    """DTO for an upload type and the columns its sheets must have."""
+    id: str
+    name: str
+    description: str
+    columns: List[Dict[str, Any]]  # name, type and required per column
+
+
+@dataclass
+class UploadJobDto:
+    """DTO for the state of an asynchronous upload."""
+    upload_id: str
+    status: str                     # queued | sending | done | failed
+    data_type: str
+    record_count: int
+    created_at: str                 # ISO timestamps (UTC)
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    queue_seconds: Optional[float] = None
+    send_seconds: Optional[float] = None
+    nifi_status: Optional[int] = None
+    error: Optional[str] = None
+    details: Optional[str] = None
+    chunk_count: Optional[int] = None  # Chunks the records are forwarded in, once sending
+    chunks_sent: int = 0
+    failed_chunks: List[int] = field(default_factory=list)
+    duplicate_count: Optional[int] = None  # Records already uploaded before, None when not checked
+    duplicate_rows: List[int] = field(default_factory=list)
+    repeated_count: Optional[int] = None  # Records repeating an earlier record of the upload, None when not checked
+    repeated_rows: List[int] = field(default_factory=list)
+    forwarded_count: Optional[int] = None  # Records NiFi accepted, once finished
+
+
+@dataclass
+class UploadSessionRequestDto:
+    """DTO for opening a resumable upload session."""
+    data_type: str
+    chunk_count: int
+    upload_format: str = 'records'       # records or columnar
+    columns: Optional[List[str]] = None  # Column names of a columnar upload
+    skip_duplicate_check: bool = False
+    delivery_date: Optional[str] = None
+
+
+@dataclass
+class UploadSessionChunkDto:
+    """DTO for a received chunk of an upload session."""
+    chunk_index: int
+    digest: str                     # SHA-256 of the chunk body, hex
+    record_count: int
+    size_bytes: int
+
+
+@dataclass
+class UploadSessionDto:
+    """DTO for the state of a resumable upload session."""
+    session_id: str
+    status: str                     # open | committed
+    data_type: str
+    upload_format: str
+    chunk_count: int
+    created_at: str                 # ISO timestamps (UTC)
+    expires_at: str
+    received_chunks: List[UploadSessionChunkDto] = field(default_factory=list)
+    missing_chunks: List[int] = field(default_factory=list)
+    record_count: int = 0           # Records in the received chunks
+    upload_id: Optional[str] = None  # Upload of the latest commit
+    committed_at: Optional[str] = None
+
+
+@dataclass
+class UploadSessionCommitDto:
+    """DTO for the result of committing an upload session."""
+    session_id: str
+    upload_id: str
+    upload: Optional[UploadJobDto]  # Current state of the upload, None once it was purged
+    replayed: bool = False          # True when the idempotency key was committed before
@@ -0,0 +1,317 @@
+"""
+Application service for data uploads forwarded to NiFi.
+"""
+from dataclasses import replace
+from datetime import datetime, timedelta
+from typing import Any, List, Optional, Set, Tuple
+import logging
+import uuid
+
+from ..dtos.data_dtos import DataUploadRequestDto, UploadJobDto, UploadTypeDto
+from ...domain.entities.data_upload import (
+    UploadJob, UPLOAD_QUEUED, UPLOAD_DONE, UPLOAD_FAILED, UPLOAD_FORMAT_RECORDS, UPLOAD_FORMATS,
+    DUPLICATES_DROP, DUPLICATES_OFF, DUPLICATE_MODES
+)
+from ...domain.repositories.upload_fingerprint_repository import IUploadFingerprintRepository
+from ...domain.repositories.upload_job_repository import IUploadJobRepository
+from ...domain.services.record_fingerprint import fingerprint_records
+from ...infrastructure.nifi.upload_payload import UploadPayloadBuilder
+from ...infrastructure.uploads.chunked_forwarder import ChunkedForwarder, ChunkedForwardResult
+from ...infrastructure.uploads.upload_schema_registry import UploadSchemaRegistry
+from ...infrastructure.uploads.upload_worker_pool import UploadWorkerPool
+
+logger = logging.getLogger(__name__)
+
+# Duplicate record indexes kept on the job for the status response
+MAX_REPORTED_DUPLICATES = 1000
+
+
+class DataUploadService:
+    """
+    Accepts uploads and forwards them to NiFi on background workers.
+    
+    submit_upload validates and queues an upload and returns immediately; records are
+    checked and coerced against the schema of their type, so invalid values are reported
+    to the client with the request instead of being rejected by NiFi later. The job
+    state is kept in the job repository so that get_upload_status can report it.
+    Each job is forwarded in chunks by the chunked forwarder, as per-record objects or
+    in the columnar format depending on nifi_format.
+    
+    Unless the upload sets skip_duplicate_check, records are fingerprinted and checked
+    against the fingerprint repository before forwarding; records uploaded before are
+    dropped or only reported depending on duplicate_mode. The check reserves the new
+    fingerprints, so a concurrent upload of the same records (a double click, a client
+    retry) finds them as duplicates while this one is still being sent. Records repeating
+    an earlier record of the same upload are only reported, unless drop_repeated is set,
+    since a sheet may legitimately contain identical rows. Fingerprints are stored once
+    NiFi accepted the records and the reservations of undelivered records are released,
+    so a failed upload can be retried.
+    """
+    
+    def __init__(self, job_repository: IUploadJobRepository, worker_pool: UploadWorkerPool,
+                 forwarder: ChunkedForwarder, nifi_format: str = UPLOAD_FORMAT_RECORDS,
+                 fingerprint_repository: IUploadFingerprintRepository = None,
+                 duplicate_mode: str = DUPLICATES_DROP, schema_registry: UploadSchemaRegistry = None,
+                 drop_repeated: bool = False):
+        if nifi_format not in UPLOAD_FORMATS:
+            raise ValueError(f"Unsupported NiFi upload format '{nifi_format}'")
+        if duplicate_mode not in DUPLICATE_MODES:
+            raise ValueError(f"Unsupported duplicate mode '{duplicate_mode}'")
+        self._jobs = job_repository
+        self._workers = worker_pool
+        self._forwarder = forwarder
+        self._nifi_format = nifi_format
+        self._fingerprints = fingerprint_repository
+        self._duplicate_mode = duplicate_mode
+        self._drop_repeated = drop_repeated
+        self._schemas = schema_registry
+    
+    def recover(self, retention_seconds: int) -> None:
+        """Fail jobs interrupted by a restart and purge old finished jobs."""
+        now = datetime.utcnow()
+        interrupted = self._jobs.fail_unfinished('Upload interrupted by a server restart', now)
+        if interrupted:
+            logger.warning(f"Marked {interrupted} interrupted uploads as failed")
+        purged = self._jobs.purge_finished(now - timedelta(seconds=retention_seconds))
+        if purged:
+            logger.info(f"Purged {purged} finished uploads")
+    
+    def submit_upload(self, request_dto: DataUploadRequestDto) -> UploadJobDto:
+        """
+        Validate an upload and queue it for forwarding to NiFi.
+        
+        Raises:
+            ValueError: If the data type is unknown, a record is not an object, or a columnar row does
+                not match the columns
+            UploadValidationError: If values do not match the schema of the data type
+            UploadQueueFullError: If the upload queue has no capacity left
+        """
+        if request_dto.columns is not None:
+            self._validate_columnar(request_dto.columns, request_dto.data)
+        else:
+            for i, record in enumerate(request_dto.data):
+                if not isinstance(record, dict):
+                    raise ValueError(f'Invalid record format at index {i}')
+        
+        # Duplicates are scoped by the type's id, whether its id or its display name was sent
+        scope_type = request_dto.data_type
+        if self._schemas is not None:
+            scope_type, data, columns = self._schemas.validate(
+                request_dto.data_type, request_dto.data, request_dto.columns
+            )
+            request_dto = replace(request_dto, data=data, columns=columns)
+        
+        job = UploadJob(
+            upload_id=uuid.uuid4().hex,
+            data_type=request_dto.data_type,
+            record_count=len(request_dto.data),
+            status=UPLOAD_QUEUED,
+            created_at=datetime.utcnow()
+        )
+        self._jobs.create(job)
+        
+        try:
+            self._workers.submit(lambda: self._forward(job, request_dto, scope_type))
+        except Exception as e:
+            self._jobs.mark_finished(job.upload_id, UPLOAD_FAILED, datetime.utcnow(), error=str(e))
+            raise
+        
+        logger.info(f"Queued upload {job.upload_id}: type={job.data_type}, records={job.record_count}")
+        return self._to_dto(job)
+    
+    def is_known_data_type(self, data_type: str) -> bool:
+        """Check whether uploads of a data type are accepted."""
+        return self._schemas is None or self._schemas.get(data_type) is not None
+    
+    def get_upload_types(self) -> List[UploadTypeDto]:
+        """Get the upload types with their columns."""
+        if self._schemas is None:
+            return []
+        return [
+            UploadTypeDto(
+                id=schema.id,
+                name=schema.name,
+                description=schema.description,
+                columns=[
+                    {'name': column.name, 'type': column.type, 'required': column.required}
+                    for column in schema.columns
+                ]
+            )
+            for schema in self._schemas.schemas
+        ]
+    
+    def get_upload_status(self, upload_id: str) -> Optional[UploadJobDto]:
+        """Get the state of an upload, or None if it is unknown."""
+        job = self._jobs.get(upload_id)
+        return self._to_dto(job) if job is not None else None
+    
+    def _forward(self, job: UploadJob, request_dto: DataUploadRequestDto, scope_type: str) -> None:
+        """Check an upload for duplicates, forward it to NiFi and record the outcome; runs on a worker thread."""
+        upload_id = job.upload_id
+        data = request_dto.data
+        record_indexes = None
+        fingerprints = None
+        reserved = None
+        try:
+            if self._check_duplicates(request_dto):
+                fingerprints = fingerprint_records(data, request_dto.columns)
+                duplicates, repeated, reserved = self._reserve_fingerprints(request_dto, scope_type, fingerprints)
+                self._jobs.record_duplicates(
+                    upload_id, len(duplicates), duplicates[:MAX_REPORTED_DUPLICATES],
+                    len(repeated), repeated[:MAX_REPORTED_DUPLICATES]
+                )
+                dropped = set()
+                if self._duplicate_mode == DUPLICATES_DROP:
+                    dropped.update(duplicates)
+                    if self._drop_repeated:
+                        dropped.update(repeated)
+                if dropped:
+                    record_indexes = [i for i in range(len(data)) if i not in dropped]
+                    data = [data[i] for i in record_indexes]
+                    fingerprints = [fingerprints[i] for i in record_indexes]
+                    logger.info(f"Dropped {len(dropped)} duplicate records of upload {upload_id}")
+            
+            record_count = len(data)
+            if not record_count:
+                self._jobs.mark_sending(upload_id, datetime.utcnow(), 0)
+                self._jobs.mark_finished(upload_id, UPLOAD_DONE, datetime.utcnow(), forwarded_count=0)
+                logger.info(f"Upload {upload_id} contained only duplicate records, nothing forwarded")
+                return
+            
+            self._jobs.mark_sending(upload_id, datetime.utcnow(), self._forwarder.chunk_count(record_count))
+            payloads = UploadPayloadBuilder(
+                data_type=request_dto.data_type,
+                data=data,
+                upload_timestamp=job.created_at.isoformat(),
+                skip_duplicate_check=request_dto.skip_duplicate_check,
+                delivery_date=request_dto.delivery_date,
+                columns=request_dto.columns,
+                output_format=self._nifi_format,
+                record_indexes=record_indexes
+            )
+            result = self._forwarder.forward(
+                upload_id, record_count, payloads.build,
+                on_chunk_sent=lambda chunk_index: self._jobs.record_chunk_sent(upload_id)
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error forwarding upload {upload_id}: {e}")
+            if reserved:
+                self._fingerprints.release(scope_type, request_dto.delivery_date, reserved)
+            self._jobs.mark_finished(
+                upload_id, UPLOAD_FAILED, datetime.utcnow(), error='Internal error during upload processing'
+            )
+            return
+        
+        if fingerprints is not None:
+            # Only records NiFi accepted count as uploaded
+            self._remember_fingerprints(request_dto, scope_type, fingerprints, reserved, result)
+        
+        if not result.succeeded:
+            first = result.failures[0]
+            if result.chunk_count == 1:
+                error = first.error
+            else:
+                error = f'{len(result.failures)} of {result.chunk_count} chunks failed: {first.error}'
+            details = '; '.join(
+                f'chunk {failure.chunk_index}: {failure.details or failure.error}' for failure in result.failures
+            )
+            self._jobs.mark_finished(
+                upload_id, UPLOAD_FAILED, datetime.utcnow(), nifi_status=result.nifi_status,
+                error=error, details=details[:2000],
+                failed_chunks=[failure.chunk_index for failure in result.failures],
+                forwarded_count=self._delivered_count(record_count, result)
+            )
+            return
+        
+        logger.info(f"Successfully forwarded {record_count} records of upload {upload_id} to NiFi "
+                    f"in {result.chunk_count} chunks")
+        self._jobs.mark_finished(
+            upload_id, UPLOAD_DONE, datetime.utcnow(), nifi_status=result.nifi_status, forwarded_count=record_count
+        )
+    
+    def _check_duplicates(self, request_dto: DataUploadRequestDto) -> bool:
+        return (self._fingerprints is not None and self._duplicate_mode != DUPLICATES_OFF
+                and not request_dto.skip_duplicate_check)
+    
+    def _reserve_fingerprints(self, request_dto: DataUploadRequestDto, scope_type: str,
+                              fingerprints: List[bytes]) -> Tuple[List[int], List[int], Set[bytes]]:
+        """
+        Reserve the fingerprints of an upload and find its duplicates.
+        
+        Returns the indexes of records uploaded before or by an upload still in progress, the
+        indexes of records repeating an earlier record of this upload, and the reserved fingerprints.
+        """
+        unique = list(dict.fromkeys(fingerprints))
+        taken = self._fingerprints.reserve(scope_type, request_dto.delivery_date, unique)
+        seen = set()
+        duplicates = []
+        repeated = []
+        for i, fingerprint in enumerate(fingerprints):
+            if fingerprint in taken:
+                duplicates.append(i)
+            elif fingerprint in seen:
+                repeated.append(i)
+            else:
+                seen.add(fingerprint)
+        return duplicates, repeated, seen
+    
+    def _remember_fingerprints(self, request_dto: DataUploadRequestDto, scope_type: str, fingerprints: List[bytes],
+                               reserved: Set[bytes], result: ChunkedForwardResult) -> None:
+        """Store the fingerprints of the records in delivered chunks and release the other reservations."""
+        failed = {failure.chunk_index for failure in result.failures}
+        chunk_size = self._forwarder.chunk_size
+        delivered = {
+            fingerprint for i, fingerprint in enumerate(fingerprints) if i // chunk_size not in failed
+        }
+        try:
+            self._fingerprints.add(scope_type, request_dto.delivery_date, delivered)
+        except Exception as e:
+            logger.error(f"Failed to store record fingerprints: {e}")
+            delivered = set()
+        self._fingerprints.release(scope_type, request_dto.delivery_date, reserved - delivered)
+    
+    def _delivered_count(self, record_count: int, result: ChunkedForwardResult) -> int:
+        """Number of records in the chunks NiFi accepted."""
+        chunk_size = self._forwarder.chunk_size
+        failed = sum(
+            min(chunk_size, record_count - failure.chunk_index * chunk_size) for failure in result.failures
+        )
+        return record_count - failed
+    
+    @staticmethod
+    def _validate_columnar(columns: List[Any], rows: List[Any]) -> None:
+        """Check that the columns are distinct names and every row has one value per column."""
+        if not all(isinstance(column, str) and column for column in columns):
+            raise ValueError('Columns must be non-empty strings')
+        if len(set(columns)) != len(columns):
+            raise ValueError('Columns must be unique')
+        
+        width = len(columns)
+        for i, row in enumerate(rows):
+            if not isinstance(row, list) or len(row) != width:
+                raise ValueError(f'Invalid row format at index {i}: expected an array of {width} values')
+    
+    @staticmethod
+    def _to_dto(job: UploadJob) -> UploadJobDto:
+        return UploadJobDto(
+            upload_id=job.upload_id,
+            status=job.status,
+            data_type=job.data_type,
+            record_count=job.record_count,
+            created_at=job.created_at.isoformat(),
+            started_at=job.started_at.isoformat() if job.started_at else None,
+            finished_at=job.finished_at.isoformat() if job.finished_at else None,
+            queue_seconds=job.queue_seconds,
+            send_seconds=job.send_seconds,
+            nifi_status=job.nifi_status,
+            error=job.error,
+            details=job.details,
+            chunk_count=job.chunk_count,
+            chunks_sent=job.chunks_sent,
+            failed_chunks=job.failed_chunks,
+            duplicate_count=job.duplicate_count,
+            duplicate_rows=job.duplicate_rows,
+            repeated_count=job.repeated_count,
+            repeated_rows=job.repeated_rows,
+            forwarded_count=job.forwarded_count
+        )
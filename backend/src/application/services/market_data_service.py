@@ -1,16 +1,20 @@
 """
 Application service for market data operations.
 """
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 import logging
 
 from ..dtos.data_dtos import (
     SecurityDto, DataFieldDto, MarketDataDownloadRequestDto, 
-    DataRecordDto, BatchedDataResponseDto
+    DataRecordDto, BatchedDataResponseDto, BulkMarketDataDownloadRequestDto, MarketDataSeriesDto
 )
 from ...domain.repositories.market_data_repository import IMarketDataRepository
-from ...domain.entities.market_data import MarketDataRequest
+from ...domain.entities.market_data import MarketDataRequest, BulkMarketDataRequest
+from ...infrastructure.cache.snapshot_cache import (
+    SnapshotCache, MarketDataSnapshot, market_data_snapshot_cache
+)
+from ...infrastructure.cache.ttl_cache import TtlCache
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +22,14 @@ logger = logging.getLogger(__name__)
 class MarketDataService:
     """Application service for market data operations."""
     
-    def __init__(self, repository: IMarketDataRepository = None):
+    def __init__(self, repository: IMarketDataRepository = None, snapshot_cache: SnapshotCache = None,
+                 security_index=None, search_ttl_seconds: int = 900):
+        self._snapshot_cache = snapshot_cache or market_data_snapshot_cache
+        # Optional in-memory security/field index (infrastructure SecurityFieldIndex)
+        self._security_index = security_index
+        # Typeahead index built from the repository when there is no security index
+        self._search_cache = TtlCache('security-search', search_ttl_seconds, stale_seconds=search_ttl_seconds)
+        
         if repository:
             self._repository = repository
         else:
@@ -46,6 +57,9 @@ class MarketDataService:
     def get_securities(self) -> List[SecurityDto]:
         """Get all available securities for dropdown."""
         try:
+            if self._security_index is not None:
+                return [SecurityDto(security=security) for security in self._security_index.get_securities()]
+            
             securities = self._repository.get_securities()
             return [SecurityDto(security=sec.security) for sec in securities]
         except Exception as e:
@@ -55,28 +69,39 @@ class MarketDataService:
     def get_fields_by_security(self, security: str) -> List[DataFieldDto]:
         """Get all fields for a specific security for dropdown."""
         try:
+            if self._security_index is not None:
+                return [
+                    self._to_field_dto(security, field_name, self._security_index.get_coverage(security, field_name))
+                    for field_name in self._security_index.get_fields(security)
+                ]
+            
             fields = self._repository.get_fields_by_security(security)
             return [DataFieldDto(field=field.field, security=field.security) for field in fields]
         except Exception as e:
             logger.error(f"Failed to get fields for security {security}: {e}")
             raise
     
-    def download_market_data(self, request_dto: MarketDataDownloadRequestDto) -> List[DataRecordDto]:
-        """Download market data."""
+    def search_securities(self, query: str, limit: int = 20) -> List[SecurityDto]:
+        """Typeahead search for securities by name prefix or token prefixes."""
+        try:
+            if self._security_index is not None:
+                matches = self._security_index.search(query, limit)
+            else:
+                matches = self._search_cache.get_or_load('securities', self._build_search_index).search(query, limit)
+            return [SecurityDto(security=security) for security in matches]
+        except Exception as e:
+            logger.error(f"Failed to search securities for '{query}': {e}")
+            raise
+    
+    def download_market_data(self, request_dto: MarketDataDownloadRequestDto,
+                             native_types: bool = False) -> List[DataRecordDto]:
+        """Download market data. With native_types, dates are kept as datetime objects."""
         try:
-            # Convert DTO to domain entity
-            request = MarketDataRequest(
-                security=request_dto.security,
-                field=request_dto.field,
-                start_date=datetime.fromisoformat(request_dto.start_date),
-                end_date=datetime.fromisoformat(request_dto.end_date)
-            )
-            
             # Get data from repository
-            market_data = self._repository.get_market_data(request)
+            market_data = self._get_market_data(request_dto)
             
             # Convert to DTOs
-            data_records = [DataRecordDto(data=record.to_dict()) for record in market_data]
+            data_records = [DataRecordDto(data=self._to_row(record, native_types)) for record in market_data]
             
             logger.info(f"Retrieved {len(data_records)} market data records")
             return data_records
@@ -85,30 +110,145 @@ class MarketDataService:
             logger.error(f"Failed to download market data: {e}")
             raise
     
+    def download_bulk_market_data(self, request_dto: BulkMarketDataDownloadRequestDto,
+                                  native_types: bool = False) -> List[MarketDataSeriesDto]:
+        """
+        Download market data for several securities and fields, grouped by (security, field).
+        With native_types, dates are kept as datetime objects.
+        """
+        try:
+            request = BulkMarketDataRequest(
+                securities=request_dto.securities,
+                fields=request_dto.fields,
+                start_date=datetime.fromisoformat(request_dto.start_date),
+                end_date=datetime.fromisoformat(request_dto.end_date)
+            )
+            series = self._repository.get_bulk_market_data(request)
+            
+            result = []
+            for item in series:
+                # Security and field are carried once per series, records keep date and value
+                rows = [self._to_row(record, native_types) for record in item.records]
+                result.append(MarketDataSeriesDto(
+                    security=item.security,
+                    field=item.field,
+                    data=[{'date': row['date'], 'value': row['value']} for row in rows]
+                ))
+            
+            logger.info(f"Retrieved {sum(len(item.data) for item in result)} market data records "
+                        f"for {len(result)} security/field pairs")
+            return result
+            
+        except Exception as e:
+            logger.error(f"Failed to download bulk market data: {e}")
+            raise
+    
+    def stream_market_data(self, request_dto: MarketDataDownloadRequestDto,
+                           native_types: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream market data rows without materializing the full result set.
+        With native_types, dates are kept as datetime objects instead of ISO strings.
+        """
+        request = self._to_request(request_dto)
+        for record in self._repository.iter_market_data(request):
+            yield self._to_row(record, native_types)
+    
     def download_market_data_batched(self, request_dto: MarketDataDownloadRequestDto, 
-                                   batch_size: int = 1000, batch_id: int = 0) -> BatchedDataResponseDto:
-        """Download market data in batches for large datasets."""
+                                   batch_size: int = 1000, batch_id: int = 0,
+                                   snapshot_id: Optional[str] = None) -> BatchedDataResponseDto:
+        """
+        Download market data in batches for large datasets.
+        
+        The first batch materializes the query result into a snapshot; later batches
+        are sliced from it, so paging stays consistent while loaders write new rows.
+        Pass the returned snapshot_id to pin subsequent batches to the same snapshot.
+        
+        Raises:
+            SnapshotNotFoundError: If snapshot_id is unknown or expired
+            ValueError: If snapshot_id belongs to a different request
+        """
         try:
-            # Get all data first
-            all_data = self.download_market_data(request_dto)
+            snapshot = self._get_snapshot(request_dto, batch_id, snapshot_id)
             
             # Calculate batch boundaries
             start_idx = batch_id * batch_size
             end_idx = start_idx + batch_size
-            total_records = len(all_data)
+            total_records = snapshot.total_records
             total_batches = (total_records + batch_size - 1) // batch_size
             
-            # Get batch data
-            batch_data = all_data[start_idx:end_idx]
             has_more = end_idx < total_records
             
             return BatchedDataResponseDto(
                 batch_id=batch_id,
                 total_batches=total_batches,
-                data=[record.data for record in batch_data],
-                has_more=has_more
+                data=snapshot.slice(start_idx, end_idx),
+                has_more=has_more,
+                snapshot_id=snapshot.snapshot_id
             )
             
         except Exception as e:
             logger.error(f"Failed to download batched market data: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def _get_snapshot(self, request_dto: MarketDataDownloadRequestDto, batch_id: int,
+                      snapshot_id: Optional[str]) -> MarketDataSnapshot:
+        """Resolve the snapshot to serve a batch from, materializing it if needed."""
+        key = (request_dto.security, request_dto.field, request_dto.start_date, request_dto.end_date)
+        
+        if snapshot_id:
+            snapshot = self._snapshot_cache.get(snapshot_id)
+            if snapshot.key != key:
+                raise ValueError(f"Snapshot {snapshot_id} does not match the requested data")
+            return snapshot
+        
+        # Later batches without a snapshot id reuse the latest snapshot for the same query
+        if batch_id > 0:
+            snapshot = self._snapshot_cache.find(key)
+            if snapshot is not None:
+                return snapshot
+        
+        snapshot = MarketDataSnapshot.from_records(key, self._get_market_data(request_dto))
+        self._snapshot_cache.put(snapshot)
+        logger.info(f"Materialized market data snapshot {snapshot.snapshot_id} with {snapshot.total_records} records")
+        return snapshot
+    
+    def _get_market_data(self, request_dto: MarketDataDownloadRequestDto):
+        """Convert the request DTO and query the repository."""
+        return self._repository.get_market_data(self._to_request(request_dto))
+    
+    def _build_search_index(self):
+        from ...infrastructure.cache.security_search import SecuritySearchIndex
+        return SecuritySearchIndex(sec.security for sec in self._repository.get_securities())
+    
+    @staticmethod
+    def _to_row(record, native_types: bool = False) -> Dict[str, Any]:
+        """Convert a market data record to a row dict, keeping the native date type if requested."""
+        if not native_types:
+            return record.to_dict()
+        return {
+            'security': record.security,
+            'field': record.field,
+            'date': record.date,
+            'value': record.value
+        }
+    
+    @staticmethod
+    def _to_field_dto(security: str, field_name: str, coverage) -> DataFieldDto:
+        """Build a field DTO with the (min, max) date coverage of the pair."""
+        min_date, max_date = coverage or (None, None)
+        return DataFieldDto(
+            field=field_name,
+            security=security,
+            min_date=min_date.isoformat() if hasattr(min_date, 'isoformat') else min_date,
+            max_date=max_date.isoformat() if hasattr(max_date, 'isoformat') else max_date
+        )
+    
+    @staticmethod
+    def _to_request(request_dto: MarketDataDownloadRequestDto) -> MarketDataRequest:
+        """Convert a download request DTO to the domain entity."""
+        return MarketDataRequest(
+            security=request_dto.security,
+            field=request_dto.field,
+            start_date=datetime.fromisoformat(request_dto.start_date),
+            end_date=datetime.fromisoformat(request_dto.end_date)
+        )
@@ -1,16 +1,18 @@
 """
 Application service for raw data operations.
 """
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional
 from datetime import datetime
 import logging
 
 from ..dtos.data_dtos import (
-    FileCategoryDto, FundDto, RawDataDownloadRequestDto, 
-    DataRecordDto, BatchedDataResponseDto
+    FileCategoryDto, FundDto, FundListDto, RawDataDownloadRequestDto, 
+    DataRecordDto, BatchedDataResponseDto, KeysetPageResponseDto
 )
 from ...domain.repositories.raw_data_repository import IRawDataRepository
-from ...domain.entities.raw_data import RawDataRequest
+from ...domain.entities.raw_data import (
+    RawDataRequest, RawDataFilter, RawDataOrder, VALUE_FORMAT_NATIVE, VALUE_FORMAT_JSON, VALUE_FORMAT_EPOCH
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +20,10 @@ logger = logging.getLogger(__name__)
 class RawDataService:
     """Application service for raw data operations."""
     
-    def __init__(self, repository: IRawDataRepository = None):
+    def __init__(self, repository: IRawDataRepository = None, fund_directory=None):
+        # Optional precomputed fund lists (infrastructure FundDirectory)
+        self._fund_directory = fund_directory
+        
         if repository:
             self._repository = repository
         else:
@@ -61,16 +66,32 @@ class RawDataService:
             logger.error(f"Failed to get funds for catalog {catalog}: {e}")
             raise
     
+    def get_fund_list(self, catalog: str) -> FundListDto:
+        """Get the funds of a catalog, served from the fund directory when available."""
+        try:
+            if self._fund_directory is not None:
+                entry = self._fund_directory.get(catalog)
+                if entry is not None:
+                    return FundListDto(
+                        catalog=catalog,
+                        funds=list(entry.funds),
+                        refreshed_at=entry.refreshed_at.isoformat() + 'Z'
+                    )
+            
+            funds = self._repository.get_funds_by_catalog(catalog)
+            return FundListDto(
+                catalog=catalog,
+                funds=[fund.fund for fund in funds],
+                refreshed_at=datetime.utcnow().isoformat() + 'Z'
+            )
+        except Exception as e:
+            logger.error(f"Failed to get fund list for catalog {catalog}: {e}")
+            raise
+    
     def download_raw_data(self, request_dto: RawDataDownloadRequestDto, batch_size: int = 1000) -> List[DataRecordDto]:
         """Download raw data with optional batching."""
         try:
-            # Convert DTO to domain entity
-            request = RawDataRequest(
-                catalog=request_dto.catalog,
-                fund=request_dto.fund,
-                start_date=datetime.fromisoformat(request_dto.start_date),
-                end_date=datetime.fromisoformat(request_dto.end_date)
-            )
+            request = self._to_request(request_dto)
             
             # Get data from repository
             raw_data = self._repository.get_raw_data(request)
@@ -111,4 +132,75 @@ class RawDataService:
             
         except Exception as e:
             logger.error(f"Failed to download batched raw data: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def stream_raw_data(self, request_dto: RawDataDownloadRequestDto,
+                        native_types: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Stream raw data rows without materializing the full result set.
+        With native_types, values are kept as returned by the driver instead of JSON-ready values.
+        """
+        request = self._to_request(request_dto, native_types)
+        for record in self._repository.iter_raw_data(request):
+            yield record.to_dict()
+    
+    def download_raw_data_page(self, request_dto: RawDataDownloadRequestDto, batch_size: int = 1000,
+                               continuation_token: Optional[str] = None) -> KeysetPageResponseDto:
+        """
+        Download a single page of raw data using server-side keyset pagination.
+        Each page runs one bounded query; pass the returned continuation token to get the next page.
+        """
+        try:
+            request = self._to_request(request_dto)
+            page = self._repository.get_raw_data_page(request, batch_size, continuation_token)
+            
+            total_batches = None
+            if page.total_records is not None:
+                total_batches = (page.total_records + batch_size - 1) // batch_size
+            
+            return KeysetPageResponseDto(
+                data=[record.to_dict() for record in page.records],
+                has_more=page.has_more,
+                continuation_token=page.continuation_token,
+                total_records=page.total_records,
+                total_batches=total_batches
+            )
+            
+        except Exception as e:
+            logger.error(f"Failed to download raw data page: {e}")
+            raise
+    
+    @staticmethod
+    def _to_request(request_dto: RawDataDownloadRequestDto, native_types: bool = False) -> RawDataRequest:
+        """Convert a download request DTO to the domain entity."""
+        if native_types or request_dto.native_types:
+            value_format = VALUE_FORMAT_NATIVE
+        elif request_dto.date_format == 'epoch':
+            value_format = VALUE_FORMAT_EPOCH
+        else:
+            value_format = VALUE_FORMAT_JSON
+        
+        return RawDataRequest(
+            catalog=request_dto.catalog,
+            fund=request_dto.fund,
+            start_date=datetime.fromisoformat(request_dto.start_date),
+            end_date=datetime.fromisoformat(request_dto.end_date),
+            columns=request_dto.columns or None,
+            filters=[
+                RawDataFilter(
+                    column=item['column'],
+                    operator=item['op'],
+                    value=item.get('value'),
+                    values=list(item.get('values') or []),
+                    min_value=item.get('min'),
+                    max_value=item.get('max')
+                )
+                for item in request_dto.filters or []
+            ],
+            order_by=[
+                RawDataOrder(column=item['column'], descending=str(item.get('direction', 'asc')).lower() == 'desc')
+                for item in request_dto.order_by or []
+            ],
+            limit=request_dto.limit,
+            value_format=value_format
+        )
@@ -0,0 +1,285 @@
+"""
+Application service for resumable upload sessions.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+import json
+import logging
+import threading
+import uuid
+
+from ..dtos.data_dtos import (
+    DataUploadRequestDto, UploadSessionChunkDto, UploadSessionCommitDto, UploadSessionDto, UploadSessionRequestDto
+)
+from .data_upload_service import DataUploadService
+from ...domain.entities.data_upload import (
+    UploadSession, UploadSessionChunk, UploadSessionCommit, UploadSessionConflictError, UploadSessionNotFoundError,
+    SESSION_COMMITTED, SESSION_OPEN, UPLOAD_FAILED, UPLOAD_FORMAT_COLUMNAR, UPLOAD_FORMATS
+)
+from ...domain.repositories.upload_chunk_store import IUploadChunkStore
+from ...domain.repositories.upload_session_repository import IUploadSessionRepository
+from ...domain.services.content_digest import content_digest
+
+logger = logging.getLogger(__name__)
+
+
+class UploadSessionService:
+    """
+    Uploads sent in chunks over several requests and committed as one upload.
+    
+    A client opens a session declaring the number of chunks, PUTs each chunk (a JSON
+    array of records, or of rows for a columnar session) and commits the session. Chunk
+    bodies are kept in the content-addressed chunk store under their SHA-256 digest,
+    which the client may send to detect corruption; after a failure the client reads
+    the session's received chunks and sends only the missing ones. The commit
+    assembles the chunks and submits them to the data upload service. It carries an
+    idempotency key: committing with a key again returns the original upload instead
+    of forwarding the records a second time. A session is committed again with a new
+    key only after its upload failed, so a failed upload can be retried without
+    resending the sheet. Sessions are purged after ttl_seconds without activity.
+    """
+    
+    def __init__(self, session_repository: IUploadSessionRepository, chunk_store: IUploadChunkStore,
+                 upload_service: DataUploadService, ttl_seconds: int, max_chunks: int):
+        self._sessions = session_repository
+        self._chunks = chunk_store
+        self._uploads = upload_service
+        self._ttl = timedelta(seconds=ttl_seconds)
+        self._max_chunks = max_chunks
+        # Serializes commits, so a key committed concurrently is forwarded only once
+        self._commit_lock = threading.Lock()
+    
+    def open_session(self, request_dto: UploadSessionRequestDto) -> UploadSessionDto:
+        """
+        Open a session for an upload sent in request_dto.chunk_count chunks.
+        
+        Raises:
+            ValueError: If the data type, format, columns or chunk count are invalid
+        """
+        if not self._uploads.is_known_data_type(request_dto.data_type):
+            raise ValueError(f"Unknown data type '{request_dto.data_type}'")
+        if request_dto.upload_format not in UPLOAD_FORMATS:
+            raise ValueError(
+                f"Invalid format '{request_dto.upload_format}', must be one of: {', '.join(UPLOAD_FORMATS)}"
+            )
+        if request_dto.upload_format == UPLOAD_FORMAT_COLUMNAR:
+            columns = request_dto.columns
+            if not columns or not isinstance(columns, list) or not all(isinstance(c, str) and c for c in columns):
+                raise ValueError('Columns array of non-empty names is required for columnar uploads')
+        chunk_count = request_dto.chunk_count
+        if type(chunk_count) is not int or not 1 <= chunk_count <= self._max_chunks:
+            raise ValueError(f'Chunk count must be between 1 and {self._max_chunks}')
+        
+        now = datetime.utcnow()
+        session = UploadSession(
+            session_id=uuid.uuid4().hex,
+            data_type=request_dto.data_type,
+            upload_format=request_dto.upload_format,
+            chunk_count=chunk_count,
+            status=SESSION_OPEN,
+            created_at=now,
+            updated_at=now,
+            columns=request_dto.columns if request_dto.upload_format == UPLOAD_FORMAT_COLUMNAR else None,
+            skip_duplicate_check=bool(request_dto.skip_duplicate_check),
+            delivery_date=request_dto.delivery_date
+        )
+        self._sessions.create(session)
+        logger.info(f"Opened upload session {session.session_id}: type={session.data_type}, chunks={chunk_count}")
+        return self._to_dto(session, [])
+    
+    def get_session(self, session_id: str) -> Optional[UploadSessionDto]:
+        """Get the state of a session with its received and missing chunks, or None if it is unknown."""
+        session = self._find_session(session_id)
+        if session is None:
+            return None
+        return self._to_dto(session, self._sessions.get_chunks(session_id))
+    
+    def put_chunk(self, session_id: str, chunk_index: int, content: bytes,
+                  digest: Optional[str] = None) -> Tuple[UploadSessionChunkDto, bool]:
+        """
+        Store a chunk of an open session.
+        
+        Args:
+            session_id: Id of the session
+            chunk_index: Index of the chunk, from 0 to the session's chunk count - 1
+            content: Chunk body, a JSON array of records or rows
+            digest: SHA-256 of the body as sent by the client, hex
+        
+        Returns:
+            The stored chunk, and False if the same content was already stored for the index
+        
+        Raises:
+            UploadSessionNotFoundError: If the session is unknown or expired
+            UploadSessionConflictError: If the session was committed
+            ValueError: If the index, digest or content is invalid
+        """
+        session = self._get_session(session_id)
+        if session.status != SESSION_OPEN:
+            raise UploadSessionConflictError(f'Upload session {session_id} was already committed')
+        if not 0 <= chunk_index < session.chunk_count:
+            raise ValueError(f'Chunk index must be between 0 and {session.chunk_count - 1}')
+        
+        actual_digest = content_digest(content)
+        if digest is not None and digest.strip().lower() != actual_digest:
+            raise ValueError(f'Chunk digest mismatch: received content has SHA-256 {actual_digest}')
+        
+        previous = next(
+            (chunk for chunk in self._sessions.get_chunks(session_id) if chunk.chunk_index == chunk_index), None
+        )
+        if previous is not None and previous.digest == actual_digest:
+            return self._to_chunk_dto(previous), False
+        
+        records = self._parse_chunk(session, content)
+        chunk = UploadSessionChunk(
+            chunk_index=chunk_index,
+            digest=actual_digest,
+            record_count=len(records),
+            size_bytes=len(content),
+            received_at=datetime.utcnow()
+        )
+        self._chunks.put(actual_digest, content)
+        self._sessions.put_chunk(session_id, chunk)
+        if previous is not None and not self._sessions.is_referenced(previous.digest):
+            self._chunks.delete(previous.digest)
+        
+        logger.debug(f"Stored chunk {chunk_index} of upload session {session_id}: {chunk.record_count} records")
+        return self._to_chunk_dto(chunk), True
+    
+    def commit(self, session_id: str, idempotency_key: str) -> UploadSessionCommitDto:
+        """
+        Submit the session's chunks as one upload, or return the upload of an earlier commit with the same key.
+        
+        Raises:
+            UploadSessionNotFoundError: If the session is unknown or expired
+            UploadSessionConflictError: If the key was used for another session, the session was
+                already committed and its upload did not fail, or chunks are missing
+            ValueError, UploadValidationError, UploadQueueFullError: From submitting the upload
+        """
+        if not idempotency_key:
+            raise ValueError('An idempotency key is required to commit an upload session')
+        
+        with self._commit_lock:
+            previous = self._sessions.find_commit(idempotency_key)
+            if previous is not None:
+                if previous.session_id != session_id:
+                    raise UploadSessionConflictError('Idempotency key was already used for another upload session')
+                logger.info(f"Replaying commit of upload session {session_id} as upload {previous.upload_id}")
+                return UploadSessionCommitDto(
+                    session_id=session_id,
+                    upload_id=previous.upload_id,
+                    upload=self._uploads.get_upload_status(previous.upload_id),
+                    replayed=True
+                )
+            
+            session = self._get_session(session_id)
+            if session.status == SESSION_COMMITTED:
+                upload = self._uploads.get_upload_status(session.upload_id)
+                if upload is None or upload.status != UPLOAD_FAILED:
+                    raise UploadSessionConflictError(
+                        f'Upload session {session_id} was already committed as upload {session.upload_id}'
+                    )
+                logger.info(f"Committing upload session {session_id} again after upload {session.upload_id} failed")
+            
+            request_dto = DataUploadRequestDto(
+                data_type=session.data_type,
+                data=self._assemble(session),
+                skip_duplicate_check=session.skip_duplicate_check,
+                delivery_date=session.delivery_date,
+                columns=session.columns
+            )
+            upload = self._uploads.submit_upload(request_dto)
+            self._sessions.add_commit(UploadSessionCommit(
+                idempotency_key=idempotency_key,
+                session_id=session_id,
+                upload_id=upload.upload_id,
+                committed_at=datetime.utcnow()
+            ))
+        
+        logger.info(f"Committed upload session {session_id} as upload {upload.upload_id}")
+        return UploadSessionCommitDto(session_id=session_id, upload_id=upload.upload_id, upload=upload)
+    
+    def purge_expired(self) -> None:
+        """Delete sessions inactive for longer than the TTL and their unreferenced chunks."""
+        for digest in self._sessions.purge_inactive(datetime.utcnow() - self._ttl):
+            self._chunks.delete(digest)
+    
+    def _find_session(self, session_id: str) -> Optional[UploadSession]:
+        """Get a session, treating sessions past the TTL as expired before they are purged."""
+        session = self._sessions.get(session_id)
+        if session is None or session.updated_at + self._ttl < datetime.utcnow():
+            return None
+        return session
+    
+    def _get_session(self, session_id: str) -> UploadSession:
+        session = self._find_session(session_id)
+        if session is None:
+            raise UploadSessionNotFoundError(f'Upload session {session_id} not found or expired')
+        return session
+    
+    def _assemble(self, session: UploadSession) -> List:
+        """Concatenate the records of all chunks in chunk order."""
+        chunks = {chunk.chunk_index: chunk for chunk in self._sessions.get_chunks(session.session_id)}
+        missing = [i for i in range(session.chunk_count) if i not in chunks]
+        if missing:
+            raise UploadSessionConflictError(
+                f'Upload session is missing {len(missing)} of {session.chunk_count} chunks', missing_chunks=missing
+            )
+        
+        data = []
+        for chunk_index in range(session.chunk_count):
+            content = self._chunks.get(chunks[chunk_index].digest)
+            if content is None:
+                # Chunk file lost, e.g. removed from disk; the client has to send it again
+                logger.error(f"Content of chunk {chunk_index} of upload session {session.session_id} is missing")
+                raise UploadSessionConflictError(
+                    f'Chunk {chunk_index} has to be sent again', missing_chunks=[chunk_index]
+                )
+            data.extend(json.loads(content))
+        return data
+    
+    @staticmethod
+    def _parse_chunk(session: UploadSession, content: bytes) -> List:
+        """Parse a chunk body and check the shape of its records."""
+        try:
+            records = json.loads(content)
+        except ValueError as e:
+            raise ValueError(f'Chunk is not valid JSON: {e}')
+        if not isinstance(records, list) or not records:
+            raise ValueError('Chunk must be a non-empty JSON array')
+        
+        if session.columns is not None:
+            width = len(session.columns)
+            for i, row in enumerate(records):
+                if not isinstance(row, list) or len(row) != width:
+                    raise ValueError(f'Invalid row format at index {i}: expected an array of {width} values')
+        else:
+            for i, record in enumerate(records):
+                if not isinstance(record, dict):
+                    raise ValueError(f'Invalid record format at index {i}')
+        return records
+    
+    def _to_dto(self, session: UploadSession, chunks: List[UploadSessionChunk]) -> UploadSessionDto:
+        received = {chunk.chunk_index for chunk in chunks}
+        return UploadSessionDto(
+            session_id=session.session_id,
+            status=session.status,
+            data_type=session.data_type,
+            upload_format=session.upload_format,
+            chunk_count=session.chunk_count,
+            created_at=session.created_at.isoformat(),
+            expires_at=(session.updated_at + self._ttl).isoformat(),
+            received_chunks=[self._to_chunk_dto(chunk) for chunk in chunks],
+            missing_chunks=[i for i in range(session.chunk_count) if i not in received],
+            record_count=sum(chunk.record_count for chunk in chunks),
+            upload_id=session.upload_id,
+            committed_at=session.committed_at.isoformat() if session.committed_at else None
+        )
+    
+    @staticmethod
+    def _to_chunk_dto(chunk: UploadSessionChunk) -> UploadSessionChunkDto:
+        return UploadSessionChunkDto(
+            chunk_index=chunk.chunk_index,
+            digest=chunk.digest,
+            record_count=chunk.record_count,
+            size_bytes=chunk.size_bytes
+        )
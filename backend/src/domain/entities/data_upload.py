@@ -0,0 +1,123 @@
+"""
+Domain entities for data uploads forwarded to NiFi.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import List, Optional
+
+# Upload job states; done and failed are final
+UPLOAD_QUEUED = 'queued'
+UPLOAD_SENDING = 'sending'
+UPLOAD_DONE = 'done'
+UPLOAD_FAILED = 'failed'
+UPLOAD_FINAL_STATES = (UPLOAD_DONE, UPLOAD_FAILED)
+
+# Upload wire formats: a list of record objects, or column names once with one value array per row
+UPLOAD_FORMAT_RECORDS = 'records'
+UPLOAD_FORMAT_COLUMNAR = 'columnar'
+UPLOAD_FORMATS = (UPLOAD_FORMAT_RECORDS, UPLOAD_FORMAT_COLUMNAR)
+
+# Handling of records already forwarded before: drop them, only report them, or skip the check
+DUPLICATES_DROP = 'drop'
+DUPLICATES_REPORT = 'report'
+DUPLICATES_OFF = 'off'
+DUPLICATE_MODES = (DUPLICATES_DROP, DUPLICATES_REPORT, DUPLICATES_OFF)
+
+# Upload session states: chunks are accepted while open; a committed session has been queued as an upload
+SESSION_OPEN = 'open'
+SESSION_COMMITTED = 'committed'
+
+
+@dataclass
+class UploadJob:
+    """State of an upload accepted for asynchronous forwarding to NiFi."""
+    upload_id: str
+    data_type: str
+    record_count: int
+    status: str
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    nifi_status: Optional[int] = None  # HTTP status returned by NiFi, if it answered
+    error: Optional[str] = None
+    details: Optional[str] = None
+    chunk_count: Optional[int] = None  # Number of chunks the records are forwarded in, once sending
+    chunks_sent: int = 0
+    failed_chunks: List[int] = field(default_factory=list)
+    duplicate_count: Optional[int] = None  # Records uploaded before, None when not checked
+    duplicate_rows: List[int] = field(default_factory=list)  # Indexes of the first duplicate records
+    repeated_count: Optional[int] = None  # Records repeating an earlier record of the upload, None when not checked
+    repeated_rows: List[int] = field(default_factory=list)  # Indexes of the first repeated records
+    forwarded_count: Optional[int] = None  # Records NiFi accepted, without dropped duplicates, once finished
+    
+    @property
+    def is_finished(self) -> bool:
+        return self.status in UPLOAD_FINAL_STATES
+    
+    @property
+    def queue_seconds(self) -> Optional[float]:
+        """Time spent waiting for a worker."""
+        if self.started_at is None:
+            return None
+        return (self.started_at - self.created_at).total_seconds()
+    
+    @property
+    def send_seconds(self) -> Optional[float]:
+        """Time spent forwarding to NiFi."""
+        if self.started_at is None or self.finished_at is None:
+            return None
+        return (self.finished_at - self.started_at).total_seconds()
+
+
+@dataclass
+class UploadSessionChunk:
+    """A chunk received for an upload session, stored by the SHA-256 digest of its content."""
+    chunk_index: int
+    digest: str
+    record_count: int
+    size_bytes: int
+    received_at: datetime
+
+
+@dataclass
+class UploadSession:
+    """
+    A resumable upload sent in chunk_count chunks and committed as one upload.
+    
+    upload_id and committed_at refer to the latest commit; a session is committed again
+    only after the upload of its latest commit failed.
+    """
+    session_id: str
+    data_type: str
+    upload_format: str
+    chunk_count: int
+    status: str
+    created_at: datetime
+    updated_at: datetime
+    columns: Optional[List[str]] = None  # Column names of a columnar upload
+    skip_duplicate_check: bool = False
+    delivery_date: Optional[str] = None
+    upload_id: Optional[str] = None
+    committed_at: Optional[datetime] = None
+
+
+@dataclass
+class UploadSessionCommit:
+    """A commit of an upload session, identified by the client's idempotency key."""
+    idempotency_key: str
+    session_id: str
+    upload_id: str
+    committed_at: datetime
+
+
+class UploadSessionNotFoundError(LookupError):
+    """Raised when an upload session does not exist or has expired."""
+
+
+class UploadSessionConflictError(Exception):
+    """Raised when a session request conflicts with the session's state."""
+    
+    def __init__(self, message: str, missing_chunks: Optional[List[int]] = None):
+        super().__init__(message)
+        self.message = message
+        self.missing_chunks = missing_chunks
@@ -1,9 +1,9 @@
 """
 Domain entities for market data management.
 """
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional, Any, Dict
+from typing import List, Optional, Any, Dict, Tuple
 
 
 @dataclass
@@ -19,6 +19,15 @@ class DataField:
     security: str
 
 
+@dataclass
+class SecurityFieldCoverage:
+    """Date coverage of a (security, field) pair."""
+    security: str
+    field: str
+    min_date: Optional[datetime]
+    max_date: Optional[datetime]
+
+
 @dataclass
 class MarketDataRecord:
     """Represents a market data record."""
@@ -52,4 +61,33 @@ class MarketDataRequest:
             'field': self.field,
             'start': self.start_date,
             'end': self.end_date
-        }
\ No newline at end of file
+        }
+
+
+@dataclass
+class BulkMarketDataRequest:
+    """Request parameters for downloading several securities and fields in one query."""
+    securities: List[str]
+    fields: List[str]
+    start_date: datetime
+    end_date: datetime
+    
+    @property
+    def pairs(self) -> List[Tuple[str, str]]:
+        """Requested (security, field) pairs in request order."""
+        return [(security, field) for security in self.securities for field in self.fields]
+    
+    def to_query_params(self) -> Dict[str, Any]:
+        """Convert to database query parameters, one parameter per list item."""
+        params = {'start': self.start_date, 'end': self.end_date}
+        params.update({f'security_{i}': security for i, security in enumerate(self.securities)})
+        params.update({f'field_{i}': field for i, field in enumerate(self.fields)})
+        return params
+
+
+@dataclass
+class MarketDataSeries:
+    """Market data records of a single (security, field) pair, ordered by date."""
+    security: str
+    field: str
+    records: List[MarketDataRecord] = field(default_factory=list)
@@ -1,9 +1,20 @@
 """
 Domain entities for raw data management.
 """
-from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Optional, Any, Dict
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import List, Optional, Any, Dict, Tuple
+
+# Supported raw data filter operators
+FILTER_EQ = 'eq'
+FILTER_IN = 'in'
+FILTER_RANGE = 'range'
+FILTER_OPERATORS = (FILTER_EQ, FILTER_IN, FILTER_RANGE)
+
+# Representation of record values
+VALUE_FORMAT_NATIVE = 'native'  # Values as returned by the database driver
+VALUE_FORMAT_JSON = 'json'      # JSON-ready: numbers as floats, dates and times as ISO strings
+VALUE_FORMAT_EPOCH = 'epoch'    # JSON-ready, with dates and datetimes as epoch milliseconds
 
 
 @dataclass
@@ -19,6 +30,13 @@ class Fund:
     catalog: str
 
 
+@dataclass
+class CatalogWatermark:
+    """Change watermark of a catalog table, used for incremental refreshes."""
+    max_load_ts: Optional[datetime]
+    max_delivery_id: Optional[Any]
+
+
 @dataclass
 class RawDataRecord:
     """Represents a record from raw data tables."""
@@ -29,18 +47,77 @@ class RawDataRecord:
         return self.data
 
 
+@dataclass
+class RawDataFilter:
+    """
+    Filter on a raw data column.
+    
+    `eq` compares with value, `in` with any of values, and `range` with
+    min_value <= column <= max_value where either bound may be omitted.
+    """
+    column: str
+    operator: str
+    value: Any = None
+    values: List[Any] = field(default_factory=list)
+    min_value: Any = None
+    max_value: Any = None
+    
+    def __post_init__(self):
+        if self.operator not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator '{self.operator}' on column {self.column}")
+        if self.operator == FILTER_IN and not self.values:
+            raise ValueError(f"Filter 'in' on column {self.column} needs at least one value")
+        if self.operator == FILTER_RANGE and self.min_value is None and self.max_value is None:
+            raise ValueError(f"Filter 'range' on column {self.column} needs a min or max value")
+
+
+@dataclass
+class RawDataOrder:
+    """Sort order on a raw data column."""
+    column: str
+    descending: bool = False
+
+
 @dataclass
 class RawDataRequest:
-    """Request parameters for raw data download."""
+    """
+    Request parameters for raw data download.
+    
+    start_date and end_date select whole days of LOAD_TS, both inclusive. columns
+    restricts the returned columns (all columns when None), filters, order_by and
+    limit are pushed down into the query. value_format selects how record values
+    are represented.
+    """
     catalog: str
     fund: str
     start_date: datetime
     end_date: datetime
+    columns: Optional[List[str]] = None
+    filters: List[RawDataFilter] = field(default_factory=list)
+    order_by: List[RawDataOrder] = field(default_factory=list)
+    limit: Optional[int] = None
+    value_format: str = VALUE_FORMAT_NATIVE
+    
+    def load_ts_range(self) -> Tuple[datetime, datetime]:
+        """Half-open LOAD_TS range [start, end) covering the requested days."""
+        start = datetime.combine(self.start_date.date(), datetime.min.time())
+        end = datetime.combine(self.end_date.date(), datetime.min.time()) + timedelta(days=1)
+        return start, end
     
     def to_query_params(self) -> Dict[str, Any]:
-        """Convert to database query parameters."""
+        """Convert to database query parameters; end is exclusive."""
+        start, end = self.load_ts_range()
         return {
             'fund': self.fund,
-            'start': self.start_date,
-            'end': self.end_date
-        }
\ No newline at end of file
+            'start': start,
+            'end': end
+        }
+
+
+@dataclass
+class RawDataPage:
+    """A single keyset-paginated page of raw data records."""
+    records: List[RawDataRecord]
+    has_more: bool
+    continuation_token: Optional[str] = None  # Opaque token for the next page
+    total_records: Optional[int] = None
@@ -0,0 +1,58 @@
+"""
+Domain entities describing the columns expected for each upload type.
+"""
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+# Column value types
+COLUMN_TEXT = 'text'        # Trimmed string; numbers are accepted as their text (12345.0 -> "12345")
+COLUMN_NUMBER = 'number'    # Integer or float; numeric strings are accepted
+COLUMN_DATE = 'date'        # ISO date string; ISO date-times and Excel serial dates are accepted
+COLUMN_TYPES = (COLUMN_TEXT, COLUMN_NUMBER, COLUMN_DATE)
+
+
+@dataclass(frozen=True)
+class UploadColumn:
+    """A column of an upload type."""
+    name: str
+    type: str
+    required: bool = False
+    
+    def __post_init__(self):
+        if self.type not in COLUMN_TYPES:
+            raise ValueError(f"Unsupported column type '{self.type}' for column {self.name}")
+
+
+@dataclass(frozen=True)
+class UploadSchema:
+    """An upload type with the columns its sheets must have."""
+    id: str
+    name: str
+    description: str
+    columns: Tuple[UploadColumn, ...]
+
+
+@dataclass(frozen=True)
+class UploadValidationIssue:
+    """An invalid value, or a problem with a whole column when row is None."""
+    row: Optional[int]  # Index of the record in the upload
+    column: str
+    message: str
+
+
+class UploadValidationError(ValueError):
+    """Raised when an upload does not match the schema of its type."""
+    
+    def __init__(self, errors: List[UploadValidationIssue], error_count: int = None):
+        self.errors = errors
+        self.error_count = len(errors) if error_count is None else error_count
+        super().__init__(self._summary())
+    
+    def _summary(self) -> str:
+        shown = '; '.join(
+            (f'row {error.row}, ' if error.row is not None else '') + f'{error.column}: {error.message}'
+            for error in self.errors[:3]
+        )
+        more = f' and {self.error_count - 3} more' if self.error_count > 3 else ''
+        plural = 's' if self.error_count != 1 else ''
+        return f'{self.error_count} validation error{plural}: {shown}{more}'
@@ -2,8 +2,11 @@
 Repository interface for market data operations.
 """
 from abc import ABC, abstractmethod
-from typing import List
-from ..entities.market_data import Security, DataField, MarketDataRecord, MarketDataRequest
+from typing import Iterator, List
+from ..entities.market_data import (
+    Security, DataField, MarketDataRecord, MarketDataRequest, SecurityFieldCoverage,
+    BulkMarketDataRequest, MarketDataSeries
+)
 
 
 class IMarketDataRepository(ABC):
@@ -19,7 +22,25 @@ class IMarketDataRepository(ABC):
         """Get all fields for a specific security."""
         pass
     
+    @abstractmethod
+    def get_security_field_coverage(self) -> List[SecurityFieldCoverage]:
+        """Get all distinct (security, field) pairs with their min/max date in a single query."""
+        pass
+    
     @abstractmethod
     def get_market_data(self, request: MarketDataRequest) -> List[MarketDataRecord]:
         """Get market data based on request parameters."""
+        pass
+    
+    @abstractmethod
+    def iter_market_data(self, request: MarketDataRequest) -> Iterator[MarketDataRecord]:
+        """Iterate over market data using a server-side cursor, without materializing the result."""
+        pass
+    
+    @abstractmethod
+    def get_bulk_market_data(self, request: BulkMarketDataRequest) -> List[MarketDataSeries]:
+        """
+        Get market data for several securities and fields in a single query.
+        Returns one series per requested (security, field) pair in request order, empty if the pair has no data.
+        """
         pass
\ No newline at end of file
@@ -2,8 +2,10 @@
 Repository interface for raw data operations.
 """
 from abc import ABC, abstractmethod
-from typing import List
-from ..entities.raw_data import FileCategory, Fund, RawDataRecord, RawDataRequest
+from typing import Iterator, List, Optional
+from ..entities.raw_data import (
+    FileCategory, Fund, RawDataRecord, RawDataRequest, RawDataPage, CatalogWatermark
+)
 
 
 class IRawDataRepository(ABC):
@@ -19,7 +21,35 @@ class IRawDataRepository(ABC):
         """Get all funds for a specific catalog."""
         pass
     
+    @abstractmethod
+    def get_catalog_watermark(self, catalog: str) -> CatalogWatermark:
+        """Get the latest LOAD_TS and DELIVERY_ID of a catalog table."""
+        pass
+    
+    @abstractmethod
+    def get_funds_by_catalog_since(self, catalog: str, watermark: CatalogWatermark) -> List[Fund]:
+        """Get the funds of rows loaded after the given watermark."""
+        pass
+    
     @abstractmethod
     def get_raw_data(self, request: RawDataRequest) -> List[RawDataRecord]:
         """Get raw data based on request parameters."""
+        pass
+    
+    @abstractmethod
+    def iter_raw_data(self, request: RawDataRequest) -> Iterator[RawDataRecord]:
+        """Iterate over raw data using a server-side cursor, without materializing the result."""
+        pass
+    
+    @abstractmethod
+    def get_raw_data_page(self, request: RawDataRequest, page_size: int,
+                          continuation_token: Optional[str] = None) -> RawDataPage:
+        """
+        Get a single page of raw data using keyset pagination.
+        
+        Args:
+            request: The raw data request parameters
+            page_size: Maximum number of records in the page
+            continuation_token: Opaque token returned by the previous page, None for the first page
+        """
         pass
\ No newline at end of file
@@ -0,0 +1,24 @@
+"""
+Store interface for the chunk contents of resumable upload sessions.
+"""
+from abc import ABC, abstractmethod
+from typing import Optional
+
+
+class IUploadChunkStore(ABC):
+    """Interface for a content-addressed store of chunk bodies, keyed by their content digest."""
+    
+    @abstractmethod
+    def put(self, digest: str, data: bytes) -> bool:
+        """Store content under its digest, returning False if it was already stored."""
+        pass
+    
+    @abstractmethod
+    def get(self, digest: str) -> Optional[bytes]:
+        """Get the content stored under a digest, or None if it is missing."""
+        pass
+    
+    @abstractmethod
+    def delete(self, digest: str) -> None:
+        """Delete the content stored under a digest, if any."""
+        pass
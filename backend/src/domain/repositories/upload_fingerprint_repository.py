@@ -0,0 +1,40 @@
+"""
+Repository interface for the fingerprints of uploaded records.
+"""
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional, Set
+
+
+class IUploadFingerprintRepository(ABC):
+    """
+    Interface for the index of record fingerprints already forwarded to NiFi.
+    
+    Fingerprints are scoped by data type and delivery date: the same record delivered
+    for another date is not a duplicate. Uploads being forwarded reserve their
+    fingerprints, so that concurrent uploads of the same records do not both pass the check.
+    """
+    
+    @abstractmethod
+    def find_existing(self, data_type: str, delivery_date: Optional[str], fingerprints: List[bytes]) -> Set[bytes]:
+        """Get the given fingerprints that are already stored in the scope."""
+        pass
+    
+    @abstractmethod
+    def reserve(self, data_type: str, delivery_date: Optional[str], fingerprints: List[bytes]) -> Set[bytes]:
+        """
+        Reserve the given fingerprints for an upload in one step with the duplicate check.
+        
+        Returns the fingerprints that are already stored or reserved by another upload;
+        all others are reserved until they are added or released.
+        """
+        pass
+    
+    @abstractmethod
+    def release(self, data_type: str, delivery_date: Optional[str], fingerprints: Iterable[bytes]) -> None:
+        """Drop reservations of fingerprints whose records were not delivered."""
+        pass
+    
+    @abstractmethod
+    def add(self, data_type: str, delivery_date: Optional[str], fingerprints: Iterable[bytes]) -> int:
+        """Store fingerprints in the scope, returning the number of new ones; their reservations are dropped."""
+        pass
@@ -0,0 +1,54 @@
+"""
+Repository interface for upload job state.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from ..entities.data_upload import UploadJob
+
+
+class IUploadJobRepository(ABC):
+    """Interface for storing the state of asynchronous uploads."""
+    
+    @abstractmethod
+    def create(self, job: UploadJob) -> None:
+        """Store a new job."""
+        pass
+    
+    @abstractmethod
+    def get(self, upload_id: str) -> Optional[UploadJob]:
+        """Get a job by its upload id, or None if it is unknown."""
+        pass
+    
+    @abstractmethod
+    def record_duplicates(self, upload_id: str, duplicate_count: int, duplicate_rows: List[int],
+                          repeated_count: int = 0, repeated_rows: Optional[List[int]] = None) -> None:
+        """Record the outcome of the job's duplicate check."""
+        pass
+    
+    @abstractmethod
+    def mark_sending(self, upload_id: str, started_at: datetime, chunk_count: int) -> None:
+        """Record that a worker started forwarding the job in chunk_count chunks."""
+        pass
+    
+    @abstractmethod
+    def record_chunk_sent(self, upload_id: str) -> None:
+        """Count one more chunk of the job as delivered."""
+        pass
+    
+    @abstractmethod
+    def mark_finished(self, upload_id: str, status: str, finished_at: datetime, nifi_status: Optional[int] = None,
+                      error: Optional[str] = None, details: Optional[str] = None,
+                      failed_chunks: Optional[List[int]] = None, forwarded_count: Optional[int] = None) -> None:
+        """Record the final state of a job and the number of its records NiFi accepted."""
+        pass
+    
+    @abstractmethod
+    def fail_unfinished(self, error: str, finished_at: datetime) -> int:
+        """Mark all queued or sending jobs as failed, returning their number."""
+        pass
+    
+    @abstractmethod
+    def purge_finished(self, before: datetime) -> int:
+        """Delete finished jobs older than before, returning their number."""
+        pass
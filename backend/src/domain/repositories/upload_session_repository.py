@@ -0,0 +1,56 @@
+"""
+Repository interface for resumable upload sessions.
+"""
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import List, Optional
+from ..entities.data_upload import UploadSession, UploadSessionChunk, UploadSessionCommit
+
+
+class IUploadSessionRepository(ABC):
+    """Interface for storing upload sessions and the digests of their received chunks."""
+    
+    @abstractmethod
+    def create(self, session: UploadSession) -> None:
+        """Store a new session."""
+        pass
+    
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        """Get a session by its id, or None if it is unknown."""
+        pass
+    
+    @abstractmethod
+    def find_commit(self, idempotency_key: str) -> Optional[UploadSessionCommit]:
+        """Get the commit made with an idempotency key, or None if the key is unused."""
+        pass
+    
+    @abstractmethod
+    def get_chunks(self, session_id: str) -> List[UploadSessionChunk]:
+        """Get the received chunks of a session, ordered by chunk index."""
+        pass
+    
+    @abstractmethod
+    def put_chunk(self, session_id: str, chunk: UploadSessionChunk) -> None:
+        """Store a received chunk, replacing an earlier one with the same index."""
+        pass
+    
+    @abstractmethod
+    def add_commit(self, commit: UploadSessionCommit) -> None:
+        """Record a commit and mark its session as committed."""
+        pass
+    
+    @abstractmethod
+    def purge_inactive(self, before: datetime) -> List[str]:
+        """
+        Delete sessions not updated since before.
+        
+        Returns:
+            Digests of the chunks no longer referenced by any session
+        """
+        pass
+    
+    @abstractmethod
+    def is_referenced(self, digest: str) -> bool:
+        """Check whether a chunk digest is referenced by any session."""
+        pass
@@ -0,0 +1,9 @@
+"""
+Content digests of upload session chunks.
+"""
+import hashlib
+
+
+def content_digest(data: bytes) -> str:
+    """SHA-256 digest of chunk content as lowercase hex, the key of the chunk in the store."""
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,65 @@
+"""
+Stable fingerprints of uploaded records, used for duplicate detection.
+"""
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+import hashlib
+import math
+
+# Size of a fingerprint in bytes
+FINGERPRINT_SIZE = 16
+
+# Separators of the canonical record encoding
+_FIELD_SEPARATOR = '\x1e'
+_VALUE_SEPARATOR = '\x1f'
+
+
+def normalize_value(value: Any) -> Optional[str]:
+    """
+    Normalize a cell value to its canonical text, or None for empty cells.
+    
+    Strings are stripped, integral floats compare equal to integers (Excel sends 5.0
+    for 5) and dates are written in ISO format, so the same row entered twice hashes
+    the same regardless of how the sheet represented it.
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return 's' + value if value else None
+    if isinstance(value, bool):
+        return 'b1' if value else 'b0'
+    if isinstance(value, int):
+        return f'n{value}'
+    if isinstance(value, float):
+        if math.isnan(value):
+            return 'nnan'
+        if value.is_integer():
+            return f'n{int(value)}'
+        return f'n{value!r}'
+    if isinstance(value, (datetime, date)):
+        return 'd' + value.isoformat()
+    return 's' + str(value)
+
+
+def record_fingerprint(values: Dict[str, Any]) -> bytes:
+    """
+    Hash a record over its normalized non-empty values.
+    
+    Column names are compared case-insensitively and their order does not matter;
+    empty and missing values are equivalent.
+    """
+    fields = []
+    for column, value in values.items():
+        text = normalize_value(value)
+        if text is not None:
+            fields.append(column.strip().lower() + _VALUE_SEPARATOR + text)
+    fields.sort()
+    return hashlib.blake2b(_FIELD_SEPARATOR.join(fields).encode('utf-8'), digest_size=FINGERPRINT_SIZE).digest()
+
+
+def fingerprint_records(data: List[Any], columns: Optional[List[str]] = None) -> List[bytes]:
+    """Fingerprint record objects, or row arrays when columns is given."""
+    if columns is None:
+        return [record_fingerprint(record) for record in data]
+    return [record_fingerprint(dict(zip(columns, row))) for row in data]
@@ -0,0 +1,51 @@
+"""
+Caching decorators for repositories.
+"""
+from typing import Iterator, List, Optional
+import logging
+
+from ...domain.repositories.raw_data_repository import IRawDataRepository
+from ...domain.entities.raw_data import (
+    FileCategory, Fund, RawDataRecord, RawDataRequest, RawDataPage, CatalogWatermark
+)
+from .ttl_cache import TtlCache
+
+logger = logging.getLogger(__name__)
+
+CATEGORIES_KEY = 'file_categories'
+
+
+class CachingRawDataRepository(IRawDataRepository):
+    """
+    Raw data repository decorator serving catalog metadata from a TTL cache.
+    
+    File categories come from INFORMATION_SCHEMA and change rarely, so they are cached
+    with stale-while-revalidate refresh. Data queries are passed through unchanged.
+    """
+    
+    def __init__(self, repository: IRawDataRepository, metadata_cache: TtlCache):
+        self._repository = repository
+        self._metadata_cache = metadata_cache
+    
+    def get_file_categories(self) -> List[FileCategory]:
+        """Get file categories from the metadata cache."""
+        return list(self._metadata_cache.get_or_load(CATEGORIES_KEY, self._repository.get_file_categories))
+    
+    def get_funds_by_catalog(self, catalog: str) -> List[Fund]:
+        return self._repository.get_funds_by_catalog(catalog)
+    
+    def get_catalog_watermark(self, catalog: str) -> CatalogWatermark:
+        return self._repository.get_catalog_watermark(catalog)
+    
+    def get_funds_by_catalog_since(self, catalog: str, watermark: CatalogWatermark) -> List[Fund]:
+        return self._repository.get_funds_by_catalog_since(catalog, watermark)
+    
+    def get_raw_data(self, request: RawDataRequest) -> List[RawDataRecord]:
+        return self._repository.get_raw_data(request)
+    
+    def iter_raw_data(self, request: RawDataRequest) -> Iterator[RawDataRecord]:
+        return self._repository.iter_raw_data(request)
+    
+    def get_raw_data_page(self, request: RawDataRequest, page_size: int,
+                          continuation_token: Optional[str] = None) -> RawDataPage:
+        return self._repository.get_raw_data_page(request, page_size, continuation_token)
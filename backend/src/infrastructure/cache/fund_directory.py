@@ -0,0 +1,115 @@
+"""
+In-memory directory of the funds available in each catalog.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+import logging
+import threading
+import time
+
+from ...domain.entities.raw_data import CatalogWatermark
+from ...domain.repositories.raw_data_repository import IRawDataRepository
+from ..config.fund_mappings import FUND_COLUMN_MAPPINGS
+from .periodic_task import PeriodicTask
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FundDirectoryEntry:
+    """Funds of a catalog together with their freshness."""
+    catalog: str
+    funds: List[str]
+    refreshed_at: datetime
+    watermark: CatalogWatermark
+    rebuilt_at: float  # Monotonic time of the last full rebuild
+
+
+class FundDirectory:
+    """
+    Precomputed fund lists for every catalog with fund filtering.
+    
+    The directory is built in the background at startup and refreshed incrementally:
+    each refresh compares the catalog's max LOAD_TS/DELIVERY_ID with the stored watermark
+    and only queries the funds of newly loaded rows when it moved. A full rebuild runs
+    every full_rebuild_interval seconds to drop funds whose rows were deleted.
+    """
+    
+    def __init__(self, repository: IRawDataRepository, refresh_interval: int, full_rebuild_interval: int,
+                 catalogs: Iterable[str] = None):
+        self._repository = repository
+        self._catalogs = list(catalogs) if catalogs is not None else list(FUND_COLUMN_MAPPINGS)
+        self._full_rebuild_interval = full_rebuild_interval
+        self._entries: Dict[str, FundDirectoryEntry] = {}
+        self._catalog_locks: Dict[str, threading.Lock] = {catalog: threading.Lock() for catalog in self._catalogs}
+        self._refresh_task = PeriodicTask('fund-directory-refresh', refresh_interval, self.refresh_all)
+        self.name = 'funds'
+    
+    def start(self) -> None:
+        """Build the directory and keep refreshing it in the background."""
+        self._refresh_task.start()
+    
+    def stop(self) -> None:
+        self._refresh_task.stop()
+    
+    def get(self, catalog: str) -> Optional[FundDirectoryEntry]:
+        """
+        Get the fund list of a catalog, building it synchronously if the
+        background build has not reached it yet.
+        
+        Returns:
+            The directory entry, or None for catalogs without fund filtering
+        """
+        if catalog not in self._catalog_locks:
+            return None
+        
+        entry = self._entries.get(catalog)
+        if entry is None:
+            entry = self.refresh_catalog(catalog)
+        return entry
+    
+    def invalidate(self) -> None:
+        """Drop all entries; they are rebuilt on next access or refresh."""
+        self._entries.clear()
+    
+    def refresh_all(self) -> None:
+        """Refresh every catalog, logging failures per catalog."""
+        started = time.monotonic()
+        for catalog in self._catalogs:
+            try:
+                self.refresh_catalog(catalog)
+            except Exception as e:
+                logger.warning(f"Failed to refresh funds for catalog {catalog}: {e}")
+        logger.debug(f"Fund directory refresh took {time.monotonic() - started:.2f}s")
+    
+    def refresh_catalog(self, catalog: str) -> FundDirectoryEntry:
+        """Refresh one catalog incrementally, or rebuild it when due."""
+        with self._catalog_locks[catalog]:
+            entry = self._entries.get(catalog)
+            watermark = self._repository.get_catalog_watermark(catalog)
+            now = time.monotonic()
+            
+            if entry is None or now - entry.rebuilt_at >= self._full_rebuild_interval:
+                funds = [fund.fund for fund in self._repository.get_funds_by_catalog(catalog)]
+                rebuilt_at = now
+                logger.info(f"Built fund directory for catalog {catalog}: {len(funds)} funds")
+            elif watermark != entry.watermark:
+                new_funds = self._repository.get_funds_by_catalog_since(catalog, entry.watermark)
+                funds = set(entry.funds)
+                funds.update(fund.fund for fund in new_funds)
+                rebuilt_at = entry.rebuilt_at
+                logger.info(f"Updated fund directory for catalog {catalog}: {len(funds)} funds")
+            else:
+                funds = entry.funds
+                rebuilt_at = entry.rebuilt_at
+            
+            entry = FundDirectoryEntry(
+                catalog=catalog,
+                funds=sorted(funds),
+                refreshed_at=datetime.utcnow(),
+                watermark=watermark,
+                rebuilt_at=rebuilt_at
+            )
+            self._entries[catalog] = entry
+            return entry
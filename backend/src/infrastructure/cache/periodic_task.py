@@ -0,0 +1,43 @@
+"""
+Background thread running a function at a fixed interval.
+"""
+from typing import Callable
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicTask:
+    """Runs a function in a daemon thread immediately and then every interval seconds."""
+    
+    def __init__(self, name: str, interval_seconds: float, function: Callable[[], None]):
+        self.name = name
+        self._interval_seconds = interval_seconds
+        self._function = function
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+    
+    def start(self) -> None:
+        """Start the background thread if it is not running yet."""
+        if self.is_running:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+    
+    def stop(self) -> None:
+        """Signal the background thread to stop after the current run."""
+        self._stop_event.set()
+    
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                self._function()
+            except Exception as e:
+                logger.error(f"Periodic task {self.name} failed: {e}")
+            self._stop_event.wait(self._interval_seconds)
@@ -0,0 +1,128 @@
+"""
+In-memory index of the securities and fields available in BLOOMBERG_ODD_MONTHLY.
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import sys
+import threading
+import time
+
+from ...domain.repositories.market_data_repository import IMarketDataRepository
+from .periodic_task import PeriodicTask
+from .security_search import SecuritySearchIndex
+
+logger = logging.getLogger(__name__)
+
+
+def _key(name: Any) -> str:
+    """Lookup key of a security or field name, matching like the database's case- and padding-insensitive collation."""
+    return str(name).strip().upper()
+
+
+@dataclass(frozen=True)
+class _IndexSnapshot:
+    """Immutable index contents, swapped atomically on refresh; lookups are keyed by _key."""
+    securities: Tuple[str, ...] = ()
+    fields_by_security: Dict[str, Tuple[str, ...]] = field(default_factory=dict)
+    coverage: Dict[Tuple[str, str], Tuple[Any, Any]] = field(default_factory=dict)
+    search: SecuritySearchIndex = field(default_factory=lambda: SecuritySearchIndex(()))
+    refreshed_at: Optional[datetime] = None
+
+
+class SecurityFieldIndex:
+    """
+    Security -> field index with per-pair date coverage.
+    
+    Loaded with a single GROUP BY query over all (security, field) pairs and refreshed
+    on a schedule. Strings are interned so each security and field name is stored once.
+    Lookups ignore case and surrounding spaces, as the database query they replace did.
+    """
+    
+    def __init__(self, repository: IMarketDataRepository, refresh_interval: int):
+        self._repository = repository
+        self._snapshot: Optional[_IndexSnapshot] = None
+        self._load_lock = threading.Lock()
+        self._refresh_task = PeriodicTask('security-index-refresh', refresh_interval, self.refresh)
+        self.name = 'securities'
+    
+    def start(self) -> None:
+        """Load the index and keep refreshing it in the background."""
+        self._refresh_task.start()
+    
+    def stop(self) -> None:
+        self._refresh_task.stop()
+    
+    def invalidate(self) -> None:
+        """Drop the index; it is reloaded on next access or refresh."""
+        self._snapshot = None
+    
+    @property
+    def refreshed_at(self) -> Optional[datetime]:
+        return self._get_snapshot().refreshed_at
+    
+    def get_securities(self) -> List[str]:
+        """All securities in sorted order."""
+        return list(self._get_snapshot().securities)
+    
+    def get_fields(self, security: str) -> List[str]:
+        """Fields available for a security in sorted order."""
+        return list(self._get_snapshot().fields_by_security.get(_key(security), ()))
+    
+    def get_coverage(self, security: str, field_name: str) -> Optional[Tuple[Any, Any]]:
+        """Min and max date of a (security, field) pair, if known."""
+        return self._get_snapshot().coverage.get((_key(security), _key(field_name)))
+    
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """Typeahead search over security names."""
+        return self._get_snapshot().search.search(query, limit)
+    
+    def refresh(self) -> None:
+        """Reload the index from the repository."""
+        with self._load_lock:
+            self._snapshot = self._build()
+    
+    def _get_snapshot(self) -> _IndexSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._load_lock:
+                snapshot = self._snapshot
+                if snapshot is None:
+                    snapshot = self._build()
+                    self._snapshot = snapshot
+        return snapshot
+    
+    def _build(self) -> _IndexSnapshot:
+        started = time.monotonic()
+        rows = self._repository.get_security_field_coverage()
+        
+        securities_by_key: Dict[str, str] = {}
+        fields_by_security: Dict[str, List[str]] = {}
+        coverage: Dict[Tuple[str, str], Tuple[Any, Any]] = {}
+        for row in rows:
+            security = sys.intern(str(row.security))
+            field_name = sys.intern(str(row.field))
+            security_key = _key(security)
+            securities_by_key.setdefault(security_key, security)
+            fields_by_security.setdefault(security_key, []).append(field_name)
+            pair = (security_key, _key(field_name))
+            known = coverage.get(pair)
+            if known is None:
+                coverage[pair] = (row.min_date, row.max_date)
+            else:
+                coverage[pair] = (min(known[0], row.min_date), max(known[1], row.max_date))
+        
+        securities = tuple(sorted(securities_by_key.values()))
+        snapshot = _IndexSnapshot(
+            securities=securities,
+            fields_by_security={
+                security: tuple(sorted(set(fields))) for security, fields in fields_by_security.items()
+            },
+            coverage=coverage,
+            search=SecuritySearchIndex(securities),
+            refreshed_at=datetime.utcnow()
+        )
+        logger.info(f"Loaded security index: {len(snapshot.securities)} securities, {len(coverage)} pairs "
+                    f"in {time.monotonic() - started:.2f}s")
+        return snapshot
@@ -0,0 +1,92 @@
+"""
+Sorted in-process index for security typeahead search.
+"""
+from bisect import bisect_left
+from heapq import merge
+from itertools import accumulate
+from typing import Iterable, List, Set
+import re
+
+# Securities are tokenized on whitespace and punctuation, e.g. "AAPL US Equity" -> aapl, us, equity
+TOKEN_PATTERN = re.compile(r'[^\W_]+', re.UNICODE)
+
+# Sentinel sorting after every character, used for prefix range upper bounds
+_MAX_CHAR = '\U0010ffff'
+
+
+def _tokenize(text: str) -> List[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SecuritySearchIndex:
+    """
+    Case-insensitive prefix and token search over security names.
+    
+    Securities are numbered in case-insensitive alphabetical order. The index keeps the
+    sorted lowercased names and, per distinct token, the sorted ids of the securities
+    containing it. A query matches a security when every query token is a prefix of one of
+    its tokens; matches where the whole name starts with the query are ranked first.
+    Prefix ranges are found by binary search and posting lists are merged lazily until
+    the limit is reached, so lookups stay below a millisecond for tens of thousands of
+    securities.
+    """
+    
+    def __init__(self, securities: Iterable[str]):
+        self._securities: List[str] = sorted(set(securities), key=lambda name: (name.lower(), name))
+        self._names: List[str] = [security.lower() for security in self._securities]
+        self._token_sets: List[Set[str]] = [set(_tokenize(security)) for security in self._securities]
+        
+        postings = {}
+        for security_id, tokens in enumerate(self._token_sets):
+            for token in tokens:
+                postings.setdefault(token, []).append(security_id)
+        self._tokens: List[str] = sorted(postings)
+        self._postings: List[List[int]] = [postings[token] for token in self._tokens]
+        # Cumulative posting sizes, to estimate prefix selectivity in constant time
+        self._cumulative_sizes: List[int] = [0] + list(accumulate(len(ids) for ids in self._postings))
+    
+    def __len__(self) -> int:
+        return len(self._securities)
+    
+    def search(self, query: str, limit: int = 20) -> List[str]:
+        """
+        Find securities matching the query.
+        
+        Args:
+            query: Search text, matched case-insensitively
+            limit: Maximum number of results
+        
+        Returns:
+            Matching security names, full-name prefix matches first, each group in alphabetical order
+        """
+        query = (query or '').strip().lower()
+        if not query or limit <= 0:
+            return []
+        
+        start, end = self._prefix_range(self._names, query)
+        results = list(range(start, min(end, start + limit)))
+        
+        query_tokens = _tokenize(query)
+        if len(results) < limit and query_tokens:
+            seen = set(results)
+            ranges = [self._prefix_range(self._tokens, token) for token in query_tokens]
+            # Walk the postings of the most selective token, checking the others per candidate
+            first, last = min(ranges, key=lambda r: self._cumulative_sizes[r[1]] - self._cumulative_sizes[r[0]])
+            previous = None
+            for security_id in merge(*self._postings[first:last]):
+                if security_id == previous or security_id in seen:
+                    continue
+                previous = security_id
+                token_set = self._token_sets[security_id]
+                if all(any(candidate.startswith(token) for candidate in token_set) for token in query_tokens):
+                    results.append(security_id)
+                    if len(results) >= limit:
+                        break
+        
+        return [self._securities[security_id] for security_id in results]
+    
+    @staticmethod
+    def _prefix_range(entries: List[str], prefix: str):
+        start = bisect_left(entries, prefix)
+        end = bisect_left(entries, prefix + _MAX_CHAR, lo=start)
+        return start, end
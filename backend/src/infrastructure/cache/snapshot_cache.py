@@ -0,0 +1,170 @@
+"""
+Request-scoped result snapshots for batched market data downloads.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+import sys
+import threading
+import time
+import uuid
+
+from ..config.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+SnapshotKey = Tuple[str, str, str, str]
+
+
+class SnapshotNotFoundError(LookupError):
+    """Raised when a snapshot id is unknown or has expired."""
+    pass
+
+
+@dataclass
+class MarketDataSnapshot:
+    """A materialized market data result stored column-wise for cheap slicing."""
+    snapshot_id: str
+    security: str
+    field: str
+    start_date: str
+    end_date: str
+    dates: Tuple[Any, ...]
+    values: Tuple[Any, ...]
+    created_at: float = field(default_factory=time.time)
+    size_bytes: int = 0
+
+    @property
+    def key(self) -> SnapshotKey:
+        """Cache key of the query this snapshot was built from."""
+        return (self.security, self.field, self.start_date, self.end_date)
+
+    @property
+    def total_records(self) -> int:
+        """Number of records in the snapshot."""
+        return len(self.dates)
+
+    def slice(self, start: int, end: int) -> List[Dict[str, Any]]:
+        """Build record dicts for a slice of the snapshot."""
+        return [
+            {
+                'security': self.security,
+                'field': self.field,
+                'date': date_value,
+                'value': value
+            }
+            for date_value, value in zip(self.dates[start:end], self.values[start:end])
+        ]
+
+    @classmethod
+    def from_records(cls, key: SnapshotKey, records: List[Any]) -> 'MarketDataSnapshot':
+        """Build a snapshot from MarketDataRecord entities."""
+        security, field_name, start_date, end_date = key
+        dates = tuple(
+            record.date.isoformat() if isinstance(record.date, datetime) else record.date
+            for record in records
+        )
+        values = tuple(record.value for record in records)
+
+        size_bytes = sys.getsizeof(dates) + sys.getsizeof(values)
+        size_bytes += sum(sys.getsizeof(value) for value in dates)
+        size_bytes += sum(sys.getsizeof(value) for value in values)
+
+        return cls(
+            snapshot_id=uuid.uuid4().hex,
+            security=security,
+            field=field_name,
+            start_date=start_date,
+            end_date=end_date,
+            dates=dates,
+            values=values,
+            size_bytes=size_bytes
+        )
+
+
+class SnapshotCache:
+    """Thread-safe, memory-bounded LRU cache of snapshots with a TTL."""
+
+    def __init__(self, ttl_seconds: int, max_bytes: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_bytes = max_bytes
+        self._snapshots: 'OrderedDict[str, MarketDataSnapshot]' = OrderedDict()
+        self._ids_by_key: Dict[SnapshotKey, str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, snapshot_id: str) -> MarketDataSnapshot:
+        """
+        Get a snapshot by id.
+
+        Raises:
+            SnapshotNotFoundError: If the snapshot is unknown or expired
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(snapshot_id)
+            if snapshot is None or self._is_expired(snapshot):
+                if snapshot is not None:
+                    self._remove(snapshot_id)
+                raise SnapshotNotFoundError(f"Snapshot {snapshot_id} not found or expired")
+
+            self._snapshots.move_to_end(snapshot_id)
+            return snapshot
+
+    def find(self, key: SnapshotKey) -> Optional[MarketDataSnapshot]:
+        """Get the latest live snapshot for a query key, if any."""
+        with self._lock:
+            snapshot_id = self._ids_by_key.get(key)
+        if snapshot_id is None:
+            return None
+        try:
+            return self.get(snapshot_id)
+        except SnapshotNotFoundError:
+            return None
+
+    def put(self, snapshot: MarketDataSnapshot) -> None:
+        """Store a snapshot, evicting least recently used snapshots to stay within the memory bound."""
+        if snapshot.size_bytes > self._max_bytes:
+            logger.warning(f"Snapshot of {snapshot.size_bytes} bytes exceeds the cache limit, not caching")
+            return
+
+        with self._lock:
+            self._evict_expired()
+            while self._snapshots and self._total_bytes + snapshot.size_bytes > self._max_bytes:
+                oldest_id = next(iter(self._snapshots))
+                self._remove(oldest_id)
+
+            self._snapshots[snapshot.snapshot_id] = snapshot
+            self._ids_by_key[snapshot.key] = snapshot.snapshot_id
+            self._total_bytes += snapshot.size_bytes
+
+    def clear(self) -> None:
+        """Drop all snapshots."""
+        with self._lock:
+            self._snapshots.clear()
+            self._ids_by_key.clear()
+            self._total_bytes = 0
+
+    def _is_expired(self, snapshot: MarketDataSnapshot) -> bool:
+        return time.time() - snapshot.created_at > self._ttl_seconds
+
+    def _evict_expired(self) -> None:
+        expired = [sid for sid, snapshot in self._snapshots.items() if self._is_expired(snapshot)]
+        for snapshot_id in expired:
+            self._remove(snapshot_id)
+
+    def _remove(self, snapshot_id: str) -> None:
+        snapshot = self._snapshots.pop(snapshot_id, None)
+        if snapshot is None:
+            return
+        self._total_bytes -= snapshot.size_bytes
+        if self._ids_by_key.get(snapshot.key) == snapshot_id:
+            del self._ids_by_key[snapshot.key]
+
+
+# Global snapshot cache instance for market data batches
+market_data_snapshot_cache = SnapshotCache(
+    ttl_seconds=AppConfig.MARKET_DATA_SNAPSHOT_TTL_SECONDS,
+    max_bytes=AppConfig.MARKET_DATA_SNAPSHOT_MAX_BYTES
+)
@@ -0,0 +1,110 @@
+"""
+In-process TTL cache with stale-while-revalidate refresh.
+"""
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Optional
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _CacheEntry:
+    value: Any
+    loaded_at: float
+    expires_at: float
+
+
+class TtlCache:
+    """
+    Thread-safe TTL cache for slowly changing metadata.
+    
+    Fresh entries are returned directly. Entries past their TTL but within the stale window
+    are still returned immediately while a background thread reloads them
+    (stale-while-revalidate). Missing or fully expired entries are loaded synchronously,
+    with concurrent callers for the same key waiting on a single load.
+    """
+    
+    def __init__(self, name: str, ttl_seconds: int, stale_seconds: int = 0):
+        self.name = name
+        self._ttl_seconds = ttl_seconds
+        self._stale_seconds = stale_seconds
+        self._entries: Dict[Hashable, _CacheEntry] = {}
+        self._refreshing: Dict[Hashable, threading.Thread] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+    
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Get a cached value, loading it with loader when missing or expired."""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        
+        if entry is not None:
+            if now < entry.expires_at:
+                return entry.value
+            if now < entry.expires_at + self._stale_seconds:
+                self._refresh_in_background(key, loader)
+                return entry.value
+        
+        with self._key_lock(key):
+            # Another caller may have loaded the value while we waited
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() < entry.expires_at:
+                return entry.value
+            return self._load(key, loader)
+    
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        """Drop one key, or all keys when key is None."""
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+        logger.info(f"Invalidated cache '{self.name}'" + (f" key {key}" if key is not None else ""))
+    
+    def loaded_at(self, key: Hashable) -> Optional[float]:
+        """Wall-clock time the cached value for key was loaded, if cached."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        return time.time() - (time.monotonic() - entry.loaded_at)
+    
+    def _load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        generation = self._generation
+        value = loader()
+        now = time.monotonic()
+        with self._lock:
+            # Do not resurrect an entry invalidated while it was loading
+            if generation == self._generation:
+                self._entries[key] = _CacheEntry(value=value, loaded_at=now, expires_at=now + self._ttl_seconds)
+        return value
+    
+    def _refresh_in_background(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            thread = threading.Thread(
+                target=self._background_refresh, args=(key, loader),
+                name=f"cache-refresh-{self.name}", daemon=True
+            )
+            self._refreshing[key] = thread
+        thread.start()
+    
+    def _background_refresh(self, key: Hashable, loader: Callable[[], Any]) -> None:
+        try:
+            with self._key_lock(key):
+                self._load(key, loader)
+            logger.debug(f"Refreshed cache '{self.name}' key {key}")
+        except Exception as e:
+            logger.warning(f"Background refresh of cache '{self.name}' failed, serving stale value: {e}")
+        finally:
+            with self._lock:
+                self._refreshing.pop(key, None)
+    
+    def _key_lock(self, key: Hashable) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
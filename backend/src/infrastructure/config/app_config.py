@@ -92,6 +92,110 @@ class AppConfig:
     # CORS settings
     CORS_ORIGINS = os.getenv('CORS_ORIGINS', 'http://localhost:3000').split(',')
     
+    # Interval between database health checks of the service container
+    DB_HEALTH_CHECK_INTERVAL_SECONDS = int(os.getenv('DB_HEALTH_CHECK_INTERVAL_SECONDS', '60'))
+    
+    # Catalog metadata cache (categories): TTL and additional window in which stale values are served while refreshing
+    METADATA_CACHE_TTL_SECONDS = int(os.getenv('METADATA_CACHE_TTL_SECONDS', '3600'))
+    METADATA_CACHE_STALE_SECONDS = int(os.getenv('METADATA_CACHE_STALE_SECONDS', '86400'))
+    
+    # Fund directory: per-catalog fund lists built at startup and refreshed incrementally in the background
+    FUND_DIRECTORY_ENABLED = os.getenv('FUND_DIRECTORY_ENABLED', 'true').lower() == 'true'
+    FUND_DIRECTORY_REFRESH_SECONDS = int(os.getenv('FUND_DIRECTORY_REFRESH_SECONDS', '300'))
+    FUND_DIRECTORY_FULL_REBUILD_SECONDS = int(os.getenv('FUND_DIRECTORY_FULL_REBUILD_SECONDS', '86400'))
+    
+    # Security/field index for BLOOMBERG_ODD_MONTHLY, reloaded on a schedule
+    SECURITY_INDEX_ENABLED = os.getenv('SECURITY_INDEX_ENABLED', 'true').lower() == 'true'
+    SECURITY_INDEX_REFRESH_SECONDS = int(os.getenv('SECURITY_INDEX_REFRESH_SECONDS', '900'))
+    
+    # Token required by admin endpoints; when unset the admin endpoints are disabled
+    ADMIN_API_TOKEN = os.getenv('ADMIN_API_TOKEN', None)
+    
+    # Market data batch snapshot cache
+    MARKET_DATA_SNAPSHOT_TTL_SECONDS = int(os.getenv('MARKET_DATA_SNAPSHOT_TTL_SECONDS', '300'))
+    MARKET_DATA_SNAPSHOT_MAX_BYTES = int(os.getenv('MARKET_DATA_SNAPSHOT_MAX_BYTES', str(256 * 1024 * 1024)))
+    
+    # Bulk market data downloads: maximum securities plus fields per request (SQL Server allows 2100 parameters)
+    MARKET_DATA_BULK_MAX_ITEMS = int(os.getenv('MARKET_DATA_BULK_MAX_ITEMS', '1000'))
+    
+    # Streaming downloads: number of NDJSON rows written per response chunk
+    STREAM_ROWS_PER_CHUNK = int(os.getenv('STREAM_ROWS_PER_CHUNK', '500'))
+    
+    # Arrow/Parquet exports: rows per record batch and Parquet compression codec
+    EXPORT_BATCH_ROWS = int(os.getenv('EXPORT_BATCH_ROWS', '10000'))
+    EXPORT_PARQUET_COMPRESSION = os.getenv('EXPORT_PARQUET_COMPRESSION', 'snappy')
+    
+    # Response compression (content encodings in preference order; br/zstd need brotli/zstandard installed)
+    COMPRESSION_ENABLED = os.getenv('COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_ALGORITHMS = [
+        name.strip() for name in os.getenv('COMPRESSION_ALGORITHMS', 'zstd,br,gzip,deflate').split(',') if name.strip()
+    ]
+    COMPRESSION_MIN_SIZE = int(os.getenv('COMPRESSION_MIN_SIZE', '1024'))
+    COMPRESSION_LEVEL = int(os.getenv('COMPRESSION_LEVEL', '6'))
+    
+    # Upload bodies sent with Content-Encoding gzip/deflate (zstd needs zstandard) are decompressed as a stream,
+    # up to REQUEST_MAX_DECOMPRESSED_BYTES; the decoded JSON body is still held in memory as a whole
+    REQUEST_DECOMPRESSION_ENABLED = os.getenv('REQUEST_DECOMPRESSION_ENABLED', 'true').lower() == 'true'
+    REQUEST_MAX_DECOMPRESSED_BYTES = int(os.getenv('REQUEST_MAX_DECOMPRESSED_BYTES', str(64 * 1024 * 1024)))
+    
+    # JSON encoder for API responses: orjson (used when installed) or stdlib
+    JSON_PROVIDER = os.getenv('JSON_PROVIDER', 'orjson').lower()
+    
+    # Asynchronous uploads: NiFi forwarding workers, additional queued uploads, and the job store
+    UPLOAD_WORKERS = int(os.getenv('UPLOAD_WORKERS', '4'))
+    UPLOAD_QUEUE_SIZE = int(os.getenv('UPLOAD_QUEUE_SIZE', '100'))
+    UPLOAD_JOB_DB_PATH = os.getenv('UPLOAD_JOB_DB_PATH', None)
+    UPLOAD_JOB_RETENTION_SECONDS = int(os.getenv('UPLOAD_JOB_RETENTION_SECONDS', str(7 * 86400)))
+    
+    # Uploads are forwarded to NiFi in chunks of UPLOAD_CHUNK_SIZE records, sent concurrently by
+    # UPLOAD_CHUNK_WORKERS threads shared by all uploads; chunks NiFi rejects with 503 are retried with backoff
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', '5000'))
+    UPLOAD_CHUNK_WORKERS = int(os.getenv('UPLOAD_CHUNK_WORKERS', '4'))
+    UPLOAD_CHUNK_RETRIES = int(os.getenv('UPLOAD_CHUNK_RETRIES', '2'))
+    UPLOAD_CHUNK_RETRY_BACKOFF_SECONDS = float(os.getenv('UPLOAD_CHUNK_RETRY_BACKOFF_SECONDS', '1'))
+    
+    # Payload format posted to NiFi: records (one object per record with its metadata) or columnar
+    NIFI_UPLOAD_FORMAT = os.getenv('NIFI_UPLOAD_FORMAT', 'records').lower()
+    
+    # Uploads are validated against the schema of their type; at most this many errors are listed per upload
+    UPLOAD_VALIDATION_MAX_ERRORS = int(os.getenv('UPLOAD_VALIDATION_MAX_ERRORS', '1000'))
+    
+    # Duplicate check against the fingerprints of records forwarded before: drop, report or off
+    UPLOAD_DUPLICATE_MODE = os.getenv('UPLOAD_DUPLICATE_MODE', 'drop').lower()
+    # Records repeated within one upload are only reported unless this is enabled in drop mode
+    UPLOAD_DROP_REPEATED_RECORDS = os.getenv('UPLOAD_DROP_REPEATED_RECORDS', 'false').lower() == 'true'
+    UPLOAD_FINGERPRINT_DB_PATH = os.getenv('UPLOAD_FINGERPRINT_DB_PATH', None)
+    UPLOAD_FINGERPRINT_FILTER_ERROR_RATE = float(os.getenv('UPLOAD_FINGERPRINT_FILTER_ERROR_RATE', '0.01'))
+    
+    # Resumable upload sessions: chunks are kept on disk until the session is inactive for the TTL
+    UPLOAD_SESSION_DIR = os.getenv('UPLOAD_SESSION_DIR', None)
+    UPLOAD_SESSION_TTL_SECONDS = int(os.getenv('UPLOAD_SESSION_TTL_SECONDS', '86400'))
+    UPLOAD_SESSION_MAX_CHUNKS = int(os.getenv('UPLOAD_SESSION_MAX_CHUNKS', '10000'))
+    
+    @classmethod
+    def get_upload_session_dir(cls) -> str:
+        """Get the directory of the upload session store and its chunks."""
+        if cls.UPLOAD_SESSION_DIR:
+            return cls.UPLOAD_SESSION_DIR
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        return os.path.join(backend_dir, 'data', 'upload_sessions')
+    
+    @classmethod
+    def get_upload_fingerprint_db_path(cls) -> str:
+        """Get the path of the SQLite upload fingerprint index."""
+        if cls.UPLOAD_FINGERPRINT_DB_PATH:
+            return cls.UPLOAD_FINGERPRINT_DB_PATH
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        return os.path.join(backend_dir, 'data', 'upload_fingerprints.db')
+    
+    @classmethod
+    def get_upload_job_db_path(cls) -> str:
+        """Get the path of the SQLite upload job store."""
+        if cls.UPLOAD_JOB_DB_PATH:
+            return cls.UPLOAD_JOB_DB_PATH
+        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+        return os.path.join(backend_dir, 'data', 'upload_jobs.db')
+    
     # SSL/HTTPS configuration for external services
     @classmethod
     def get_certificates_path(cls) -> str:
@@ -103,6 +207,16 @@ class AppConfig:
     # NiFi HTTPS Configuration
     NIFI_ENDPOINT = os.getenv('NIFI_ENDPOINT', 'https://server-vs81t.intranet.local:8443/nifi/api/excel-addin-upload')
     NIFI_VERIFY_SSL = os.getenv('NIFI_VERIFY_SSL', 'true').lower() == 'true'
+    NIFI_TIMEOUT_SECONDS = float(os.getenv('NIFI_TIMEOUT_SECONDS', '30'))
+    
+    # NiFi client: keep-alive connections kept in the pool, and retries with exponential backoff
+    NIFI_POOL_SIZE = int(os.getenv('NIFI_POOL_SIZE', '8'))
+    NIFI_MAX_RETRIES = int(os.getenv('NIFI_MAX_RETRIES', '3'))
+    NIFI_RETRY_BACKOFF_SECONDS = float(os.getenv('NIFI_RETRY_BACKOFF_SECONDS', '0.5'))
+    
+    # gzip the JSON bodies posted to NiFi (the NiFi flow must decompress them)
+    NIFI_COMPRESS_REQUESTS = os.getenv('NIFI_COMPRESS_REQUESTS', 'false').lower() == 'true'
+    NIFI_COMPRESSION_LEVEL = int(os.getenv('NIFI_COMPRESSION_LEVEL', '6'))
     
     # Certificate file paths (relative to certificates directory)
     NIFI_CA_CERT_PATH = os.getenv('NIFI_CA_CERT_PATH', None)
@@ -0,0 +1,36 @@
+"""
+Column schemas of the data upload types.
+"""
+from typing import Tuple
+
+from ...domain.entities.upload_schema import UploadColumn, UploadSchema, COLUMN_DATE, COLUMN_NUMBER, COLUMN_TEXT
+
+# Columns of the add-in's upload template sheet
+TEMPLATE_COLUMNS: Tuple[UploadColumn, ...] = (
+    UploadColumn('Security', COLUMN_TEXT, required=True),
+    UploadColumn('Cost', COLUMN_NUMBER),
+    UploadColumn('Performance', COLUMN_NUMBER),
+    UploadColumn('Date', COLUMN_DATE, required=True),
+    UploadColumn('Identifier', COLUMN_TEXT),
+)
+
+UPLOAD_SCHEMAS: Tuple[UploadSchema, ...] = (
+    UploadSchema(
+        id='windmill_statistics',
+        name='Windmill Statistics',
+        description='Statistical data for windmill performance analysis',
+        columns=TEMPLATE_COLUMNS
+    ),
+    UploadSchema(
+        id='financial_outperformance',
+        name='Financial Outperformance',
+        description='Financial performance comparison data',
+        columns=TEMPLATE_COLUMNS
+    ),
+    UploadSchema(
+        id='excellence_accounting',
+        name='Excellence Accounting',
+        description='Accounting excellence metrics and data',
+        columns=TEMPLATE_COLUMNS
+    ),
+)
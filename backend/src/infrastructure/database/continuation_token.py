@@ -0,0 +1,93 @@
+"""
+Opaque continuation tokens for keyset pagination.
+
+A token carries the ordering key of the last row returned, the total record
+count computed on the first page and a fingerprint of the request it belongs
+to, so a token cannot be replayed against a different query.
+"""
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Tuple
+
+
+def request_fingerprint(*parts: Any) -> str:
+    """Build a short fingerprint identifying the query a token belongs to."""
+    raw = '|'.join('' if part is None else str(part) for part in parts)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def _encode_value(value: Any) -> Any:
+    """Encode a key value into a JSON-safe tagged representation."""
+    if isinstance(value, datetime):
+        return {'dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'dec': str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Decode a tagged key value back into its Python type."""
+    if isinstance(value, dict):
+        if 'dt' in value:
+            return datetime.fromisoformat(value['dt'])
+        if 'd' in value:
+            return date.fromisoformat(value['d'])
+        if 'dec' in value:
+            return Decimal(value['dec'])
+        raise ValueError('Unknown key value encoding in continuation token')
+    return value
+
+
+def encode_token(key_values: List[Any], total_records: Optional[int], fingerprint: str) -> str:
+    """
+    Encode the last key of a page into an opaque continuation token.
+
+    Args:
+        key_values: Ordering key values of the last returned row
+        total_records: Total record count of the query, if known
+        fingerprint: Fingerprint of the originating request
+
+    Returns:
+        URL-safe token string
+    """
+    payload = {
+        'k': [_encode_value(value) for value in key_values],
+        't': total_records,
+        'f': fingerprint
+    }
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_token(token: str, fingerprint: str) -> Tuple[List[Any], Optional[int]]:
+    """
+    Decode a continuation token.
+
+    Args:
+        token: Token previously produced by encode_token
+        fingerprint: Fingerprint of the current request
+
+    Returns:
+        Tuple of (key values, total record count)
+
+    Raises:
+        ValueError: If the token is malformed or belongs to a different request
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+        key_values = [_decode_value(value) for value in payload['k']]
+        total_records = payload.get('t')
+        token_fingerprint = payload.get('f')
+    except (ValueError, KeyError, TypeError) as e:
+        raise ValueError(f'Invalid continuation token: {e}') from e
+
+    if token_fingerprint != fingerprint:
+        raise ValueError('Continuation token does not match the current request')
+
+    return key_values, total_records
@@ -4,7 +4,7 @@ Database connection and session management.
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from contextlib import contextmanager
-from typing import Generator
+from typing import Any, Dict, Generator, List, Tuple
 import logging
 
 from ..config.app_config import DatabaseConfig
@@ -91,6 +91,86 @@ class DatabaseManager:
                 logger.error(f"Parameters: {params}")
                 raise
     
+    def stream_query(self, query: str, params: dict = None,
+                     chunk_size: int = 1000) -> Generator[Dict[str, Any], None, None]:
+        """
+        Execute raw SQL query with a server-side cursor and yield rows as dictionaries.
+        Rows are fetched from the driver in chunks of chunk_size, so memory stays bounded
+        regardless of the result size. The session stays open until the generator is exhausted or closed.
+        """
+        if self._is_mock_mode:
+            raise RuntimeError("Database is in mock mode - no real database connection available")
+            
+        with self.get_session() as session:
+            try:
+                statement = text(query).execution_options(stream_results=True, yield_per=chunk_size)
+                result = session.execute(statement, params or {})
+                columns = list(result.keys())
+                
+                for partition in result.partitions():
+                    for row in partition:
+                        yield dict(zip(columns, row))
+                        
+            except Exception as e:
+                logger.error(f"Streaming query execution failed: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Parameters: {params}")
+                raise
+    
+    def execute_query_rows(self, query: str, params: dict = None) -> Tuple[List[Tuple[str, Any]], List[tuple]]:
+        """
+        Execute raw SQL query and return the column description and the rows as tuples,
+        leaving value conversion to the caller.
+        
+        Returns:
+            Tuple of ((column name, driver type code) per column, rows)
+        """
+        if self._is_mock_mode:
+            raise RuntimeError("Database is in mock mode - no real database connection available")
+            
+        with self.get_session() as session:
+            try:
+                result = session.execute(text(query), params or {})
+                description = self._describe(result)
+                return description, [tuple(row) for row in result.fetchall()]
+                
+            except Exception as e:
+                logger.error(f"Query execution failed: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Parameters: {params}")
+                raise
+    
+    def stream_query_rows(self, query: str, params: dict = None,
+                          chunk_size: int = 1000) -> Generator[Tuple[List[Tuple[str, Any]], List[tuple]], None, None]:
+        """
+        Execute raw SQL query with a server-side cursor and yield chunks of rows as tuples,
+        each together with the column description.
+        """
+        if self._is_mock_mode:
+            raise RuntimeError("Database is in mock mode - no real database connection available")
+            
+        with self.get_session() as session:
+            try:
+                statement = text(query).execution_options(stream_results=True, yield_per=chunk_size)
+                result = session.execute(statement, params or {})
+                description = self._describe(result)
+                
+                for partition in result.partitions():
+                    yield description, [tuple(row) for row in partition]
+                        
+            except Exception as e:
+                logger.error(f"Streaming query execution failed: {e}")
+                logger.error(f"Query: {query}")
+                logger.error(f"Parameters: {params}")
+                raise
+    
+    @staticmethod
+    def _describe(result) -> List[Tuple[str, Any]]:
+        """Column names with the driver type codes from cursor.description, when available."""
+        cursor_description = getattr(getattr(result, 'cursor', None), 'description', None) or []
+        type_codes = {entry[0]: entry[1] for entry in cursor_description}
+        return [(column, type_codes.get(column)) for column in result.keys()]
+    
     def execute_scalar_query(self, query: str, params: dict = None):
         """Execute query and return single value."""
         if self._is_mock_mode:
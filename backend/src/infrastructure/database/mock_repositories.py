@@ -1,13 +1,20 @@
 """
 Mock repository implementations for testing without database connectivity.
 """
-from typing import List
+from typing import Iterator, List, Optional
 import logging
 
 from ...domain.repositories.raw_data_repository import IRawDataRepository
 from ...domain.repositories.market_data_repository import IMarketDataRepository
-from ...domain.entities.raw_data import FileCategory, Fund, RawDataRecord, RawDataRequest
-from ...domain.entities.market_data import Security, DataField, MarketDataRecord, MarketDataRequest
+from ...domain.entities.raw_data import (
+    FileCategory, Fund, RawDataRecord, RawDataRequest, RawDataPage, CatalogWatermark,
+    RawDataFilter, FILTER_EQ, FILTER_IN
+)
+from ...domain.entities.market_data import (
+    Security, DataField, MarketDataRecord, MarketDataRequest, SecurityFieldCoverage,
+    BulkMarketDataRequest, MarketDataSeries
+)
+from .continuation_token import encode_token, decode_token, request_fingerprint
 
 logger = logging.getLogger(__name__)
 
@@ -35,6 +42,15 @@ class MockRawDataRepository(IRawDataRepository):
             Fund(fund="REAL_ESTATE_FUND", catalog=catalog)
         ]
     
+    def get_catalog_watermark(self, catalog: str) -> CatalogWatermark:
+        """Get a fixed mock watermark."""
+        import datetime
+        return CatalogWatermark(max_load_ts=datetime.datetime(2024, 1, 1), max_delivery_id=1)
+    
+    def get_funds_by_catalog_since(self, catalog: str, watermark: CatalogWatermark) -> List[Fund]:
+        """Mock data never changes, so there are no new funds."""
+        return []
+    
     def get_raw_data(self, request: RawDataRequest) -> List[RawDataRecord]:
         """Get mock raw data."""
         # Generate mock data based on date range
@@ -59,11 +75,75 @@ class MockRawDataRepository(IRawDataRepository):
                 'currency': 'USD'
             }
             
-            data.append(RawDataRecord(data=record_data))
+            data.append(record_data)
             current_date += datetime.timedelta(days=1)
         
-        return data[:50]  # Limit to 50 records for demo
+        data = self._apply_request_options(data[:50], request)  # Limit to 50 records for demo
+        return [RawDataRecord(data=row) for row in data]
+    
+    def iter_raw_data(self, request: RawDataRequest) -> Iterator[RawDataRecord]:
+        """Iterate over mock raw data."""
+        yield from self.get_raw_data(request)
+    
+    def get_raw_data_page(self, request: RawDataRequest, page_size: int,
+                          continuation_token: Optional[str] = None) -> RawDataPage:
+        """Get a page of mock raw data, using the record offset as key."""
+        if request.order_by or request.limit is not None:
+            raise ValueError('order_by and limit are not supported with keyset pagination')
+        
+        fingerprint = request_fingerprint(
+            request.catalog, request.fund, request.start_date, request.end_date,
+            request.columns, request.filters
+        )
+        offset = 0
+        if continuation_token:
+            key_values, _ = decode_token(continuation_token, fingerprint)
+            offset = int(key_values[0])
+        
+        all_records = self.get_raw_data(request)
+        records = all_records[offset:offset + page_size]
+        has_more = offset + page_size < len(all_records)
+        
+        return RawDataPage(
+            records=records,
+            has_more=has_more,
+            continuation_token=encode_token([offset + page_size], len(all_records), fingerprint) if has_more else None,
+            total_records=len(all_records)
+        )
 
+    
+    @staticmethod
+    def _apply_request_options(rows: List[dict], request: RawDataRequest) -> List[dict]:
+        """Apply column projection, filters, ordering and limit the way the SQL query would."""
+        columns = list(rows[0].keys()) if rows else []
+        by_name = {column.upper(): column for column in columns}
+        
+        def resolve(name: str) -> str:
+            if rows and name.upper() not in by_name:
+                raise ValueError(f"Unknown column '{name}' for catalog {request.catalog}")
+            return by_name.get(name.upper(), name)
+        
+        def matches(row: dict, row_filter: RawDataFilter) -> bool:
+            value = row.get(resolve(row_filter.column))
+            if row_filter.operator == FILTER_EQ:
+                return value == row_filter.value
+            if row_filter.operator == FILTER_IN:
+                return value in row_filter.values
+            if value is None:
+                return False
+            if row_filter.min_value is not None and value < row_filter.min_value:
+                return False
+            return row_filter.max_value is None or value <= row_filter.max_value
+        
+        rows = [row for row in rows if all(matches(row, row_filter) for row_filter in request.filters)]
+        for order in reversed(request.order_by):
+            rows.sort(key=lambda row: row.get(resolve(order.column)), reverse=order.descending)
+        if request.limit is not None:
+            rows = rows[:request.limit]
+        if request.columns:
+            selected = list(dict.fromkeys(resolve(name) for name in request.columns))
+            rows = [{column: row[column] for column in selected} for row in rows]
+        return rows
 
 class MockMarketDataRepository(IMarketDataRepository):
     """Mock implementation of market data repository for testing."""
@@ -89,6 +169,21 @@ class MockMarketDataRepository(IMarketDataRepository):
             DataField(field="MARKET_CAP", security=security)
         ]
     
+    def get_security_field_coverage(self) -> List[SecurityFieldCoverage]:
+        """Get mock coverage for every mock security and field."""
+        import datetime
+        
+        return [
+            SecurityFieldCoverage(
+                security=security.security,
+                field=field.field,
+                min_date=datetime.datetime(2020, 1, 31),
+                max_date=datetime.datetime(2024, 12, 31)
+            )
+            for security in self.get_securities()
+            for field in self.get_fields_by_security(security.security)
+        ]
+    
     def get_market_data(self, request: MarketDataRequest) -> List[MarketDataRecord]:
         """Get mock market data."""
         import datetime
@@ -119,4 +214,21 @@ class MockMarketDataRepository(IMarketDataRepository):
             data.append(record)
             current_date += datetime.timedelta(days=1)
         
-        return data[:50]  # Limit to 50 records for demo
\ No newline at end of file
+        return data[:50]  # Limit to 50 records for demo
+    
+    def iter_market_data(self, request: MarketDataRequest) -> Iterator[MarketDataRecord]:
+        """Iterate over mock market data."""
+        yield from self.get_market_data(request)
+    
+    def get_bulk_market_data(self, request: BulkMarketDataRequest) -> List[MarketDataSeries]:
+        """Get mock market data for every requested (security, field) pair."""
+        return [
+            MarketDataSeries(
+                security=security,
+                field=field,
+                records=self.get_market_data(
+                    MarketDataRequest(security, field, request.start_date, request.end_date)
+                )
+            )
+            for security, field in request.pairs
+        ]
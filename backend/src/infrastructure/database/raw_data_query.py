@@ -0,0 +1,188 @@
+"""
+Query builder for raw data catalog tables.
+
+Builds parameterized SELECT and COUNT queries with column projection, typed column
+filters, ORDER BY/TOP and an index-friendly half-open LOAD_TS range. Every column name
+is resolved against the table's INFORMATION_SCHEMA metadata, so identifiers placed in
+the SQL text always come from the database itself.
+"""
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from ...domain.entities.raw_data import (
+    RawDataRequest, RawDataFilter, FILTER_EQ, FILTER_IN, FILTER_RANGE
+)
+from .schema_registry import TableColumn, TableMetadata
+
+INTEGER_TYPES = {'tinyint', 'smallint', 'int', 'bigint'}
+DECIMAL_TYPES = {'decimal', 'numeric', 'money', 'smallmoney'}
+FLOAT_TYPES = {'float', 'real'}
+DATE_TYPES = {'date'}
+DATETIME_TYPES = {'datetime', 'datetime2', 'smalldatetime', 'datetimeoffset'}
+BOOLEAN_TYPES = {'bit'}
+
+# Suffix of the alias under which a column is additionally selected as text
+TEXT_ALIAS_SUFFIX = '__text'
+
+
+def quote_identifier(name: str) -> str:
+    """Quote a SQL Server identifier."""
+    return '[' + name.replace(']', ']]') + ']'
+
+
+def coerce_value(column: TableColumn, value: Any) -> Any:
+    """
+    Convert a JSON filter value to the Python type of the column.
+    
+    Raises:
+        ValueError: If the value cannot be converted
+    """
+    if value is None:
+        return None
+    
+    data_type = column.data_type.lower()
+    try:
+        if data_type in INTEGER_TYPES:
+            if isinstance(value, bool) or (isinstance(value, float) and not value.is_integer()):
+                raise ValueError(value)
+            return int(value)
+        if data_type in DECIMAL_TYPES:
+            return Decimal(str(value))
+        if data_type in FLOAT_TYPES:
+            return float(value)
+        if data_type in BOOLEAN_TYPES:
+            if isinstance(value, str):
+                if value.lower() not in ('true', 'false', '1', '0'):
+                    raise ValueError(value)
+                return value.lower() in ('true', '1')
+            return bool(value)
+        if data_type in DATETIME_TYPES:
+            return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+        if data_type in DATE_TYPES:
+            return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+    except (ValueError, TypeError, InvalidOperation):
+        raise ValueError(f"Invalid value {value!r} for column {column.name} of type {column.data_type}")
+    return value if isinstance(value, str) else str(value)
+
+
+class RawDataQueryBuilder:
+    """Builds SQL for a raw data request against one catalog table."""
+    
+    def __init__(self, request: RawDataRequest, metadata: TableMetadata, fund_column: Optional[str] = None):
+        """
+        Args:
+            request: Raw data request to build queries for
+            metadata: Column metadata of request.catalog
+            fund_column: Fund column of the catalog, if fund filtering applies
+        
+        Raises:
+            ValueError: If a requested, filtered or ordered column does not exist
+                or a filter value does not match its column type
+        """
+        self._request = request
+        self._metadata = metadata
+        self._table = f"test.dbo.{quote_identifier(metadata.catalog)}"
+        
+        self.columns: Optional[List[str]] = None
+        if request.columns:
+            # Keep request order and drop duplicates
+            resolved = [metadata.resolve(name).name for name in request.columns]
+            self.columns = list(dict.fromkeys(resolved))
+        
+        self._where, self._params = self._build_where(fund_column)
+        self._order_by = [
+            (metadata.resolve(order.column).name, order.descending) for order in request.order_by
+        ]
+    
+    def select(self, extra_columns: Sequence[str] = (), top: Optional[int] = None,
+               order_by: Optional[List[Tuple[str, bool]]] = None,
+               extra_where: Optional[str] = None,
+               extra_params: Optional[Dict[str, Any]] = None,
+               text_columns: Sequence[str] = ()) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build the SELECT query.
+        
+        Args:
+            extra_columns: Columns selected in addition to the projection (e.g. keyset columns)
+            text_columns: Columns additionally selected last, as full-precision ODBC canonical
+                text (style 121) aliased <column>__text
+            top: Row limit, defaults to the request limit
+            order_by: (column, descending) pairs, defaults to the request order
+            extra_where: Additional predicate ANDed to the filter
+            extra_params: Parameters of the additional predicate
+        
+        Returns:
+            Tuple of (SQL text, parameters)
+        """
+        if self.columns is None:
+            select_list = 'c.*'
+        else:
+            columns = list(dict.fromkeys(self.columns + [self._metadata.resolve(name).name for name in extra_columns]))
+            select_list = ', '.join(f"c.{quote_identifier(column)}" for column in columns)
+        for name in text_columns:
+            column = self._metadata.resolve(name).name
+            select_list += (f", CONVERT(nvarchar(40), c.{quote_identifier(column)}, 121) "
+                            f"AS {quote_identifier(column + TEXT_ALIAS_SUFFIX)}")
+        
+        top = self._request.limit if top is None else top
+        top_clause = f"TOP ({int(top)}) " if top is not None else ''
+        
+        where = self._where if not extra_where else f"{self._where} AND {extra_where}"
+        query = f"SELECT {top_clause}{select_list}\nFROM {self._table} c\nWHERE {where}"
+        
+        order_by = self._order_by if order_by is None else order_by
+        if order_by:
+            query += '\nORDER BY ' + ', '.join(
+                f"c.{quote_identifier(column)}{' DESC' if descending else ''}" for column, descending in order_by
+            )
+        
+        return query, {**self._params, **(extra_params or {})}
+    
+    def count(self) -> Tuple[str, Dict[str, Any]]:
+        """Build a COUNT_BIG query over the filtered rows, ignoring TOP."""
+        query = f"SELECT COUNT_BIG(*)\nFROM {self._table} c\nWHERE {self._where}"
+        return query, dict(self._params)
+    
+    def _build_where(self, fund_column: Optional[str]) -> Tuple[str, Dict[str, Any]]:
+        # Half-open range on the raw LOAD_TS column so an index on it can be seeked
+        start, end = self._request.load_ts_range()
+        conditions = ["c.LOAD_TS >= :start", "c.LOAD_TS < :end"]
+        params: Dict[str, Any] = {'start': start, 'end': end}
+        
+        if fund_column:
+            conditions.insert(0, f"c.{quote_identifier(fund_column)} = :fund")
+            params['fund'] = self._request.fund
+        
+        for i, row_filter in enumerate(self._request.filters):
+            condition, filter_params = self._build_filter(f"f{i}", row_filter)
+            conditions.append(condition)
+            params.update(filter_params)
+        
+        return ' AND '.join(conditions), params
+    
+    def _build_filter(self, prefix: str, row_filter: RawDataFilter) -> Tuple[str, Dict[str, Any]]:
+        column = self._metadata.resolve(row_filter.column)
+        target = f"c.{quote_identifier(column.name)}"
+        
+        if row_filter.operator == FILTER_EQ:
+            if row_filter.value is None:
+                return f"{target} IS NULL", {}
+            return f"{target} = :{prefix}", {prefix: coerce_value(column, row_filter.value)}
+        
+        if row_filter.operator == FILTER_IN:
+            params = {f"{prefix}_{j}": coerce_value(column, value) for j, value in enumerate(row_filter.values)}
+            return f"{target} IN ({', '.join(':' + name for name in params)})", params
+        
+        if row_filter.operator == FILTER_RANGE:
+            conditions = []
+            params = {}
+            if row_filter.min_value is not None:
+                conditions.append(f"{target} >= :{prefix}_min")
+                params[f"{prefix}_min"] = coerce_value(column, row_filter.min_value)
+            if row_filter.max_value is not None:
+                conditions.append(f"{target} <= :{prefix}_max")
+                params[f"{prefix}_max"] = coerce_value(column, row_filter.max_value)
+            return '(' + ' AND '.join(conditions) + ')', params
+        
+        raise ValueError(f"Unsupported filter operator '{row_filter.operator}'")
@@ -0,0 +1,265 @@
+"""
+Registry of catalog table schemas and compiled per-column value converters.
+
+Column types come from INFORMATION_SCHEMA.COLUMNS for catalog tables, or from the
+DB-API cursor.description of a result for ad-hoc queries. For a given result column
+set the registry compiles one converter per column that needs one (Decimal, datetime,
+date, time, bytes, UUID) and caches it, so converting a result is a column-wise map
+of a few precompiled functions instead of per-value type checks during serialization.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import calendar
+import logging
+import threading
+import uuid
+
+from ...domain.entities.raw_data import VALUE_FORMAT_NATIVE, VALUE_FORMAT_JSON, VALUE_FORMAT_EPOCH
+from .db_manager import DatabaseManager, db_manager
+
+logger = logging.getLogger(__name__)
+
+# Value profiles, named after the record value formats of the domain
+NATIVE_PROFILE = VALUE_FORMAT_NATIVE  # Driver values, unchanged
+JSON_PROFILE = VALUE_FORMAT_JSON      # Decimal -> float, datetime/date/time -> ISO string, bytes -> hex string
+EPOCH_PROFILE = VALUE_FORMAT_EPOCH    # As json, but datetime and date -> epoch milliseconds (UTC)
+
+# Type families shared by SQL Server type names and driver type codes
+DECIMAL = 'decimal'
+DATETIME = 'datetime'
+DATE = 'date'
+TIME = 'time'
+BINARY = 'binary'
+GUID = 'guid'
+OTHER = 'other'
+
+SQL_TYPE_FAMILIES = {
+    'decimal': DECIMAL, 'numeric': DECIMAL, 'money': DECIMAL, 'smallmoney': DECIMAL,
+    'datetime': DATETIME, 'datetime2': DATETIME, 'smalldatetime': DATETIME, 'datetimeoffset': DATETIME,
+    'date': DATE,
+    'time': TIME,
+    'binary': BINARY, 'varbinary': BINARY, 'image': BINARY, 'timestamp': BINARY, 'rowversion': BINARY,
+    'uniqueidentifier': GUID,
+}
+
+# Driver type codes (pyodbc reports Python types in cursor.description)
+PYTHON_TYPE_FAMILIES = {
+    Decimal: DECIMAL,
+    datetime: DATETIME,
+    date: DATE,
+    time: TIME,
+    bytes: BINARY,
+    bytearray: BINARY,
+    uuid.UUID: GUID,
+}
+
+# Maximum number of compiled converters kept
+MAX_CONVERTERS = 512
+
+
+@dataclass(frozen=True)
+class TableColumn:
+    """A column of a catalog table as described by INFORMATION_SCHEMA.COLUMNS."""
+    name: str
+    data_type: str
+
+
+class TableMetadata:
+    """Columns of a catalog table, looked up case-insensitively."""
+    
+    def __init__(self, catalog: str, columns: Sequence[TableColumn]):
+        self.catalog = catalog
+        self.columns = list(columns)
+        self._by_name = {column.name.upper(): column for column in self.columns}
+    
+    def find(self, name: str) -> Optional[TableColumn]:
+        """Get a column by name, if the table has it."""
+        return self._by_name.get(str(name).upper())
+    
+    def resolve(self, name: str) -> TableColumn:
+        """
+        Resolve a requested column name to the table column.
+        
+        Raises:
+            ValueError: If the table has no such column
+        """
+        column = self.find(name)
+        if column is None:
+            raise ValueError(f"Unknown column '{name}' for catalog {self.catalog}")
+        return column
+
+
+def _epoch_millis(value: datetime) -> int:
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc)
+    return calendar.timegm(value.timetuple()) * 1000 + value.microsecond // 1000
+
+
+def _skip_none(convert: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    return lambda value: None if value is None else convert(value)
+
+
+_JSON_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    DECIMAL: _skip_none(float),
+    DATETIME: _skip_none(lambda value: value.isoformat()),
+    DATE: _skip_none(lambda value: value.isoformat()),
+    TIME: _skip_none(lambda value: value.isoformat()),
+    BINARY: _skip_none(lambda value: '0x' + bytes(value).hex().upper()),
+    GUID: _skip_none(str),
+}
+
+_EPOCH_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    **_JSON_CONVERTERS,
+    DATETIME: _skip_none(_epoch_millis),
+    DATE: _skip_none(lambda value: calendar.timegm(value.timetuple()) * 1000),
+}
+
+# Converter per type family for each profile; families without an entry are passed through
+PROFILE_CONVERTERS: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+    NATIVE_PROFILE: {},
+    JSON_PROFILE: _JSON_CONVERTERS,
+    EPOCH_PROFILE: _EPOCH_CONVERTERS,
+}
+
+
+def type_family(type_code: Any) -> str:
+    """Map a SQL Server type name or driver type code to a type family."""
+    if isinstance(type_code, str):
+        return SQL_TYPE_FAMILIES.get(type_code.lower(), OTHER)
+    if isinstance(type_code, type):
+        for python_type, family in PYTHON_TYPE_FAMILIES.items():
+            if issubclass(type_code, python_type):
+                return family
+    return OTHER
+
+
+class RowConverter:
+    """Converts result rows column-wise with precompiled per-column converters."""
+    
+    def __init__(self, columns: Sequence[str], converters: Sequence[Optional[Callable[[Any], Any]]]):
+        self.columns = list(columns)
+        self._converters = [(i, convert) for i, convert in enumerate(converters) if convert is not None]
+    
+    def convert_columns(self, rows: Sequence[Sequence[Any]]) -> List[List[Any]]:
+        """Transpose rows into converted column arrays."""
+        if not rows:
+            return [[] for _ in self.columns]
+        column_values = [list(values) for values in zip(*rows)]
+        for i, convert in self._converters:
+            column_values[i] = list(map(convert, column_values[i]))
+        return column_values
+    
+    def to_dicts(self, rows: Sequence[Sequence[Any]]) -> List[Dict[str, Any]]:
+        """Convert rows into row dictionaries."""
+        columns = self.columns
+        if not self._converters:
+            return [dict(zip(columns, row)) for row in rows]
+        return [dict(zip(columns, values)) for values in zip(*self.convert_columns(rows))]
+
+
+class SchemaRegistry:
+    """
+    Caches catalog column types and the converters compiled from them.
+    
+    Table metadata is loaded once per catalog from INFORMATION_SCHEMA.COLUMNS; converters
+    are compiled once per (column set, column types, profile) and reused across requests.
+    """
+    
+    def __init__(self, database: DatabaseManager = None, max_converters: int = MAX_CONVERTERS):
+        self._database = database or db_manager
+        self._max_converters = max_converters
+        self._tables: Dict[str, TableMetadata] = {}
+        self._converters: 'OrderedDict[Tuple, RowConverter]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.name = 'schemas'
+    
+    def get_table_metadata(self, catalog: str) -> TableMetadata:
+        """
+        Get the column metadata of a catalog table.
+        
+        Raises:
+            ValueError: If the catalog is not a table in the dbo schema
+        """
+        metadata = self._tables.get(catalog)
+        if metadata is not None:
+            return metadata
+        
+        query = """
+        SELECT COLUMN_NAME, DATA_TYPE
+        FROM INFORMATION_SCHEMA.COLUMNS
+        WHERE TABLE_SCHEMA = 'dbo'
+        AND TABLE_NAME = :catalog
+        ORDER BY ORDINAL_POSITION
+        """
+        
+        try:
+            results = self._database.execute_query(query, {'catalog': catalog})
+        except Exception as e:
+            logger.error(f"Failed to get column metadata for catalog {catalog}: {e}")
+            raise
+        
+        if not results:
+            raise ValueError(f"Unknown catalog: {catalog}")
+        
+        metadata = TableMetadata(
+            catalog,
+            [TableColumn(name=row['COLUMN_NAME'], data_type=row['DATA_TYPE']) for row in results]
+        )
+        with self._lock:
+            self._tables[catalog] = metadata
+        return metadata
+    
+    def get_converter(self, description: Sequence[Tuple[str, Any]], profile: str = JSON_PROFILE,
+                      catalog: Optional[str] = None) -> RowConverter:
+        """
+        Get the converter for a result column set.
+        
+        Args:
+            description: (column name, driver type code) per result column
+            profile: Value profile to convert to
+            catalog: Catalog table the result was selected from; its INFORMATION_SCHEMA
+                types take precedence over the driver type codes
+        
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        if profile not in PROFILE_CONVERTERS:
+            raise ValueError(f"Unknown value profile: {profile}")
+        
+        metadata = self._tables.get(catalog) if catalog else None
+        families = []
+        for name, type_code in description:
+            column = metadata.find(name) if metadata is not None else None
+            families.append(type_family(column.data_type if column is not None else type_code))
+        
+        key = (profile, tuple(name for name, _ in description), tuple(families))
+        with self._lock:
+            converter = self._converters.get(key)
+            if converter is not None:
+                self._converters.move_to_end(key)
+                return converter
+        
+        converters = PROFILE_CONVERTERS[profile]
+        converter = RowConverter(
+            [name for name, _ in description],
+            [converters.get(family) for family in families]
+        )
+        with self._lock:
+            self._converters[key] = converter
+            while len(self._converters) > self._max_converters:
+                self._converters.popitem(last=False)
+        return converter
+    
+    def invalidate(self) -> None:
+        """Drop cached table metadata and converters."""
+        with self._lock:
+            self._tables.clear()
+            self._converters.clear()
+        logger.info("Invalidated schema registry")
+
+
+# Global schema registry instance
+schema_registry = SchemaRegistry()
@@ -1,16 +1,36 @@
 """
 SQL Server implementation of market data repository.
 """
-from typing import List
+from typing import Any, Dict, Iterator, List, Tuple
 from datetime import datetime
 import logging
 
 from ...domain.repositories.market_data_repository import IMarketDataRepository
-from ...domain.entities.market_data import Security, DataField, MarketDataRecord, MarketDataRequest
+from ...domain.entities.market_data import (
+    Security, DataField, MarketDataRecord, MarketDataRequest, SecurityFieldCoverage,
+    BulkMarketDataRequest, MarketDataSeries
+)
 from ..database.db_manager import db_manager
 
 logger = logging.getLogger(__name__)
 
+MARKET_DATA_QUERY = """
+SELECT * 
+FROM BLOOMBERG_ODD_MONTHLY b 
+WHERE b.security = :security 
+AND b.field = :field 
+AND b.date BETWEEN :start AND :end
+"""
+
+BULK_MARKET_DATA_QUERY = """
+SELECT b.security, b.field, b.date, b.value
+FROM BLOOMBERG_ODD_MONTHLY b
+WHERE b.security IN ({securities})
+AND b.field IN ({fields})
+AND b.date BETWEEN :start AND :end
+ORDER BY b.security, b.field, b.date
+"""
+
 
 class SqlMarketDataRepository(IMarketDataRepository):
     """SQL Server implementation of market data repository."""
@@ -43,43 +63,92 @@ class SqlMarketDataRepository(IMarketDataRepository):
             logger.error(f"Failed to get fields for security {security}: {e}")
             raise
     
-    def get_market_data(self, request: MarketDataRequest) -> List[MarketDataRecord]:
-        """Get market data based on request parameters."""
+    def get_security_field_coverage(self) -> List[SecurityFieldCoverage]:
+        """Get all distinct (security, field) pairs with their date coverage."""
         query = """
-        SELECT * 
-        FROM BLOOMBERG_ODD_MONTHLY b 
-        WHERE b.security = :security 
-        AND b.field = :field 
-        AND b.date BETWEEN :start AND :end
+        SELECT b.security, b.field, MIN(b.date) AS min_date, MAX(b.date) AS max_date
+        FROM BLOOMBERG_ODD_MONTHLY b
+        GROUP BY b.security, b.field
         """
         
+        try:
+            results = db_manager.execute_query(query)
+            return [
+                SecurityFieldCoverage(
+                    security=row['security'],
+                    field=row['field'],
+                    min_date=row['min_date'],
+                    max_date=row['max_date']
+                )
+                for row in results
+                if row['security'] is not None and row['field'] is not None
+            ]
+        except Exception as e:
+            logger.error(f"Failed to get security field coverage: {e}")
+            raise
+    
+    def get_market_data(self, request: MarketDataRequest) -> List[MarketDataRecord]:
+        """Get market data based on request parameters."""
         params = request.to_query_params()
         
         try:
-            results = db_manager.execute_query(query, params)
-            market_data = []
-            
-            for row in results:
-                # Convert date if it's not already a datetime object
-                date_value = row.get('date')
-                if isinstance(date_value, str):
-                    try:
-                        date_value = datetime.fromisoformat(date_value)
-                    except ValueError:
-                        # Handle different date formats if needed
-                        pass
-                
-                record = MarketDataRecord(
-                    security=row.get('security'),
-                    field=row.get('field'),
-                    date=date_value,
-                    value=row.get('value')  # Assuming there's a value column
-                )
-                market_data.append(record)
-            
-            return market_data
+            results = db_manager.execute_query(MARKET_DATA_QUERY, params)
+            return [self._to_record(row) for row in results]
             
         except Exception as e:
             logger.error(f"Failed to get market data: {e}")
             logger.error(f"Request: {request}")
-            raise
\ No newline at end of file
+            raise
+    
+    def iter_market_data(self, request: MarketDataRequest) -> Iterator[MarketDataRecord]:
+        """Stream market data through a server-side cursor."""
+        for row in db_manager.stream_query(MARKET_DATA_QUERY, request.to_query_params()):
+            yield self._to_record(row)
+    
+    def get_bulk_market_data(self, request: BulkMarketDataRequest) -> List[MarketDataSeries]:
+        """Get market data for all requested (security, field) pairs with one IN-list query."""
+        query = BULK_MARKET_DATA_QUERY.format(
+            securities=', '.join(f':security_{i}' for i in range(len(request.securities))),
+            fields=', '.join(f':field_{i}' for i in range(len(request.fields)))
+        )
+        
+        try:
+            series = {pair: MarketDataSeries(security=pair[0], field=pair[1]) for pair in request.pairs}
+            # The IN-lists match case- and trailing-space-insensitively under the database collation,
+            # so rows are assigned to the requested pairs by normalized key
+            by_key: Dict[Tuple[str, str], List[MarketDataSeries]] = {}
+            for pair, pair_series in series.items():
+                by_key.setdefault(self._pair_key(*pair), []).append(pair_series)
+            for row in db_manager.stream_query(query, request.to_query_params()):
+                record = self._to_record(row)
+                for pair_series in by_key.get(self._pair_key(record.security, record.field), ()):
+                    pair_series.records.append(record)
+            return list(series.values())
+            
+        except Exception as e:
+            logger.error(f"Failed to get bulk market data: {e}")
+            logger.error(f"Request: {len(request.securities)} securities x {len(request.fields)} fields")
+            raise
+    
+    @staticmethod
+    def _pair_key(security: str, field: str) -> Tuple[str, str]:
+        return str(security).strip().upper(), str(field).strip().upper()
+    
+    @staticmethod
+    def _to_record(row: Dict[str, Any]) -> MarketDataRecord:
+        """Convert a database row to a market data record."""
+        # Convert date if it's not already a datetime object
+        date_value = row.get('date')
+        if isinstance(date_value, str):
+            try:
+                date_value = datetime.fromisoformat(date_value)
+            except ValueError:
+                # Handle different date formats if needed
+                pass
+        
+        return MarketDataRecord(
+            security=row.get('security'),
+            field=row.get('field'),
+            date=date_value,
+            value=row.get('value')  # Assuming there's a value column
+        )
@@ -1,20 +1,33 @@
 """
 SQL Server implementation of raw data repository.
 """
-from typing import List
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import logging
 
 from ...domain.repositories.raw_data_repository import IRawDataRepository
-from ...domain.entities.raw_data import FileCategory, Fund, RawDataRecord, RawDataRequest
+from ...domain.entities.raw_data import (
+    FileCategory, Fund, RawDataRecord, RawDataRequest, RawDataPage, CatalogWatermark
+)
 from ..database.db_manager import db_manager
-from ..config.fund_mappings import get_fund_column, has_fund_filtering
+from ..database.continuation_token import encode_token, decode_token, request_fingerprint
+from ..database.raw_data_query import DATETIME_TYPES, TEXT_ALIAS_SUFFIX, RawDataQueryBuilder
+from ..database.schema_registry import SchemaRegistry, schema_registry
+from ..config.fund_mappings import get_fund_column
 
 logger = logging.getLogger(__name__)
 
 
+# Leading keyset columns shared by all catalog tables; the primary key is appended as tie-breaker
+KEYSET_LEADING_COLUMNS = ['LOAD_TS', 'DELIVERY_ID']
+
+
 class SqlRawDataRepository(IRawDataRepository):
     """SQL Server implementation of raw data repository."""
     
+    def __init__(self, schemas: SchemaRegistry = None):
+        self._keyset_columns_cache: Dict[str, List[str]] = {}
+        self._schemas = schemas or schema_registry
+    
     def get_file_categories(self) -> List[FileCategory]:
         """Get all available file categories from information schema tables."""
         query = """
@@ -52,38 +65,235 @@ class SqlRawDataRepository(IRawDataRepository):
             logger.error(f"Failed to get funds for catalog {catalog}: {e}")
             raise
     
+    def get_catalog_watermark(self, catalog: str) -> CatalogWatermark:
+        """Get the latest LOAD_TS and DELIVERY_ID of a catalog table."""
+        query = f"""
+        SELECT MAX(c.LOAD_TS) AS MAX_LOAD_TS, MAX(c.DELIVERY_ID) AS MAX_DELIVERY_ID
+        FROM test.dbo.{catalog} c
+        """
+        
+        try:
+            results = db_manager.execute_query(query)
+            row = results[0] if results else {}
+            return CatalogWatermark(
+                max_load_ts=row.get('MAX_LOAD_TS'),
+                max_delivery_id=row.get('MAX_DELIVERY_ID')
+            )
+        except Exception as e:
+            logger.error(f"Failed to get watermark for catalog {catalog}: {e}")
+            raise
+    
+    def get_funds_by_catalog_since(self, catalog: str, watermark: CatalogWatermark) -> List[Fund]:
+        """
+        Get the funds of rows loaded since the given watermark.
+        
+        Only LOAD_TS is filtered on, as a range an index on it can seek; >= also catches rows
+        loaded at the watermark's timestamp after it was read. Rows of a new delivery with an
+        older LOAD_TS are picked up by the next full rebuild of the fund directory.
+        """
+        fund_column = get_fund_column(catalog)
+        
+        if not fund_column:
+            return []
+        
+        if watermark.max_load_ts is None:
+            return self.get_funds_by_catalog(catalog)
+        
+        query = f"""
+        SELECT c.{fund_column} as FUND 
+        FROM test.dbo.{catalog} c
+        WHERE c.LOAD_TS >= :load_ts
+        """
+        params = {'load_ts': watermark.max_load_ts}
+        
+        try:
+            results = db_manager.execute_query(query, params)
+            funds = dict.fromkeys(row['FUND'] for row in results if row['FUND'] is not None)
+            return [Fund(fund=fund, catalog=catalog) for fund in funds]
+        except Exception as e:
+            logger.error(f"Failed to get new funds for catalog {catalog}: {e}")
+            raise
+    
     def get_raw_data(self, request: RawDataRequest) -> List[RawDataRecord]:
         """Get raw data based on request parameters."""
-        fund_column = get_fund_column(request.catalog)
-        
-        if fund_column:
-            # Query with fund filtering
-            query = f"""
-            SELECT c.* 
-            FROM test.dbo.{request.catalog} c 
-            JOIN test.dbo.DELIVERY d on d.DELIVERY_ID = c.DELIVERY_ID
-            WHERE c.{fund_column} = :fund 
-            AND CAST(c.LOAD_TS AS DATE) BETWEEN :start AND :end
-            """
-            params = request.to_query_params()
-        else:
-            # Query without fund filtering for tables not in mapping
-            query = f"""
-            SELECT c.* 
-            FROM test.dbo.{request.catalog} c 
-            JOIN test.dbo.DELIVERY d on d.DELIVERY_ID = c.DELIVERY_ID
-            WHERE CAST(c.LOAD_TS AS DATE) BETWEEN :start AND :end
-            """
-            # Remove fund parameter for tables without fund filtering
-            params = {
-                'start': request.start_date,
-                'end': request.end_date
-            }
+        query, params = self._query_builder(request).select()
         
         try:
-            results = db_manager.execute_query(query, params)
-            return [RawDataRecord(data=row) for row in results]
+            description, rows = db_manager.execute_query_rows(query, params)
+            converter = self._schemas.get_converter(description, request.value_format, request.catalog)
+            return [RawDataRecord(data=row) for row in converter.to_dicts(rows)]
         except Exception as e:
             logger.error(f"Failed to get raw data: {e}")
             logger.error(f"Request: {request}")
-            raise
\ No newline at end of file
+            raise
+    
+    def iter_raw_data(self, request: RawDataRequest) -> Iterator[RawDataRecord]:
+        """Stream raw data through a server-side cursor."""
+        # Build the query eagerly so invalid columns or filters fail before streaming starts
+        query, params = self._query_builder(request).select()
+        return self._iter_records(query, params, request)
+    
+    def _iter_records(self, query: str, params: Dict[str, Any], request: RawDataRequest) -> Iterator[RawDataRecord]:
+        """Stream rows chunk by chunk, converting each chunk column-wise."""
+        converter = None
+        for description, rows in db_manager.stream_query_rows(query, params):
+            if converter is None:
+                converter = self._schemas.get_converter(description, request.value_format, request.catalog)
+            for row in converter.to_dicts(rows):
+                yield RawDataRecord(data=row)
+    
+    def get_raw_data_page(self, request: RawDataRequest, page_size: int,
+                          continuation_token: Optional[str] = None) -> RawDataPage:
+        """Get a single page of raw data ordered by (LOAD_TS, DELIVERY_ID, primary key)."""
+        if request.order_by or request.limit is not None:
+            raise ValueError('order_by and limit are not supported with keyset pagination')
+        
+        fingerprint = request_fingerprint(
+            request.catalog, request.fund, request.start_date, request.end_date,
+            request.columns, request.filters
+        )
+        metadata = self._schemas.get_table_metadata(request.catalog)
+        builder = RawDataQueryBuilder(request, metadata, get_fund_column(request.catalog))
+        # Use the column names as spelled in the table, since they key the result rows
+        key_columns = [metadata.resolve(column).name for column in self._get_keyset_columns(request.catalog)]
+        # Datetime keys go into the token as text: the driver truncates datetime2 to microseconds,
+        # and seeking past a truncated value would return the rows of the boundary again
+        text_keys = [
+            column for column in key_columns if metadata.resolve(column).data_type.lower() in DATETIME_TYPES
+        ]
+        
+        total_records = None
+        last_key = None
+        if continuation_token:
+            last_key, total_records = decode_token(continuation_token, fingerprint)
+            if len(last_key) != len(key_columns):
+                raise ValueError('Continuation token does not match the table key')
+        
+        if total_records is None:
+            count_query, count_params = builder.count()
+            total_records = int(db_manager.execute_scalar_query(count_query, count_params) or 0)
+        
+        seek_clause, seek_params = None, None
+        if last_key is not None:
+            seek_clause, seek_params = self._build_seek_predicate(
+                key_columns, last_key, {column: metadata.resolve(column).data_type.lower() for column in text_keys}
+            )
+        
+        # Fetch one extra row to detect whether another page exists
+        query, params = builder.select(
+            extra_columns=key_columns,
+            top=int(page_size) + 1,
+            order_by=[(column, False) for column in key_columns],
+            extra_where=seek_clause,
+            extra_params=seek_params,
+            text_columns=text_keys
+        )
+        
+        try:
+            description, rows = db_manager.execute_query_rows(query, params)
+        except Exception as e:
+            logger.error(f"Failed to get raw data page: {e}")
+            logger.error(f"Request: {request}")
+            raise
+        
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        
+        next_token = None
+        if has_more:
+            # Token keys keep their native types, before value conversion; text keys are compared
+            # by SQL Server after converting them back to the column type
+            positions = {name: i for i, (name, _) in enumerate(description)}
+            last_row = rows[-1]
+            next_token = encode_token(
+                [
+                    last_row[positions[column + TEXT_ALIAS_SUFFIX if column in text_keys else column]]
+                    for column in key_columns
+                ],
+                total_records, fingerprint
+            )
+        
+        if text_keys:
+            # Text keys are selected last and only serve the token
+            width = len(description) - len(text_keys)
+            description = description[:width]
+            rows = [row[:width] for row in rows]
+        
+        converter = self._schemas.get_converter(description, request.value_format, request.catalog)
+        rows = converter.to_dicts(rows)
+        if builder.columns is not None:
+            # Key columns were only selected to build the token
+            rows = [{column: row[column] for column in builder.columns} for row in rows]
+        
+        return RawDataPage(
+            records=[RawDataRecord(data=row) for row in rows],
+            has_more=has_more,
+            continuation_token=next_token,
+            total_records=total_records
+        )
+    
+    def _query_builder(self, request: RawDataRequest) -> RawDataQueryBuilder:
+        """Create a query builder for the request, validating it against the table metadata."""
+        metadata = self._schemas.get_table_metadata(request.catalog)
+        return RawDataQueryBuilder(request, metadata, get_fund_column(request.catalog))
+    
+    def _get_keyset_columns(self, catalog: str) -> List[str]:
+        """Get the keyset ordering columns for a catalog, appending its primary key."""
+        if catalog in self._keyset_columns_cache:
+            return self._keyset_columns_cache[catalog]
+        
+        query = """
+        SELECT kcu.COLUMN_NAME
+        FROM INFORMATION_SCHEMA.TABLE_CONSTRAINTS tc
+        JOIN INFORMATION_SCHEMA.KEY_COLUMN_USAGE kcu
+          ON kcu.CONSTRAINT_NAME = tc.CONSTRAINT_NAME
+         AND kcu.TABLE_SCHEMA = tc.TABLE_SCHEMA
+         AND kcu.TABLE_NAME = tc.TABLE_NAME
+        WHERE tc.TABLE_SCHEMA = 'dbo'
+        AND tc.TABLE_NAME = :catalog
+        AND tc.CONSTRAINT_TYPE = 'PRIMARY KEY'
+        ORDER BY kcu.ORDINAL_POSITION
+        """
+        
+        try:
+            results = db_manager.execute_query(query, {'catalog': catalog})
+        except Exception as e:
+            logger.error(f"Failed to get primary key for catalog {catalog}: {e}")
+            raise
+        
+        key_columns = list(KEYSET_LEADING_COLUMNS)
+        for row in results:
+            column = row['COLUMN_NAME']
+            if column.upper() not in (existing.upper() for existing in key_columns):
+                key_columns.append(column)
+        
+        if len(key_columns) == len(KEYSET_LEADING_COLUMNS):
+            logger.warning(f"No primary key found for catalog {catalog}, keyset order may not be unique")
+        
+        self._keyset_columns_cache[catalog] = key_columns
+        return key_columns
+    
+    @staticmethod
+    def _build_seek_predicate(key_columns: List[str], last_key: List[Any],
+                              text_keys: Dict[str, str]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Build a row-value comparison (key_columns) > (last_key) in expanded form,
+        since SQL Server does not support tuple comparisons.
+        
+        text_keys maps the datetime key columns whose values are style 121 text to their data type.
+        """
+        params = {f"k{i}": value for i, value in enumerate(last_key)}
+        values = []
+        for i, column in enumerate(key_columns):
+            data_type = text_keys.get(column)
+            if data_type is None:
+                values.append(f":k{i}")
+            else:
+                target = 'datetimeoffset' if data_type == 'datetimeoffset' else 'datetime2'
+                values.append(f"CONVERT({target}, :k{i}, 121)")
+        disjuncts = []
+        for i, column in enumerate(key_columns):
+            equalities = [f"c.{key_columns[j]} = {values[j]}" for j in range(i)]
+            terms = equalities + [f"c.{column} > {values[i]}"]
+            disjuncts.append('(' + ' AND '.join(terms) + ')')
+        return '(' + ' OR '.join(disjuncts) + ')', params
@@ -0,0 +1,211 @@
+"""
+HTTP client for the NiFi upload endpoint.
+"""
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import gzip
+import json
+import logging
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..config.app_config import AppConfig
+
+logger = logging.getLogger(__name__)
+
+# Gateway errors worth retrying; only applied to idempotent methods
+RETRY_STATUS_CODES = (502, 503, 504)
+
+
+class NifiError(Exception):
+    """Raised when a payload could not be delivered to NiFi."""
+    
+    def __init__(self, message: str, details: Optional[str] = None, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.message = message
+        self.details = details
+        self.status_code = status_code  # HTTP status returned by NiFi, None if it did not answer
+
+
+@dataclass
+class NifiResponse:
+    """Successful NiFi response."""
+    status_code: int
+
+
+class NifiClient:
+    """
+    Long-lived client for NiFi, shared by all NiFi integrations.
+    
+    Requests go through one requests.Session whose HTTPAdapter keeps up to pool_size
+    keep-alive connections per host, so the TCP and mutual TLS handshakes are paid once
+    per connection rather than once per upload. The SSL settings (CA bundle, client
+    certificate) are resolved once when the client is created.
+    
+    Connection errors are retried for every method, since the request never reached
+    NiFi; read errors and gateway responses (502/503/504) are only retried for
+    idempotent methods, so a POST is never delivered twice. Retries back off
+    exponentially by backoff_factor.
+    
+    With compress enabled, JSON bodies are posted gzip-compressed with Content-Encoding: gzip.
+    """
+    
+    def __init__(self, endpoint: str = None, timeout: float = None, ssl_config: Dict[str, Any] = None,
+                 pool_size: int = None, max_retries: int = None, backoff_factor: float = None,
+                 compress: bool = None, compression_level: int = None):
+        self.endpoint = endpoint or AppConfig.NIFI_ENDPOINT
+        self.compress = AppConfig.NIFI_COMPRESS_REQUESTS if compress is None else compress
+        self._compression_level = AppConfig.NIFI_COMPRESSION_LEVEL if compression_level is None else compression_level
+        self.timeout = AppConfig.NIFI_TIMEOUT_SECONDS if timeout is None else timeout
+        self.ssl_config = AppConfig.get_nifi_ssl_config() if ssl_config is None else ssl_config
+        self.pool_size = AppConfig.NIFI_POOL_SIZE if pool_size is None else pool_size
+        
+        retries = AppConfig.NIFI_MAX_RETRIES if max_retries is None else max_retries
+        self._retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            status_forcelist=RETRY_STATUS_CODES,
+            allowed_methods=Retry.DEFAULT_ALLOWED_METHODS,
+            backoff_factor=AppConfig.NIFI_RETRY_BACKOFF_SECONDS if backoff_factor is None else backoff_factor,
+            raise_on_status=False
+        )
+        self._adapter = HTTPAdapter(
+            pool_maxsize=self.pool_size, pool_block=False, max_retries=self._retry
+        )
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+        self._session.headers['X-Forwarded-From'] = 'excel-addin-backend'
+        self._session.verify = self.ssl_config.get('verify', True)
+        if self.ssl_config.get('cert'):
+            self._session.cert = self.ssl_config['cert']
+        
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._retries = 0
+        self._failures = 0
+        self._body_bytes = 0
+        self._sent_bytes = 0
+        
+        logger.debug(f"NiFi client for {self.endpoint}: verify={self._session.verify}, "
+                     f"client_cert={'configured' if self._session.cert else 'not configured'}, "
+                     f"pool_size={self.pool_size}")
+    
+    def request(self, method: str, url: str = None, **kwargs) -> requests.Response:
+        """
+        Send a request through the shared session, to the upload endpoint by default.
+        
+        Raises:
+            NifiError: If NiFi could not be reached
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            response = self._session.request(method, url or self.endpoint, **kwargs)
+        except requests.exceptions.SSLError as e:
+            self._record(failed=True)
+            logger.error(f"SSL error when connecting to NiFi endpoint: {str(e)}")
+            raise NifiError(
+                'SSL certificate verification failed when connecting to NiFi',
+                details=f'Check certificate configuration in backend/certificates/ directory: {e}'
+            )
+        except requests.exceptions.Timeout:
+            self._record(failed=True)
+            logger.error("Timeout when connecting to NiFi endpoint")
+            raise NifiError('Upload timeout - NiFi endpoint did not respond in time')
+        except requests.exceptions.ConnectionError:
+            self._record(failed=True)
+            logger.error("Connection error when connecting to NiFi endpoint")
+            raise NifiError('Unable to connect to NiFi endpoint')
+        except requests.exceptions.RequestException as e:
+            self._record(failed=True)
+            logger.error(f"Request error when connecting to NiFi: {str(e)}")
+            raise NifiError(f'Request failed: {str(e)}')
+        
+        retries = getattr(response.raw, 'retries', None)
+        self._record(failed=False, retries=len(retries.history) if retries is not None else 0)
+        return response
+    
+    def post_json(self, payload: Dict[str, Any]) -> NifiResponse:
+        """
+        Post a JSON payload to the upload endpoint.
+        
+        Raises:
+            NifiError: If NiFi did not accept the payload or could not be reached
+        """
+        logger.info(f"Forwarding data to NiFi endpoint: {self.endpoint}")
+        body = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        headers = {'Content-Type': 'application/json'}
+        sent = body
+        if self.compress:
+            sent = gzip.compress(body, compresslevel=self._compression_level)
+            headers['Content-Encoding'] = 'gzip'
+        
+        with self._lock:
+            self._body_bytes += len(body)
+            self._sent_bytes += len(sent)
+        response = self.request('POST', data=sent, headers=headers)
+        
+        if response.status_code not in (200, 201):
+            logger.error(f"NiFi endpoint returned status {response.status_code}: {response.text}")
+            raise NifiError(
+                f'NiFi processing failed with status {response.status_code}',
+                details=response.text[:500] if response.text else None,
+                status_code=response.status_code
+            )
+        
+        return NifiResponse(status_code=response.status_code)
+    
+    def metrics(self) -> Dict[str, Any]:
+        """
+        Connection reuse metrics: requests sent, connections opened by the pool,
+        requests served over a reused keep-alive connection, and idle pooled connections,
+        plus the JSON bytes posted before and after compression.
+        """
+        connections_opened = 0
+        pool_requests = 0
+        idle_connections = 0
+        pools = self._adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            connections_opened += pool.num_connections
+            pool_requests += pool.num_requests
+            idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+        
+        reused = max(pool_requests - connections_opened, 0)
+        with self._lock:
+            return {
+                'endpoint': self.endpoint,
+                'pool_size': self.pool_size,
+                'requests': self._requests,
+                'failures': self._failures,
+                'retries': self._retries,
+                'connections_opened': connections_opened,
+                'connections_reused': reused,
+                'reuse_ratio': round(reused / pool_requests, 4) if pool_requests else None,
+                'idle_connections': idle_connections,
+                'compression': 'gzip' if self.compress else None,
+                'body_bytes': self._body_bytes,
+                'sent_bytes': self._sent_bytes
+            }
+    
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self._session.close()
+    
+    def _record(self, failed: bool, retries: int = 0) -> None:
+        with self._lock:
+            self._requests += 1
+            self._retries += retries
+            if failed:
+                self._failures += 1
+
+
+# Global NiFi client instance
+nifi_client = NifiClient()
@@ -0,0 +1,100 @@
+"""
+NiFi payloads for forwarded uploads.
+"""
+from typing import Any, Dict, List, Optional
+
+from ...domain.entities.data_upload import UPLOAD_FORMAT_COLUMNAR, UPLOAD_FORMAT_RECORDS, UPLOAD_FORMATS
+
+
+def collect_columns(records: List[Dict[str, Any]]) -> List[str]:
+    """Union of the record keys in order of first appearance."""
+    columns: Dict[str, None] = {}
+    for record in records:
+        for key in record:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+class UploadPayloadBuilder:
+    """
+    Builds the NiFi payload for a range of an upload's records.
+    
+    The upload metadata (source, timestamp, data type, configuration) is computed once
+    per upload and sent once per payload envelope. In the columnar format the payload
+    carries the column names once and one value array per row:
+    
+        {"source": "excel_addin", "upload_timestamp": ..., "data_type": ..., "configuration": {...},
+         "format": "columnar", "columns": ["Security", "Cost"], "rows": [["A", 1.5], ...], "record_count": 2}
+    
+    The records format is kept for compatibility: one object per record, each carrying an
+    `_upload_metadata` copy with its record index.
+    """
+    
+    def __init__(self, data_type: str, data: List[Any], upload_timestamp: str, skip_duplicate_check: bool = False,
+                 delivery_date: Optional[str] = None, columns: Optional[List[str]] = None,
+                 output_format: str = UPLOAD_FORMAT_RECORDS, record_indexes: Optional[List[int]] = None):
+        """
+        Args:
+            data_type: Upload type
+            data: Record objects, or row arrays when columns is given
+            upload_timestamp: ISO timestamp of the upload
+            skip_duplicate_check: Passed on to NiFi
+            delivery_date: Passed on to NiFi
+            columns: Column names of a columnar upload
+            output_format: Format of the NiFi payload, records or columnar
+            record_indexes: Original index of each record in the upload, when records were dropped
+        """
+        if output_format not in UPLOAD_FORMATS:
+            raise ValueError(f"Unsupported NiFi upload format '{output_format}'")
+        self._data = data
+        self._input_columns = columns
+        self.output_format = output_format
+        self._record_indexes = record_indexes
+        self._envelope = {
+            'source': 'excel_addin',
+            'upload_timestamp': upload_timestamp,
+            'data_type': data_type,
+            'configuration': {
+                'skip_duplicate_check': skip_duplicate_check,
+                'delivery_date': delivery_date
+            }
+        }
+        self._record_metadata = {
+            'upload_timestamp': upload_timestamp,
+            'data_type': data_type,
+            'skip_duplicate_check': skip_duplicate_check,
+            'delivery_date': delivery_date
+        }
+        # Every chunk of a columnar payload must share the same columns
+        self._output_columns = columns
+        if output_format == UPLOAD_FORMAT_COLUMNAR and columns is None:
+            self._output_columns = collect_columns(data)
+    
+    def build(self, start: int, end: int) -> Dict[str, Any]:
+        """Build the payload for the records [start, end)."""
+        payload = dict(self._envelope)
+        if self.output_format == UPLOAD_FORMAT_COLUMNAR:
+            if self._input_columns is not None:
+                rows = self._data[start:end]
+            else:
+                columns = self._output_columns
+                rows = [[record.get(column) for column in columns] for record in self._data[start:end]]
+            payload['format'] = UPLOAD_FORMAT_COLUMNAR
+            payload['columns'] = self._output_columns
+            payload['rows'] = rows
+            payload['record_count'] = len(rows)
+            return payload
+        
+        metadata = self._record_metadata
+        indexes = self._record_indexes
+        records = []
+        for i in range(start, end):
+            record = self._data[i]
+            if self._input_columns is not None:
+                record = dict(zip(self._input_columns, record))
+            record_index = indexes[i] if indexes is not None else i
+            records.append({**record, '_upload_metadata': {**metadata, 'record_index': record_index}})
+        payload['records'] = records
+        payload['record_count'] = len(records)
+        return payload
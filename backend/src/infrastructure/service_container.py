@@ -0,0 +1,272 @@
+"""
+Application-scoped registry of services and repositories.
+"""
+from typing import Dict, List, Optional
+import logging
+import os
+import threading
+import time
+
+from flask import Flask, current_app
+
+from ..application.services.raw_data_service import RawDataService
+from ..application.services.market_data_service import MarketDataService
+from ..application.services.data_upload_service import DataUploadService
+from ..application.services.upload_session_service import UploadSessionService
+from ..domain.repositories.raw_data_repository import IRawDataRepository
+from ..domain.repositories.market_data_repository import IMarketDataRepository
+from .cache.caching_repositories import CachingRawDataRepository
+from .cache.fund_directory import FundDirectory
+from .cache.periodic_task import PeriodicTask
+from .cache.security_index import SecurityFieldIndex
+from .cache.ttl_cache import TtlCache
+from .config.app_config import AppConfig
+from .database.db_manager import DatabaseManager, db_manager
+from .database.mock_repositories import MockRawDataRepository, MockMarketDataRepository
+from .nifi.nifi_client import NifiClient, nifi_client as default_nifi_client
+
+logger = logging.getLogger(__name__)
+
+EXTENSION_KEY = 'service_container'
+
+
+class ServiceContainer:
+    """
+    Creates services and repositories once per process and hands them to the controllers.
+    
+    The database health is checked lazily on first use and re-checked at most every
+    health_check_interval seconds; while the database is unavailable the mock
+    repositories are served, matching the fallback of the service constructors.
+    Repositories passed to the constructor are always used, which lets tests inject them.
+    
+    Slowly changing catalog metadata of the SQL repositories is served from in-process
+    caches, which can be invalidated by name through invalidate_caches.
+    """
+    
+    def __init__(self, raw_data_repository: IRawDataRepository = None,
+                 market_data_repository: IMarketDataRepository = None,
+                 database: DatabaseManager = None, health_check_interval: int = None,
+                 nifi_client: NifiClient = None):
+        self._database = database or db_manager
+        self._health_check_interval = (
+            AppConfig.DB_HEALTH_CHECK_INTERVAL_SECONDS if health_check_interval is None else health_check_interval
+        )
+        self._lock = threading.RLock()
+        self._database_healthy: Optional[bool] = None
+        self._checked_at = 0.0
+        
+        self._raw_data_repository = raw_data_repository
+        self._market_data_repository = market_data_repository
+        self._sql_raw_data_service: Optional[RawDataService] = None
+        self._sql_market_data_service: Optional[MarketDataService] = None
+        self._mock_raw_data_service: Optional[RawDataService] = None
+        self._mock_market_data_service: Optional[MarketDataService] = None
+        self._data_upload_service: Optional[DataUploadService] = None
+        self._upload_session_service: Optional[UploadSessionService] = None
+        self._upload_session_purge: Optional[PeriodicTask] = None
+        
+        self.metadata_cache = TtlCache(
+            'metadata',
+            ttl_seconds=AppConfig.METADATA_CACHE_TTL_SECONDS,
+            stale_seconds=AppConfig.METADATA_CACHE_STALE_SECONDS
+        )
+        self._caches: Dict[str, object] = {self.metadata_cache.name: self.metadata_cache}
+        self.fund_directory: Optional[FundDirectory] = None
+        # NiFi client shared by all NiFi integrations
+        self.nifi_client = nifi_client or default_nifi_client
+        self.security_index: Optional[SecurityFieldIndex] = None
+    
+    def init_app(self, app: Flask) -> None:
+        """Register the container on the application."""
+        app.extensions[EXTENSION_KEY] = self
+    
+    def start_background_tasks(self) -> None:
+        """Start the upload workers and warm the SQL-backed caches if the database is available."""
+        self.data_upload_service()
+        self.upload_session_service()
+        if self._upload_session_purge is not None:
+            self._upload_session_purge.start()
+        
+        if self._raw_data_repository is None and self.is_database_healthy():
+            self.raw_data_service()
+        
+        if self._market_data_repository is None and self.is_database_healthy():
+            self.market_data_service()
+    
+    def is_database_healthy(self) -> bool:
+        """Check database connectivity, re-running the check at most once per interval."""
+        if self._database.is_mock_mode:
+            return False
+        
+        with self._lock:
+            now = time.monotonic()
+            if self._database_healthy is None or now - self._checked_at >= self._health_check_interval:
+                try:
+                    self._database.execute_scalar_query("SELECT 1")
+                    healthy = True
+                except Exception as e:
+                    logger.warning(f"Database health check failed, using mock repositories: {e}")
+                    healthy = False
+                
+                if healthy != self._database_healthy:
+                    logger.info(f"Database health changed: {'healthy' if healthy else 'unavailable'}")
+                self._database_healthy = healthy
+                self._checked_at = now
+            
+            return self._database_healthy
+    
+    def invalidate_caches(self, name: Optional[str] = None) -> List[str]:
+        """
+        Invalidate one cache by name, or all caches when name is None.
+        
+        Returns:
+            Names of the invalidated caches
+        
+        Raises:
+            KeyError: If no cache with that name exists
+        """
+        if name is not None and name not in self._caches:
+            raise KeyError(f"Unknown cache: {name}")
+        
+        names = [name] if name is not None else list(self._caches)
+        for cache_name in names:
+            self._caches[cache_name].invalidate()
+        return names
+    
+    def raw_data_service(self) -> RawDataService:
+        """Get the raw data service for the current database state."""
+        if self._raw_data_repository is not None:
+            return self._get_or_create('_sql_raw_data_service', lambda: RawDataService(self._raw_data_repository))
+        
+        if self.is_database_healthy():
+            return self._get_or_create('_sql_raw_data_service', self._create_sql_raw_data_service)
+        
+        return self._get_or_create('_mock_raw_data_service', lambda: RawDataService(MockRawDataRepository()))
+    
+    def market_data_service(self) -> MarketDataService:
+        """Get the market data service for the current database state."""
+        if self._market_data_repository is not None:
+            return self._get_or_create(
+                '_sql_market_data_service', lambda: MarketDataService(
+                    self._market_data_repository, search_ttl_seconds=AppConfig.SECURITY_INDEX_REFRESH_SECONDS
+                )
+            )
+        
+        if self.is_database_healthy():
+            return self._get_or_create('_sql_market_data_service', self._create_sql_market_data_service)
+        
+        return self._get_or_create(
+            '_mock_market_data_service', lambda: MarketDataService(
+                MockMarketDataRepository(), search_ttl_seconds=AppConfig.SECURITY_INDEX_REFRESH_SECONDS
+            )
+        )
+    
+    def data_upload_service(self) -> DataUploadService:
+        """Get the data upload service, starting its worker pool on first use."""
+        return self._get_or_create('_data_upload_service', self._create_data_upload_service)
+    
+    def upload_session_service(self) -> UploadSessionService:
+        """Get the resumable upload session service."""
+        return self._get_or_create('_upload_session_service', self._create_upload_session_service)
+    
+    def _get_or_create(self, attribute: str, factory):
+        """Return the service stored in attribute, creating it once under the lock."""
+        service = getattr(self, attribute)
+        if service is None:
+            with self._lock:
+                service = getattr(self, attribute)
+                if service is None:
+                    service = factory()
+                    setattr(self, attribute, service)
+        return service
+    
+    def _create_sql_raw_data_service(self) -> RawDataService:
+        from .database.sql_raw_data_repository import SqlRawDataRepository
+        from .database.schema_registry import schema_registry
+        logger.info("Using SQL Server repository")
+        repository = CachingRawDataRepository(SqlRawDataRepository(schema_registry), self.metadata_cache)
+        self._caches[schema_registry.name] = schema_registry
+        
+        if AppConfig.FUND_DIRECTORY_ENABLED:
+            self.fund_directory = FundDirectory(
+                repository,
+                refresh_interval=AppConfig.FUND_DIRECTORY_REFRESH_SECONDS,
+                full_rebuild_interval=AppConfig.FUND_DIRECTORY_FULL_REBUILD_SECONDS
+            )
+            self._caches[self.fund_directory.name] = self.fund_directory
+            # Started here rather than at startup, so it also refreshes when the database only comes up later
+            self.fund_directory.start()
+        
+        return RawDataService(repository, fund_directory=self.fund_directory)
+    
+    def _create_sql_market_data_service(self) -> MarketDataService:
+        from .database.sql_market_data_repository import SqlMarketDataRepository
+        logger.info("Using SQL Server repository for market data")
+        repository = SqlMarketDataRepository()
+        
+        if AppConfig.SECURITY_INDEX_ENABLED:
+            self.security_index = SecurityFieldIndex(
+                repository, refresh_interval=AppConfig.SECURITY_INDEX_REFRESH_SECONDS
+            )
+            self._caches[self.security_index.name] = self.security_index
+            # Started here rather than at startup, so it also refreshes when the database only comes up later
+            self.security_index.start()
+        
+        return MarketDataService(
+            repository, security_index=self.security_index,
+            search_ttl_seconds=AppConfig.SECURITY_INDEX_REFRESH_SECONDS
+        )
+    
+    def _create_data_upload_service(self) -> DataUploadService:
+        from .uploads.sqlite_upload_job_repository import SqliteUploadJobRepository
+        from .uploads.upload_worker_pool import UploadWorkerPool
+        from .uploads.chunked_forwarder import ChunkedForwarder
+        from .uploads.sqlite_fingerprint_repository import SqliteUploadFingerprintRepository
+        from .uploads.upload_schema_registry import upload_schema_registry
+        job_repository = SqliteUploadJobRepository(AppConfig.get_upload_job_db_path())
+        worker_pool = UploadWorkerPool(AppConfig.UPLOAD_WORKERS, AppConfig.UPLOAD_QUEUE_SIZE)
+        forwarder = ChunkedForwarder(
+            self.nifi_client,
+            chunk_size=AppConfig.UPLOAD_CHUNK_SIZE,
+            max_workers=AppConfig.UPLOAD_CHUNK_WORKERS,
+            max_retries=AppConfig.UPLOAD_CHUNK_RETRIES,
+            backoff_seconds=AppConfig.UPLOAD_CHUNK_RETRY_BACKOFF_SECONDS
+        )
+        fingerprint_repository = None
+        if AppConfig.UPLOAD_DUPLICATE_MODE != 'off':
+            fingerprint_repository = SqliteUploadFingerprintRepository(
+                AppConfig.get_upload_fingerprint_db_path(),
+                error_rate=AppConfig.UPLOAD_FINGERPRINT_FILTER_ERROR_RATE
+            )
+        service = DataUploadService(
+            job_repository, worker_pool, forwarder,
+            nifi_format=AppConfig.NIFI_UPLOAD_FORMAT,
+            fingerprint_repository=fingerprint_repository,
+            duplicate_mode=AppConfig.UPLOAD_DUPLICATE_MODE,
+            schema_registry=upload_schema_registry,
+            drop_repeated=AppConfig.UPLOAD_DROP_REPEATED_RECORDS
+        )
+        service.recover(AppConfig.UPLOAD_JOB_RETENTION_SECONDS)
+        return service
+    
+    def _create_upload_session_service(self) -> UploadSessionService:
+        from .uploads.chunk_store import FileChunkStore
+        from .uploads.sqlite_upload_session_repository import SqliteUploadSessionRepository
+        directory = AppConfig.get_upload_session_dir()
+        service = UploadSessionService(
+            SqliteUploadSessionRepository(os.path.join(directory, 'sessions.db')),
+            FileChunkStore(os.path.join(directory, 'chunks')),
+            self.data_upload_service(),
+            ttl_seconds=AppConfig.UPLOAD_SESSION_TTL_SECONDS,
+            max_chunks=AppConfig.UPLOAD_SESSION_MAX_CHUNKS
+        )
+        # Purge inactive sessions and their chunks at least hourly
+        self._upload_session_purge = PeriodicTask(
+            'upload-session-purge', min(AppConfig.UPLOAD_SESSION_TTL_SECONDS, 3600), service.purge_expired
+        )
+        return service
+
+
+def get_service_container() -> ServiceContainer:
+    """Get the service container of the current application."""
+    return current_app.extensions[EXTENSION_KEY]
@@ -0,0 +1,62 @@
+"""
+Bloom filter over fixed-size hash digests.
+"""
+import math
+
+
+class BloomFilter:
+    """
+    Probabilistic set membership for hash digests such as record fingerprints.
+    
+    might_contain never returns False for an added item and returns True for an absent
+    item with probability about error_rate while at most capacity items were added.
+    Since the items are already uniformly distributed digests, the k bit positions are
+    derived from two 64-bit words of the item by double hashing instead of rehashing.
+    """
+    
+    def __init__(self, capacity: int, error_rate: float = 0.01, bits: bytes = None, count: int = 0):
+        """
+        Args:
+            capacity: Number of items the filter is sized for
+            error_rate: False positive rate at capacity
+            bits: Bit array of a filter of the same capacity and error rate, to restore it
+            count: Number of items added to the restored filter
+        """
+        self.capacity = max(int(capacity), 1)
+        self.error_rate = error_rate
+        self._bit_count = max(int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)), 64)
+        self._hash_count = max(int(round(self._bit_count / self.capacity * math.log(2))), 1)
+        size = (self._bit_count + 7) // 8
+        if bits is not None and len(bits) != size:
+            raise ValueError(f"Bit array of {len(bits)} bytes does not match a filter of {size} bytes")
+        self._bits = bytearray(bits) if bits is not None else bytearray(size)
+        self.count = count
+    
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+    
+    def to_bytes(self) -> bytes:
+        """The bit array, for persisting the filter."""
+        return bytes(self._bits)
+    
+    def add(self, item: bytes) -> None:
+        bits = self._bits
+        bit_count = self._bit_count
+        h1 = int.from_bytes(item[:8], 'little')
+        h2 = int.from_bytes(item[8:16], 'little') | 1
+        for i in range(self._hash_count):
+            position = (h1 + i * h2) % bit_count
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+    
+    def might_contain(self, item: bytes) -> bool:
+        bits = self._bits
+        bit_count = self._bit_count
+        h1 = int.from_bytes(item[:8], 'little')
+        h2 = int.from_bytes(item[8:16], 'little') | 1
+        for i in range(self._hash_count):
+            position = (h1 + i * h2) % bit_count
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
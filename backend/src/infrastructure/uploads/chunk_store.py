@@ -0,0 +1,64 @@
+"""
+Content-addressed on-disk store for upload session chunks.
+"""
+from typing import Optional
+import logging
+import os
+import tempfile
+
+from ...domain.repositories.upload_chunk_store import IUploadChunkStore
+
+logger = logging.getLogger(__name__)
+
+
+class FileChunkStore(IUploadChunkStore):
+    """
+    Stores chunk contents as files named by their SHA-256 digest.
+    
+    Identical chunks, e.g. a chunk sent again by a retrying client or shared by two
+    sessions, are stored once. Files are written to a temporary name and renamed into
+    place, so a chunk file is either complete or absent, even after a crash.
+    """
+    
+    def __init__(self, directory: str):
+        self._directory = directory
+        os.makedirs(directory, exist_ok=True)
+    
+    def put(self, digest: str, data: bytes) -> bool:
+        """Store content under its digest, returning False if it was already stored."""
+        path = self._path(digest)
+        if os.path.exists(path):
+            return False
+        
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return True
+    
+    def get(self, digest: str) -> Optional[bytes]:
+        """Get the content stored under a digest, or None if it is missing."""
+        try:
+            with open(self._path(digest), 'rb') as file:
+                return file.read()
+        except FileNotFoundError:
+            return None
+    
+    def delete(self, digest: str) -> None:
+        """Delete the content stored under a digest, if any."""
+        try:
+            os.remove(self._path(digest))
+        except FileNotFoundError:
+            pass
+    
+    def _path(self, digest: str) -> str:
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f"Invalid chunk digest '{digest}'")
+        # Two-level layout keeps directories small
+        return os.path.join(self._directory, digest[:2], digest)
@@ -0,0 +1,139 @@
+"""
+Forwarding of large uploads to NiFi in concurrently sent chunks.
+"""
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import logging
+import time
+
+from ..nifi.nifi_client import NifiClient, NifiError
+
+logger = logging.getLogger(__name__)
+
+# NiFi statuses that mean the chunk was not ingested (ListenHTTP answers 503 under back pressure)
+RETRY_STATUS_CODES = (503,)
+
+
+@dataclass
+class ChunkFailure:
+    """A chunk that could not be delivered after all attempts."""
+    chunk_index: int
+    error: str
+    details: Optional[str] = None
+    status_code: Optional[int] = None
+
+
+@dataclass
+class ChunkedForwardResult:
+    """Aggregated outcome of forwarding all chunks of an upload."""
+    chunk_count: int
+    chunks_sent: int
+    nifi_status: Optional[int] = None  # Status of the first failed chunk, else of the last delivered one
+    failures: List[ChunkFailure] = field(default_factory=list)
+    
+    @property
+    def succeeded(self) -> bool:
+        return not self.failures
+
+
+class ChunkedForwarder:
+    """
+    Splits an upload into chunks of chunk_size records and posts them to NiFi concurrently.
+    
+    Chunks of all uploads share one pool of max_workers threads, separate from the
+    upload job workers, which bounds the number of concurrent NiFi requests. Each chunk
+    payload carries a `batch` object with the upload id, chunk index, chunk count and
+    record offset so NiFi can reassemble the upload. A chunk is only retried, up to
+    max_retries times with exponential backoff, when NiFi answered 503 and so did not
+    ingest it. Timeouts and other server errors fail the chunk, since NiFi may already
+    have ingested it and the flow does not drop chunks delivered twice; connection
+    errors are already retried by the NiFi client.
+    """
+    
+    def __init__(self, nifi_client: NifiClient, chunk_size: int, max_workers: int,
+                 max_retries: int = 2, backoff_seconds: float = 1.0):
+        if chunk_size < 1:
+            raise ValueError('chunk_size must be positive')
+        self._nifi_client = nifi_client
+        self.chunk_size = chunk_size
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='upload-chunk')
+    
+    def chunk_count(self, record_count: int) -> int:
+        """Number of chunks an upload of record_count records is sent in."""
+        return max((record_count + self.chunk_size - 1) // self.chunk_size, 1)
+    
+    def forward(self, upload_id: str, record_count: int, build_payload: Callable[[int, int], Dict[str, Any]],
+                on_chunk_sent: Callable[[int], None] = None) -> ChunkedForwardResult:
+        """
+        Forward an upload chunk by chunk and wait for all chunks.
+        
+        Args:
+            upload_id: Id of the upload, sent with every chunk
+            record_count: Total number of records
+            build_payload: Builds the NiFi payload for the records [start, end); called on the chunk
+                threads, so only one chunk's payload per thread is held in memory
+            on_chunk_sent: Called with the chunk index after each delivered chunk
+        """
+        chunk_count = self.chunk_count(record_count)
+        futures = {}
+        for chunk_index in range(chunk_count):
+            start = chunk_index * self.chunk_size
+            end = min(start + self.chunk_size, record_count)
+            batch = {
+                'upload_id': upload_id,
+                'chunk_index': chunk_index,
+                'chunk_count': chunk_count,
+                'record_offset': start,
+                'total_record_count': record_count
+            }
+            futures[self._executor.submit(self._send_chunk, batch, start, end, build_payload)] = chunk_index
+        
+        result = ChunkedForwardResult(chunk_count=chunk_count, chunks_sent=0)
+        for future in as_completed(futures):
+            chunk_index = futures[future]
+            try:
+                status_code = future.result()
+            except NifiError as e:
+                result.failures.append(ChunkFailure(chunk_index, e.message, e.details, e.status_code))
+                continue
+            except Exception as e:
+                logger.error(f"Unexpected error sending chunk {chunk_index} of upload {upload_id}: {e}")
+                result.failures.append(ChunkFailure(chunk_index, 'Internal error during upload processing'))
+                continue
+            
+            result.chunks_sent += 1
+            result.nifi_status = status_code
+            if on_chunk_sent is not None:
+                on_chunk_sent(chunk_index)
+        
+        if result.failures:
+            result.failures.sort(key=lambda failure: failure.chunk_index)
+            result.nifi_status = result.failures[0].status_code
+            logger.error(f"Upload {upload_id}: {len(result.failures)} of {chunk_count} chunks failed")
+        return result
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the chunk threads."""
+        self._executor.shutdown(wait=wait)
+    
+    def _send_chunk(self, batch: Dict[str, Any], start: int, end: int,
+                    build_payload: Callable[[int, int], Dict[str, Any]]) -> int:
+        """Post one chunk, retrying while NiFi rejects it as unavailable; returns the NiFi status."""
+        payload = build_payload(start, end)
+        payload['batch'] = batch
+        
+        attempt = 0
+        while True:
+            try:
+                return self._nifi_client.post_json(payload).status_code
+            except NifiError as e:
+                if e.status_code not in RETRY_STATUS_CODES or attempt >= self._max_retries:
+                    raise
+                delay = self._backoff_seconds * (2 ** attempt)
+                attempt += 1
+                logger.warning(f"Chunk {batch['chunk_index']} of upload {batch['upload_id']} failed "
+                               f"({e.message}), retry {attempt} in {delay:.1f}s")
+                time.sleep(delay)
@@ -0,0 +1,240 @@
+"""
+SQLite implementation of the upload fingerprint index, fronted by Bloom filters.
+"""
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+import logging
+import os
+import sqlite3
+import threading
+
+from ...domain.repositories.upload_fingerprint_repository import IUploadFingerprintRepository
+from .bloom_filter import BloomFilter
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_scopes (
+    scope_id INTEGER PRIMARY KEY,
+    data_type TEXT NOT NULL,
+    delivery_date TEXT NOT NULL,
+    UNIQUE (data_type, delivery_date)
+);
+CREATE TABLE IF NOT EXISTS upload_fingerprints (
+    scope_id INTEGER NOT NULL,
+    fingerprint BLOB NOT NULL,
+    PRIMARY KEY (scope_id, fingerprint)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS upload_fingerprint_filters (
+    scope_id INTEGER PRIMARY KEY,
+    capacity INTEGER NOT NULL,
+    error_rate REAL NOT NULL,
+    item_count INTEGER NOT NULL,
+    bits BLOB NOT NULL
+);
+"""
+
+# Fingerprints per IN (...) lookup, below SQLite's default variable limit
+LOOKUP_BATCH_SIZE = 500
+
+# Minimum Bloom filter capacity of a scope
+MIN_FILTER_CAPACITY = 100000
+
+
+def normalize_delivery_date(delivery_date: Optional[str]) -> str:
+    """Scope key of a delivery date: its date part, so timestamps of the same day share a scope."""
+    if not delivery_date:
+        return ''
+    return delivery_date.strip()[:10]
+
+
+def _scope_key(data_type: str, delivery_date: Optional[str]) -> Tuple[str, str]:
+    return data_type, normalize_delivery_date(delivery_date)
+
+
+class SqliteUploadFingerprintRepository(IUploadFingerprintRepository):
+    """
+    Fingerprint index in a local SQLite database with a Bloom filter per scope.
+    
+    Most fingerprints of a new upload are not in the index, and the scope's filter answers
+    those without touching the fingerprint table; only possible matches are looked up, in
+    batches over the primary key, so a check costs about the same at millions of stored
+    fingerprints. Filters are persisted next to the fingerprints after every add and kept
+    in memory for the max_cached_scopes most recently used scopes. A filter is rebuilt
+    from the table at twice the stored count when an add would overfill it, to keep the
+    false positive rate at error_rate, and when no persisted filter matches the
+    configured error rate.
+    
+    Reservations of uploads in progress are kept in memory only: the worker pool runs in
+    this process and jobs interrupted by a restart are failed, so their reservations must
+    not survive it either.
+    """
+    
+    def __init__(self, path: str, error_rate: float = 0.01, max_cached_scopes: int = 64):
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._error_rate = error_rate
+        self._max_cached_scopes = max_cached_scopes
+        self._lock = threading.Lock()
+        self._filters: 'OrderedDict[int, BloomFilter]' = OrderedDict()
+        self._reservations: Dict[Tuple[str, str], Set[bytes]] = {}
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+            self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+    
+    def find_existing(self, data_type: str, delivery_date: Optional[str], fingerprints: List[bytes]) -> Set[bytes]:
+        """Get the given fingerprints that are already stored in the scope."""
+        with self._lock:
+            return self._find_stored(data_type, delivery_date, fingerprints)
+    
+    def reserve(self, data_type: str, delivery_date: Optional[str], fingerprints: List[bytes]) -> Set[bytes]:
+        """
+        Reserve the given fingerprints for an upload in one step with the duplicate check.
+        
+        Returns the fingerprints that are already stored or reserved by another upload;
+        all others are reserved until they are added or released.
+        """
+        with self._lock:
+            taken = self._find_stored(data_type, delivery_date, fingerprints)
+            reserved = self._reservations.setdefault(_scope_key(data_type, delivery_date), set())
+            for fingerprint in fingerprints:
+                if fingerprint in taken:
+                    continue
+                if fingerprint in reserved:
+                    taken.add(fingerprint)
+                else:
+                    reserved.add(fingerprint)
+        return taken
+    
+    def release(self, data_type: str, delivery_date: Optional[str], fingerprints: Iterable[bytes]) -> None:
+        """Drop reservations of fingerprints whose records were not delivered."""
+        with self._lock:
+            self._drop_reservations(_scope_key(data_type, delivery_date), fingerprints)
+    
+    def add(self, data_type: str, delivery_date: Optional[str], fingerprints: Iterable[bytes]) -> int:
+        """Store fingerprints in the scope, returning the number of new ones."""
+        fingerprints = list(fingerprints)
+        if not fingerprints:
+            return 0
+        
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                scope_id = self._get_scope_id(data_type, delivery_date, create=True)
+                bloom = self._get_filter(scope_id)
+                before = self._connection.total_changes
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO upload_fingerprints (scope_id, fingerprint) VALUES (?, ?)",
+                    ((scope_id, fingerprint) for fingerprint in fingerprints)
+                )
+                added = self._connection.total_changes - before
+                
+                if bloom.count + added > bloom.capacity:
+                    # Rebuild from the table, which now holds the new fingerprints too
+                    bloom = self._build_filter(scope_id, capacity=bloom.capacity * 2)
+                    self._filters[scope_id] = bloom
+                else:
+                    for fingerprint in fingerprints:
+                        bloom.add(fingerprint)
+                self._save_filter(scope_id, bloom)
+                self._connection.execute('COMMIT')
+                self._drop_reservations(_scope_key(data_type, delivery_date), fingerprints)
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                # The cached filter may hold fingerprints that were not stored; it only errs towards lookups
+                raise
+        return added
+    
+    def _find_stored(self, data_type: str, delivery_date: Optional[str], fingerprints: List[bytes]) -> Set[bytes]:
+        scope_id = self._get_scope_id(data_type, delivery_date, create=False)
+        if scope_id is None:
+            return set()
+        
+        bloom = self._get_filter(scope_id)
+        candidates = [fingerprint for fingerprint in fingerprints if bloom.might_contain(fingerprint)]
+        
+        existing = set()
+        for i in range(0, len(candidates), LOOKUP_BATCH_SIZE):
+            batch = candidates[i:i + LOOKUP_BATCH_SIZE]
+            rows = self._connection.execute(
+                "SELECT fingerprint FROM upload_fingerprints "
+                f"WHERE scope_id = ? AND fingerprint IN ({', '.join('?' * len(batch))})",
+                (scope_id, *batch)
+            )
+            existing.update(bytes(row[0]) for row in rows)
+        
+        logger.debug(f"Fingerprint lookup ({data_type}, {delivery_date}): {len(fingerprints)} checked, "
+                     f"{len(candidates)} filter matches, {len(existing)} stored")
+        return existing
+    
+    def _drop_reservations(self, scope: Tuple[str, str], fingerprints: Iterable[bytes]) -> None:
+        reserved = self._reservations.get(scope)
+        if reserved is None:
+            return
+        reserved.difference_update(fingerprints)
+        if not reserved:
+            del self._reservations[scope]
+    
+    def _get_scope_id(self, data_type: str, delivery_date: Optional[str], create: bool) -> Optional[int]:
+        scope = _scope_key(data_type, delivery_date)
+        row = self._connection.execute(
+            "SELECT scope_id FROM upload_scopes WHERE data_type = ? AND delivery_date = ?", scope
+        ).fetchone()
+        if row is not None:
+            return row[0]
+        if not create:
+            return None
+        return self._connection.execute(
+            "INSERT INTO upload_scopes (data_type, delivery_date) VALUES (?, ?)", scope
+        ).lastrowid
+    
+    def _get_filter(self, scope_id: int) -> BloomFilter:
+        """Get the scope's Bloom filter, loading or building it if it is not cached."""
+        bloom = self._filters.get(scope_id)
+        if bloom is not None:
+            self._filters.move_to_end(scope_id)
+            return bloom
+        
+        bloom = self._load_filter(scope_id) or self._build_filter(scope_id)
+        self._filters[scope_id] = bloom
+        while len(self._filters) > self._max_cached_scopes:
+            self._filters.popitem(last=False)
+        return bloom
+    
+    def _load_filter(self, scope_id: int) -> Optional[BloomFilter]:
+        """Restore the persisted filter of a scope, if one with the configured error rate exists."""
+        row = self._connection.execute(
+            "SELECT capacity, error_rate, item_count, bits FROM upload_fingerprint_filters WHERE scope_id = ?",
+            (scope_id,)
+        ).fetchone()
+        if row is None or row[1] != self._error_rate:
+            return None
+        try:
+            return BloomFilter(row[0], row[1], bits=row[3], count=row[2])
+        except ValueError as e:
+            logger.warning(f"Ignoring persisted fingerprint filter of scope {scope_id}: {e}")
+            return None
+    
+    def _build_filter(self, scope_id: int, capacity: int = None) -> BloomFilter:
+        """Build a scope's filter from its stored fingerprints."""
+        count = self._connection.execute(
+            "SELECT COUNT(*) FROM upload_fingerprints WHERE scope_id = ?", (scope_id,)
+        ).fetchone()[0]
+        capacity = max(capacity or 0, count * 2, MIN_FILTER_CAPACITY)
+        
+        bloom = BloomFilter(capacity, self._error_rate)
+        rows = self._connection.execute("SELECT fingerprint FROM upload_fingerprints WHERE scope_id = ?", (scope_id,))
+        for row in rows:
+            bloom.add(row[0])
+        logger.info(f"Built fingerprint filter for scope {scope_id}: {count} fingerprints, {bloom.size_bytes} bytes")
+        return bloom
+    
+    def _save_filter(self, scope_id: int, bloom: BloomFilter) -> None:
+        self._connection.execute(
+            "INSERT OR REPLACE INTO upload_fingerprint_filters (scope_id, capacity, error_rate, item_count, bits) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (scope_id, bloom.capacity, bloom.error_rate, bloom.count, bloom.to_bytes())
+        )
@@ -0,0 +1,185 @@
+"""
+SQLite implementation of the upload job repository.
+"""
+from datetime import datetime
+from typing import List, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from ...domain.entities.data_upload import UploadJob, UPLOAD_FAILED, UPLOAD_FINAL_STATES, UPLOAD_SENDING
+from ...domain.repositories.upload_job_repository import IUploadJobRepository
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_jobs (
+    upload_id TEXT PRIMARY KEY,
+    data_type TEXT NOT NULL,
+    record_count INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    started_at TEXT,
+    finished_at TEXT,
+    nifi_status INTEGER,
+    error TEXT,
+    details TEXT,
+    chunk_count INTEGER,
+    chunks_sent INTEGER NOT NULL DEFAULT 0,
+    failed_chunks TEXT,
+    duplicate_count INTEGER,
+    duplicate_rows TEXT,
+    repeated_count INTEGER,
+    repeated_rows TEXT,
+    forwarded_count INTEGER
+);
+CREATE INDEX IF NOT EXISTS ix_upload_jobs_status ON upload_jobs (status, created_at);
+"""
+
+COLUMNS = [
+    'upload_id', 'data_type', 'record_count', 'status', 'created_at',
+    'started_at', 'finished_at', 'nifi_status', 'error', 'details',
+    'chunk_count', 'chunks_sent', 'failed_chunks', 'duplicate_count', 'duplicate_rows',
+    'repeated_count', 'repeated_rows', 'forwarded_count'
+]
+
+# Columns added after the first release, with their definitions, for upgrading existing stores
+ADDED_COLUMNS = {
+    'chunk_count': 'INTEGER',
+    'chunks_sent': 'INTEGER NOT NULL DEFAULT 0',
+    'failed_chunks': 'TEXT',
+    'duplicate_count': 'INTEGER',
+    'duplicate_rows': 'TEXT',
+    'repeated_count': 'INTEGER',
+    'repeated_rows': 'TEXT',
+    'forwarded_count': 'INTEGER'
+}
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class SqliteUploadJobRepository(IUploadJobRepository):
+    """
+    Upload job store in a local SQLite database.
+    
+    A single connection is shared by the request threads and the upload workers and
+    serialized with a lock; the statements are short, so contention is negligible.
+    Pass ':memory:' as path for a non-persistent store.
+    """
+    
+    def __init__(self, path: str):
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(SCHEMA)
+        self._add_missing_columns()
+    
+    def create(self, job: UploadJob) -> None:
+        """Store a new job."""
+        row = (
+            job.upload_id, job.data_type, job.record_count, job.status, _to_text(job.created_at),
+            _to_text(job.started_at), _to_text(job.finished_at), job.nifi_status, job.error, job.details,
+            job.chunk_count, job.chunks_sent, json.dumps(job.failed_chunks),
+            job.duplicate_count, json.dumps(job.duplicate_rows),
+            job.repeated_count, json.dumps(job.repeated_rows), job.forwarded_count
+        )
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO upload_jobs ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", row
+            )
+    
+    def get(self, upload_id: str) -> Optional[UploadJob]:
+        """Get a job by its upload id, or None if it is unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM upload_jobs WHERE upload_id = ?", (upload_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        values = dict(zip(COLUMNS, row))
+        for column in ('created_at', 'started_at', 'finished_at'):
+            values[column] = _to_datetime(values[column])
+        for column in ('failed_chunks', 'duplicate_rows', 'repeated_rows'):
+            values[column] = json.loads(values[column]) if values[column] else []
+        return UploadJob(**values)
+    
+    def record_duplicates(self, upload_id: str, duplicate_count: int, duplicate_rows: List[int],
+                          repeated_count: int = 0, repeated_rows: Optional[List[int]] = None) -> None:
+        """Record the outcome of the job's duplicate check."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE upload_jobs SET duplicate_count = ?, duplicate_rows = ?, repeated_count = ?, "
+                "repeated_rows = ? WHERE upload_id = ?",
+                (duplicate_count, json.dumps(duplicate_rows), repeated_count, json.dumps(repeated_rows or []),
+                 upload_id)
+            )
+    
+    def mark_sending(self, upload_id: str, started_at: datetime, chunk_count: int) -> None:
+        """Record that a worker started forwarding the job in chunk_count chunks."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE upload_jobs SET status = ?, started_at = ?, chunk_count = ? WHERE upload_id = ?",
+                (UPLOAD_SENDING, _to_text(started_at), chunk_count, upload_id)
+            )
+    
+    def record_chunk_sent(self, upload_id: str) -> None:
+        """Count one more chunk of the job as delivered."""
+        with self._lock:
+            self._connection.execute(
+                "UPDATE upload_jobs SET chunks_sent = chunks_sent + 1 WHERE upload_id = ?", (upload_id,)
+            )
+    
+    def mark_finished(self, upload_id: str, status: str, finished_at: datetime, nifi_status: Optional[int] = None,
+                      error: Optional[str] = None, details: Optional[str] = None,
+                      failed_chunks: Optional[List[int]] = None, forwarded_count: Optional[int] = None) -> None:
+        """Record the final state of a job and the number of its records NiFi accepted."""
+        if status not in UPLOAD_FINAL_STATES:
+            raise ValueError(f"Not a final upload state: {status}")
+        with self._lock:
+            self._connection.execute(
+                "UPDATE upload_jobs SET status = ?, finished_at = ?, nifi_status = ?, error = ?, details = ?, "
+                "failed_chunks = ?, forwarded_count = ? WHERE upload_id = ?",
+                (status, _to_text(finished_at), nifi_status, error, details, json.dumps(failed_chunks or []),
+                 forwarded_count, upload_id)
+            )
+    
+    def fail_unfinished(self, error: str, finished_at: datetime) -> int:
+        """Mark all queued or sending jobs as failed, returning their number."""
+        placeholders = ', '.join('?' * len(UPLOAD_FINAL_STATES))
+        with self._lock:
+            cursor = self._connection.execute(
+                f"UPDATE upload_jobs SET status = ?, finished_at = ?, error = ? WHERE status NOT IN ({placeholders})",
+                (UPLOAD_FAILED, _to_text(finished_at), error, *UPLOAD_FINAL_STATES)
+            )
+        return cursor.rowcount
+    
+    def purge_finished(self, before: datetime) -> int:
+        """Delete finished jobs older than before, returning their number."""
+        placeholders = ', '.join('?' * len(UPLOAD_FINAL_STATES))
+        with self._lock:
+            cursor = self._connection.execute(
+                f"DELETE FROM upload_jobs WHERE status IN ({placeholders}) AND created_at < ?",
+                (*UPLOAD_FINAL_STATES, _to_text(before))
+            )
+        return cursor.rowcount
+    
+    def _add_missing_columns(self) -> None:
+        """Upgrade a store created by an earlier version by adding its missing columns."""
+        existing = {row[1] for row in self._connection.execute("PRAGMA table_info(upload_jobs)")}
+        for column, definition in ADDED_COLUMNS.items():
+            if column not in existing:
+                logger.info(f"Adding column {column} to the upload job store")
+                self._connection.execute(f"ALTER TABLE upload_jobs ADD COLUMN {column} {definition}")
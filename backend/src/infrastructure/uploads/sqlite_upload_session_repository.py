@@ -0,0 +1,229 @@
+"""
+SQLite implementation of the upload session repository.
+"""
+from datetime import datetime
+from typing import List, Optional
+import json
+import logging
+import os
+import sqlite3
+import threading
+
+from ...domain.entities.data_upload import UploadSession, UploadSessionChunk, UploadSessionCommit, SESSION_COMMITTED
+from ...domain.repositories.upload_session_repository import IUploadSessionRepository
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS upload_sessions (
+    session_id TEXT PRIMARY KEY,
+    data_type TEXT NOT NULL,
+    upload_format TEXT NOT NULL,
+    chunk_count INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    columns TEXT,
+    skip_duplicate_check INTEGER NOT NULL DEFAULT 0,
+    delivery_date TEXT,
+    upload_id TEXT,
+    committed_at TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_upload_sessions_updated ON upload_sessions (updated_at);
+CREATE TABLE IF NOT EXISTS upload_session_chunks (
+    session_id TEXT NOT NULL,
+    chunk_index INTEGER NOT NULL,
+    digest TEXT NOT NULL,
+    record_count INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    received_at TEXT NOT NULL,
+    PRIMARY KEY (session_id, chunk_index)
+);
+CREATE INDEX IF NOT EXISTS ix_upload_session_chunks_digest ON upload_session_chunks (digest);
+CREATE TABLE IF NOT EXISTS upload_session_commits (
+    idempotency_key TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL,
+    upload_id TEXT NOT NULL,
+    committed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_upload_session_commits_session ON upload_session_commits (session_id);
+"""
+
+COLUMNS = [
+    'session_id', 'data_type', 'upload_format', 'chunk_count', 'status', 'created_at', 'updated_at',
+    'columns', 'skip_duplicate_check', 'delivery_date', 'upload_id', 'committed_at'
+]
+
+
+def _to_text(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value is not None else None
+
+
+def _to_datetime(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value) if value is not None else None
+
+
+class SqliteUploadSessionRepository(IUploadSessionRepository):
+    """
+    Upload session store in a local SQLite database.
+    
+    Chunk contents are not stored here but in the content-addressed chunk store; a
+    chunk row only references its content by digest. Pass ':memory:' as path for a
+    non-persistent store.
+    """
+    
+    def __init__(self, path: str):
+        if path != ':memory:':
+            directory = os.path.dirname(os.path.abspath(path))
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.executescript(SCHEMA)
+    
+    def create(self, session: UploadSession) -> None:
+        """Store a new session."""
+        row = (
+            session.session_id, session.data_type, session.upload_format, session.chunk_count, session.status,
+            _to_text(session.created_at), _to_text(session.updated_at),
+            json.dumps(session.columns) if session.columns is not None else None,
+            int(session.skip_duplicate_check), session.delivery_date, session.upload_id,
+            _to_text(session.committed_at)
+        )
+        with self._lock:
+            self._connection.execute(
+                f"INSERT INTO upload_sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})", row
+            )
+    
+    def get(self, session_id: str) -> Optional[UploadSession]:
+        """Get a session by its id, or None if it is unknown."""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT {', '.join(COLUMNS)} FROM upload_sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        
+        values = dict(zip(COLUMNS, row))
+        for column in ('created_at', 'updated_at', 'committed_at'):
+            values[column] = _to_datetime(values[column])
+        values['columns'] = json.loads(values['columns']) if values['columns'] else None
+        values['skip_duplicate_check'] = bool(values['skip_duplicate_check'])
+        return UploadSession(**values)
+    
+    def find_commit(self, idempotency_key: str) -> Optional[UploadSessionCommit]:
+        """Get the commit made with an idempotency key, or None if the key is unused."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT idempotency_key, session_id, upload_id, committed_at FROM upload_session_commits "
+                "WHERE idempotency_key = ?",
+                (idempotency_key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return UploadSessionCommit(
+            idempotency_key=row[0], session_id=row[1], upload_id=row[2], committed_at=_to_datetime(row[3])
+        )
+    
+    def get_chunks(self, session_id: str) -> List[UploadSessionChunk]:
+        """Get the received chunks of a session, ordered by chunk index."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT chunk_index, digest, record_count, size_bytes, received_at FROM upload_session_chunks "
+                "WHERE session_id = ? ORDER BY chunk_index",
+                (session_id,)
+            ).fetchall()
+        return [
+            UploadSessionChunk(
+                chunk_index=row[0], digest=row[1], record_count=row[2], size_bytes=row[3],
+                received_at=_to_datetime(row[4])
+            )
+            for row in rows
+        ]
+    
+    def put_chunk(self, session_id: str, chunk: UploadSessionChunk) -> None:
+        """Store a received chunk, replacing an earlier one with the same index."""
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                self._connection.execute(
+                    "INSERT OR REPLACE INTO upload_session_chunks "
+                    "(session_id, chunk_index, digest, record_count, size_bytes, received_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (session_id, chunk.chunk_index, chunk.digest, chunk.record_count, chunk.size_bytes,
+                     _to_text(chunk.received_at))
+                )
+                self._connection.execute(
+                    "UPDATE upload_sessions SET updated_at = ? WHERE session_id = ?",
+                    (_to_text(chunk.received_at), session_id)
+                )
+                self._connection.execute('COMMIT')
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                raise
+    
+    def add_commit(self, commit: UploadSessionCommit) -> None:
+        """Record a commit and mark its session as committed."""
+        committed_at = _to_text(commit.committed_at)
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                self._connection.execute(
+                    "INSERT INTO upload_session_commits (idempotency_key, session_id, upload_id, committed_at) "
+                    "VALUES (?, ?, ?, ?)",
+                    (commit.idempotency_key, commit.session_id, commit.upload_id, committed_at)
+                )
+                self._connection.execute(
+                    "UPDATE upload_sessions SET status = ?, upload_id = ?, committed_at = ?, updated_at = ? "
+                    "WHERE session_id = ?",
+                    (SESSION_COMMITTED, commit.upload_id, committed_at, committed_at, commit.session_id)
+                )
+                self._connection.execute('COMMIT')
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                raise
+    
+    def purge_inactive(self, before: datetime) -> List[str]:
+        """
+        Delete sessions not updated since before.
+        
+        Returns:
+            Digests of the chunks no longer referenced by any session
+        """
+        with self._lock:
+            self._connection.execute('BEGIN')
+            try:
+                expired = "SELECT session_id FROM upload_sessions WHERE updated_at < ?"
+                digests = [row[0] for row in self._connection.execute(
+                    f"SELECT DISTINCT digest FROM upload_session_chunks WHERE session_id IN ({expired})",
+                    (_to_text(before),)
+                )]
+                for table in ('upload_session_chunks', 'upload_session_commits'):
+                    self._connection.execute(
+                        f"DELETE FROM {table} WHERE session_id IN ({expired})", (_to_text(before),)
+                    )
+                cursor = self._connection.execute(
+                    "DELETE FROM upload_sessions WHERE updated_at < ?", (_to_text(before),)
+                )
+                orphaned = [
+                    digest for digest in digests
+                    if self._connection.execute(
+                        "SELECT 1 FROM upload_session_chunks WHERE digest = ? LIMIT 1", (digest,)
+                    ).fetchone() is None
+                ]
+                self._connection.execute('COMMIT')
+            except Exception:
+                self._connection.execute('ROLLBACK')
+                raise
+        if cursor.rowcount:
+            logger.info(f"Purged {cursor.rowcount} inactive upload sessions")
+        return orphaned
+    
+    def is_referenced(self, digest: str) -> bool:
+        """Check whether a chunk digest is referenced by any session."""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT 1 FROM upload_session_chunks WHERE digest = ? LIMIT 1", (digest,)
+            ).fetchone()
+        return row is not None
@@ -0,0 +1,278 @@
+"""
+Registry of upload type schemas, compiled to column-wise validators and coercers.
+
+Each schema column is compiled once into a function that coerces a whole column of
+values and collects the errors of every invalid value, so validating an upload is a
+handful of tight loops over column arrays instead of per-record type dispatch, and
+all errors of a sheet are found in a single pass.
+"""
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+import logging
+import math
+import time
+
+from ...domain.entities.upload_schema import (
+    UploadColumn, UploadSchema, UploadValidationError, UploadValidationIssue,
+    COLUMN_DATE, COLUMN_NUMBER, COLUMN_TEXT
+)
+from ..config.app_config import AppConfig
+from ..config.upload_schemas import UPLOAD_SCHEMAS
+from ..nifi.upload_payload import collect_columns
+
+logger = logging.getLogger(__name__)
+
+# Day 0 of Excel's 1900 date system, as used for serial dates from 1900-03-01 on
+EXCEL_EPOCH = date(1899, 12, 30)
+MAX_EXCEL_SERIAL = 2958465  # 9999-12-31
+
+# Coerces a column of values, returning the coerced values and (row, message) per invalid value
+ColumnCoercer = Callable[[List[Any]], Tuple[List[Any], List[Tuple[int, str]]]]
+
+
+def _to_text(value: Any) -> Optional[str]:
+    value_type = type(value)
+    if value_type is str:
+        return value.strip() or None
+    if value_type is int:
+        return str(value)
+    if value_type is float and math.isfinite(value):
+        return str(int(value)) if value.is_integer() else repr(value)
+    raise ValueError(f'expected text, got {value!r}')
+
+
+def _to_number(value: Any) -> Optional[float]:
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is float:
+        if not math.isfinite(value):
+            raise ValueError(f'expected a finite number, got {value!r}')
+        return value
+    if value_type is str:
+        text = value.strip()
+        if not text:
+            return None
+        try:
+            return int(text)
+        except ValueError:
+            pass
+        try:
+            number = float(text)
+        except ValueError:
+            raise ValueError(f"expected a number, got '{value}'")
+        if not math.isfinite(number):
+            raise ValueError(f"expected a finite number, got '{value}'")
+        return number
+    raise ValueError(f'expected a number, got {value!r}')
+
+
+def _to_date(value: Any) -> Optional[str]:
+    value_type = type(value)
+    if value_type is str:
+        text = value.strip()
+        if not text:
+            return None
+        if len(text) == 10 or (len(text) > 10 and text[10] in 'T '):
+            try:
+                return date.fromisoformat(text[:10]).isoformat()
+            except ValueError:
+                pass
+        raise ValueError(f"expected a date (YYYY-MM-DD), got '{value}'")
+    if (value_type is int or value_type is float) and 1 <= value <= MAX_EXCEL_SERIAL:
+        # Excel date cells arrive as serial day numbers
+        return (EXCEL_EPOCH + timedelta(days=int(value))).isoformat()
+    raise ValueError(f'expected a date (YYYY-MM-DD), got {value!r}')
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    COLUMN_TEXT: _to_text,
+    COLUMN_NUMBER: _to_number,
+    COLUMN_DATE: _to_date,
+}
+
+# Column types whose values repeat a lot within a sheet; their conversions are memoized per upload
+_MEMOIZED_TYPES = (COLUMN_DATE,)
+
+# Value types whose conversions are memoized; other values (lists, objects) are not hashable
+_MEMOIZED_VALUE_TYPES = (str, int, float)
+
+
+def compile_column(column: UploadColumn) -> ColumnCoercer:
+    """Compile the coercer of a schema column."""
+    convert = _CONVERTERS[column.type]
+    required = column.required
+    memoize = column.type in _MEMOIZED_TYPES
+    
+    def coerce(values: List[Any]) -> Tuple[List[Any], List[Tuple[int, str]]]:
+        coerced = [None] * len(values)
+        errors = []
+        cache = {}
+        for i, value in enumerate(values):
+            if value is None:
+                converted = None
+            elif memoize and type(value) in _MEMOIZED_VALUE_TYPES and value in cache:
+                converted = cache[value]
+            else:
+                try:
+                    converted = convert(value)
+                except ValueError as e:
+                    errors.append((i, str(e)))
+                    continue
+                if memoize and type(value) in _MEMOIZED_VALUE_TYPES:
+                    cache[value] = converted
+            if converted is None:
+                if required:
+                    errors.append((i, 'a value is required'))
+                continue
+            coerced[i] = converted
+        return coerced, errors
+    
+    return coerce
+
+
+class CompiledUploadSchema:
+    """An upload schema with its compiled column coercers."""
+    
+    def __init__(self, schema: UploadSchema):
+        self.schema = schema
+        self.column_names = [column.name for column in schema.columns]
+        self._positions = {column.name.strip().lower(): i for i, column in enumerate(schema.columns)}
+        self._coercers = [compile_column(column) for column in schema.columns]
+    
+    def validate_rows(self, columns: List[str], rows: List[List[Any]],
+                      max_errors: int) -> Tuple[List[str], List[List[Any]]]:
+        """
+        Validate and coerce a columnar upload.
+        
+        Returns:
+            The schema's column names and the coerced rows, one value per schema column
+        
+        Raises:
+            UploadValidationError: With every invalid value, up to max_errors listed
+        """
+        column_values = [list(values) for values in zip(*rows)] if rows else [[] for _ in columns]
+        coerced = self._coerce(columns, column_values, len(rows), max_errors)
+        return self.column_names, [list(row) for row in zip(*coerced)]
+    
+    def validate_records(self, records: List[Dict[str, Any]], max_errors: int) -> List[Dict[str, Any]]:
+        """
+        Validate and coerce a records upload.
+        
+        Returns:
+            The coerced records, keyed by the schema's column names
+        
+        Raises:
+            UploadValidationError: With every invalid value, up to max_errors listed
+        """
+        keys = collect_columns(records)
+        column_values = [[record.get(key) for record in records] for key in keys]
+        coerced = self._coerce(keys, column_values, len(records), max_errors)
+        names = self.column_names
+        return [dict(zip(names, values)) for values in zip(*coerced)]
+    
+    def _coerce(self, names: List[str], column_values: List[List[Any]], row_count: int,
+                max_errors: int) -> List[List[Any]]:
+        """Coerce input columns into one value array per schema column."""
+        # (row, schema column position, column, message); row -1 for problems with a whole column
+        issues: List[Tuple[int, int, str, str]] = []
+        inputs: List[Optional[List[Any]]] = [None] * len(self._coercers)
+        for name, values in zip(names, column_values):
+            position = self._positions.get(str(name).strip().lower())
+            if position is None:
+                issues.append((-1, -1, name, f"Unknown column, expected: {', '.join(self.column_names)}"))
+            elif inputs[position] is not None:
+                issues.append((-1, position, name, 'Column appears more than once'))
+            else:
+                inputs[position] = values
+        
+        coerced = []
+        for position, (column, coerce) in enumerate(zip(self.schema.columns, self._coercers)):
+            values = inputs[position]
+            if values is None:
+                if column.required:
+                    issues.append((-1, position, column.name, 'Required column is missing'))
+                coerced.append([None] * row_count)
+                continue
+            column_coerced, errors = coerce(values)
+            issues.extend((row, position, column.name, message) for row, message in errors)
+            coerced.append(column_coerced)
+        
+        if issues:
+            issues.sort(key=lambda issue: (issue[0], issue[1]))
+            raise UploadValidationError(
+                [
+                    UploadValidationIssue(row=row if row >= 0 else None, column=column, message=message)
+                    for row, _, column, message in issues[:max_errors]
+                ],
+                error_count=len(issues)
+            )
+        return coerced
+
+
+class UploadSchemaRegistry:
+    """
+    Upload types and their compiled schemas.
+    
+    Types are looked up by id or, for the add-in which sends the display name, by
+    name, both case-insensitively. Schemas are compiled once when the registry is created.
+    """
+    
+    def __init__(self, schemas: Sequence[UploadSchema] = UPLOAD_SCHEMAS, max_errors: int = None):
+        """
+        Args:
+            schemas: Upload type schemas
+            max_errors: Maximum number of errors listed per upload; all are counted
+        """
+        self._schemas = [CompiledUploadSchema(schema) for schema in schemas]
+        self._max_errors = AppConfig.UPLOAD_VALIDATION_MAX_ERRORS if max_errors is None else max_errors
+        self._by_key: Dict[str, CompiledUploadSchema] = {}
+        for compiled in self._schemas:
+            self._by_key[compiled.schema.id.lower()] = compiled
+            self._by_key[compiled.schema.name.lower()] = compiled
+    
+    @property
+    def schemas(self) -> List[UploadSchema]:
+        return [compiled.schema for compiled in self._schemas]
+    
+    def get(self, data_type: str) -> Optional[CompiledUploadSchema]:
+        """Get the compiled schema of an upload type, or None if it is unknown."""
+        return self._by_key.get(str(data_type).strip().lower())
+    
+    def validate(self, data_type: str, data: List[Any],
+                 columns: Optional[List[str]] = None) -> Tuple[str, List[Any], Optional[List[str]]]:
+        """
+        Validate and coerce an upload against the schema of its type.
+        
+        Args:
+            data_type: Upload type id or name
+            data: Record objects, or row arrays when columns is given
+            columns: Column names of a columnar upload
+        
+        Returns:
+            The id of the upload type, the coerced data and, for a columnar upload, the schema's
+            column names
+        
+        Raises:
+            ValueError: If the upload type is unknown
+            UploadValidationError: If values do not match the schema
+        """
+        compiled = self.get(data_type)
+        if compiled is None:
+            known = ', '.join(schema.id for schema in self.schemas)
+            raise ValueError(f"Unknown data type '{data_type}', must be one of: {known}")
+        
+        start = time.perf_counter()
+        try:
+            if columns is not None:
+                columns, data = compiled.validate_rows(columns, data, self._max_errors)
+            else:
+                data = compiled.validate_records(data, self._max_errors)
+        finally:
+            logger.debug(f"Validated {len(data)} {compiled.schema.id} records "
+                         f"in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return compiled.schema.id, data, columns
+
+
+# Global upload schema registry instance
+upload_schema_registry = UploadSchemaRegistry()
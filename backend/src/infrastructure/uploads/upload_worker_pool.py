@@ -0,0 +1,76 @@
+"""
+Bounded background worker pool for upload jobs.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+class UploadQueueFullError(RuntimeError):
+    """Raised when the upload queue has no capacity left."""
+    pass
+
+
+class UploadWorkerPool:
+    """
+    Runs upload jobs on a fixed number of worker threads.
+    
+    At most max_workers jobs run at once and at most max_queued further jobs wait for
+    a worker; submitting beyond that raises UploadQueueFullError instead of buffering
+    an unbounded amount of upload payloads in memory. The workers are not daemon
+    threads: on a normal interpreter exit the running and queued jobs are finished
+    first. Jobs cut short by a hard stop are failed by the upload service on restart.
+    """
+    
+    def __init__(self, max_workers: int, max_queued: int, name: str = 'upload-worker'):
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queued)
+        self._lock = threading.Lock()
+        self._pending = 0
+    
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        return self._pending
+    
+    def submit(self, function: Callable[[], None]) -> Future:
+        """
+        Queue a job for a background worker.
+        
+        Raises:
+            UploadQueueFullError: If max_workers + max_queued jobs are already pending
+        """
+        if not self._slots.acquire(blocking=False):
+            raise UploadQueueFullError(
+                f"Upload queue is full ({self.max_workers + self.max_queued} uploads pending)"
+            )
+        
+        with self._lock:
+            self._pending += 1
+        try:
+            return self._executor.submit(self._run, function)
+        except Exception:
+            self._release()
+            raise
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting jobs, optionally waiting for pending ones."""
+        self._executor.shutdown(wait=wait)
+    
+    def _run(self, function: Callable[[], None]) -> None:
+        try:
+            function()
+        except Exception as e:
+            logger.error(f"Upload job failed unexpectedly: {e}")
+        finally:
+            self._release()
+    
+    def _release(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
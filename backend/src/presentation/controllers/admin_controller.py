@@ -0,0 +1,79 @@
+"""
+Flask controller for administrative endpoints.
+"""
+from flask import Blueprint, request, jsonify
+import hmac
+import logging
+
+from ...infrastructure.config.app_config import AppConfig
+from ...infrastructure.service_container import get_service_container
+
+logger = logging.getLogger(__name__)
+
+admin_bp = Blueprint('admin', __name__, url_prefix='/api/admin')
+
+
+@admin_bp.before_request
+def check_admin_access():
+    """
+    Require the admin token; without a configured token admin endpoints are disabled.
+    The client address is not trusted, since behind the reverse proxy every request comes from localhost.
+    """
+    if AppConfig.ADMIN_API_TOKEN:
+        token = request.headers.get('X-Admin-Token', '')
+        if hmac.compare_digest(token.encode('utf-8'), AppConfig.ADMIN_API_TOKEN.encode('utf-8')):
+            return None
+        logger.warning(f"Rejected admin request with an invalid token to {request.path}")
+    else:
+        logger.warning(f"Rejected admin request to {request.path}: ADMIN_API_TOKEN is not configured")
+    
+    return jsonify({
+        'success': False,
+        'error': 'Admin access denied'
+    }), 403
+
+
+@admin_bp.route('/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """Invalidate a named in-process cache, or all caches when no name is given."""
+    try:
+        data = request.get_json(silent=True) or {}
+        cache_name = data.get('cache') or request.args.get('cache')
+        
+        try:
+            invalidated = get_service_container().invalidate_caches(cache_name)
+        except KeyError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e.args[0])
+            }), 404
+        
+        logger.info(f"Invalidated caches: {', '.join(invalidated)}")
+        return jsonify({
+            'success': True,
+            'invalidated': invalidated
+        })
+    
+    except Exception as e:
+        logger.error(f"Error invalidating cache: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@admin_bp.route('/nifi/metrics', methods=['GET'])
+def get_nifi_metrics():
+    """Get request and connection reuse metrics of the shared NiFi client."""
+    try:
+        return jsonify({
+            'success': True,
+            'metrics': get_service_container().nifi_client.metrics()
+        })
+    
+    except Exception as e:
+        logger.error(f"Error getting NiFi metrics: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
@@ -1,15 +1,20 @@
 """
 Data Upload Controller for handling Excel data uploads and forwarding to NiFi.
 """
-import json
 import logging
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from dataclasses import asdict
 
-import requests
 from flask import Blueprint, jsonify, request
+from werkzeug.exceptions import HTTPException
 
-from src.infrastructure.config.app_config import AppConfig
+from src.application.dtos.data_dtos import DataUploadRequestDto, UploadSessionRequestDto
+from src.domain.entities.data_upload import (
+    UploadSessionConflictError, UploadSessionNotFoundError,
+    UPLOAD_FORMAT_COLUMNAR, UPLOAD_FORMAT_RECORDS, UPLOAD_FORMATS
+)
+from src.domain.entities.upload_schema import UploadValidationError
+from src.infrastructure.service_container import get_service_container
+from src.infrastructure.uploads.upload_worker_pool import UploadQueueFullError
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +26,8 @@ data_upload_bp = Blueprint('data_upload', __name__, url_prefix='/api/data-upload
 def upload_data():
     """
     Handle data upload from Excel Add-in.
-    Process the data and forward to NiFi endpoint.
+    Validate the data and queue it for forwarding to NiFi; the returned upload_id
+    can be polled through /status/<upload_id>.
     """
     try:
         # Get request data
@@ -37,7 +43,7 @@ def upload_data():
         data_type = request_data.get('dataType')
         skip_duplicate_check = request_data.get('skipDuplicateCheck', False)
         delivery_date = request_data.get('deliveryDate')
-        data = request_data.get('data', [])
+        upload_format = request_data.get('format', UPLOAD_FORMAT_RECORDS)
         
         # Validate required fields
         if not data_type:
@@ -46,116 +52,84 @@ def upload_data():
                 'error': 'Data type is required'
             }), 400
         
-        if not data or not isinstance(data, list):
+        if upload_format not in UPLOAD_FORMATS:
             return jsonify({
                 'success': False,
-                'error': 'Data array is required and must be non-empty'
+                'error': f"Invalid format '{upload_format}', must be one of: {', '.join(UPLOAD_FORMATS)}"
             }), 400
         
-        # Log upload attempt
-        logger.info(f"Processing data upload: type={data_type}, records={len(data)}")
-        
-        # Process and validate data
-        processed_data = []
-        for i, record in enumerate(data):
-            if not isinstance(record, dict):
+        columns = None
+        if upload_format == UPLOAD_FORMAT_COLUMNAR:
+            # Column names once, one value array per row
+            columns = request_data.get('columns')
+            data = request_data.get('rows', [])
+            if not columns or not isinstance(columns, list):
                 return jsonify({
                     'success': False,
-                    'error': f'Invalid record format at index {i}'
+                    'error': 'Columns array is required for columnar uploads'
                 }), 400
-            
-            # Add metadata to each record
-            processed_record = {
-                **record,
-                '_upload_metadata': {
-                    'upload_timestamp': datetime.utcnow().isoformat(),
-                    'data_type': data_type,
-                    'skip_duplicate_check': skip_duplicate_check,
-                    'delivery_date': delivery_date,
-                    'record_index': i
-                }
-            }
-            processed_data.append(processed_record)
-        
-        # Prepare payload for NiFi
-        nifi_payload = {
-            'source': 'excel_addin',
-            'upload_timestamp': datetime.utcnow().isoformat(),
-            'data_type': data_type,
-            'configuration': {
-                'skip_duplicate_check': skip_duplicate_check,
-                'delivery_date': delivery_date
-            },
-            'records': processed_data,
-            'record_count': len(processed_data)
-        }
-        
-        # Forward to NiFi endpoint
-        nifi_endpoint = AppConfig.NIFI_ENDPOINT
-        ssl_config = AppConfig.get_nifi_ssl_config()
-        
-        logger.info(f"Forwarding data to NiFi endpoint: {nifi_endpoint}")
-        logger.debug(f"SSL configuration: verify={ssl_config.get('verify', 'default')}, "
-                    f"client_cert={'configured' if ssl_config.get('cert') else 'not configured'}")
-        
-        try:
-            response = requests.post(
-                nifi_endpoint,
-                json=nifi_payload,
-                headers={
-                    'Content-Type': 'application/json',
-                    'X-Forwarded-From': 'excel-addin-backend'
-                },
-                timeout=30,
-                **ssl_config  # Apply SSL configuration (verify, cert)
-            )
-            
-            if response.status_code == 200 or response.status_code == 201:
-                logger.info(f"Successfully forwarded {len(processed_data)} records to NiFi")
+            if not data or not isinstance(data, list):
                 return jsonify({
-                    'success': True,
-                    'message': f'Successfully uploaded {len(processed_data)} records',
-                    'record_count': len(processed_data),
-                    'data_type': data_type,
-                    'nifi_response_status': response.status_code
-                })
-            else:
-                logger.error(f"NiFi endpoint returned status {response.status_code}: {response.text}")
+                    'success': False,
+                    'error': 'Rows array is required and must be non-empty'
+                }), 400
+        else:
+            data = request_data.get('data', [])
+            if not data or not isinstance(data, list):
                 return jsonify({
                     'success': False,
-                    'error': f'NiFi processing failed with status {response.status_code}',
-                    'details': response.text[:500] if response.text else None
-                }), 502
-                
-        except requests.exceptions.SSLError as e:
-            logger.error(f"SSL error when connecting to NiFi endpoint: {str(e)}")
-            return jsonify({
-                'success': False,
-                'error': 'SSL certificate verification failed when connecting to NiFi',
-                'details': 'Check certificate configuration in backend/certificates/ directory',
-                'ssl_error': str(e)
-            }), 502
-            
-        except requests.exceptions.Timeout:
-            logger.error("Timeout when connecting to NiFi endpoint")
+                    'error': 'Data array is required and must be non-empty'
+                }), 400
+        
+        # Log upload attempt
+        logger.info(f"Processing data upload: type={data_type}, format={upload_format}, records={len(data)}")
+        
+        request_dto = DataUploadRequestDto(
+            data_type=data_type,
+            data=data,
+            skip_duplicate_check=skip_duplicate_check,
+            delivery_date=delivery_date,
+            columns=columns
+        )
+        
+        service = get_service_container().data_upload_service()
+        try:
+            job = service.submit_upload(request_dto)
+        except UploadValidationError as e:
+            # Every invalid value with its record index and column
             return jsonify({
                 'success': False,
-                'error': 'Upload timeout - NiFi endpoint did not respond in time'
-            }), 504
-            
-        except requests.exceptions.ConnectionError:
-            logger.error("Connection error when connecting to NiFi endpoint")
+                'error': str(e),
+                'error_count': e.error_count,
+                'errors': [asdict(error) for error in e.errors]
+            }), 400
+        except ValueError as e:
             return jsonify({
                 'success': False,
-                'error': 'Unable to connect to NiFi endpoint'
-            }), 502
-            
-        except requests.exceptions.RequestException as e:
-            logger.error(f"Request error when connecting to NiFi: {str(e)}")
+                'error': str(e)
+            }), 400
+        except UploadQueueFullError as e:
+            logger.warning(f"Rejected upload: {e}")
             return jsonify({
                 'success': False,
-                'error': f'Request failed: {str(e)}'
-            }), 502
+                'error': 'Too many uploads in progress, please retry later'
+            }), 503
+        
+        return jsonify({
+            'success': True,
+            'message': f'Accepted {job.record_count} records for upload',
+            'upload_id': job.upload_id,
+            'status': job.status,
+            'record_count': job.record_count,
+            'data_type': job.data_type
+        }), 202
+    
+    except HTTPException as e:
+        # Malformed or oversized (compressed) request bodies
+        return jsonify({
+            'success': False,
+            'error': e.description
+        }), e.code
     
     except Exception as e:
         logger.error(f"Unexpected error in upload_data: {str(e)}")
@@ -168,30 +142,14 @@ def upload_data():
 @data_upload_bp.route('/types', methods=['GET'])
 def get_upload_types():
     """
-    Get available data upload types.
+    Get available data upload types with the columns of each type's schema.
     """
     try:
-        upload_types = [
-            {
-                'id': 'windmill_statistics',
-                'name': 'Windmill Statistics',
-                'description': 'Statistical data for windmill performance analysis'
-            },
-            {
-                'id': 'financial_outperformance',
-                'name': 'Financial Outperformance',
-                'description': 'Financial performance comparison data'
-            },
-            {
-                'id': 'excellence_accounting',
-                'name': 'Excellence Accounting',
-                'description': 'Accounting excellence metrics and data'
-            }
-        ]
+        upload_types = get_service_container().data_upload_service().get_upload_types()
         
         return jsonify({
             'success': True,
-            'upload_types': upload_types
+            'upload_types': [asdict(upload_type) for upload_type in upload_types]
         })
     
     except Exception as e:
@@ -205,17 +163,22 @@ def get_upload_types():
 @data_upload_bp.route('/status/<upload_id>', methods=['GET'])
 def get_upload_status(upload_id: str):
     """
-    Get the status of a specific upload.
-    Note: This is a placeholder for future implementation with upload tracking.
+    Get the status of a specific upload: queued, sending, done or failed,
+    with its timings and the NiFi response status.
     """
     try:
-        # This would normally query a database for upload status
-        # For now, return a simple response
+        service = get_service_container().data_upload_service()
+        job = service.get_upload_status(upload_id)
+        
+        if job is None:
+            return jsonify({
+                'success': False,
+                'error': f'Upload {upload_id} not found'
+            }), 404
+        
         return jsonify({
             'success': True,
-            'upload_id': upload_id,
-            'status': 'completed',
-            'message': 'Upload status tracking not yet implemented'
+            **asdict(job)
         })
     
     except Exception as e:
@@ -223,4 +186,207 @@ def get_upload_status(upload_id: str):
         return jsonify({
             'success': False,
             'error': 'Failed to retrieve upload status'
-        }), 500
\ No newline at end of file
+        }), 500
+
+
+@data_upload_bp.route('/sessions', methods=['POST'])
+def open_upload_session():
+    """
+    Open a resumable upload session.
+    The upload is then sent as chunkCount chunks through PUT /sessions/<session_id>/chunks/<index>
+    and submitted with POST /sessions/<session_id>/commit.
+    """
+    try:
+        request_data = request.get_json()
+        
+        if not request_data:
+            return jsonify({
+                'success': False,
+                'error': 'No data provided'
+            }), 400
+        
+        if not request_data.get('dataType'):
+            return jsonify({
+                'success': False,
+                'error': 'Data type is required'
+            }), 400
+        
+        request_dto = UploadSessionRequestDto(
+            data_type=request_data.get('dataType'),
+            chunk_count=request_data.get('chunkCount'),
+            upload_format=request_data.get('format', UPLOAD_FORMAT_RECORDS),
+            columns=request_data.get('columns'),
+            skip_duplicate_check=request_data.get('skipDuplicateCheck', False),
+            delivery_date=request_data.get('deliveryDate')
+        )
+        
+        try:
+            session = get_service_container().upload_session_service().open_session(request_dto)
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            **asdict(session)
+        }), 201
+    
+    except HTTPException as e:
+        return jsonify({
+            'success': False,
+            'error': e.description
+        }), e.code
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in open_upload_session: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to open upload session'
+        }), 500
+
+
+@data_upload_bp.route('/sessions/<session_id>', methods=['GET'])
+def get_upload_session(session_id: str):
+    """
+    Get the state of an upload session with its received and missing chunks,
+    so an interrupted client resends only the missing ones.
+    """
+    try:
+        session = get_service_container().upload_session_service().get_session(session_id)
+        
+        if session is None:
+            return jsonify({
+                'success': False,
+                'error': f'Upload session {session_id} not found or expired'
+            }), 404
+        
+        return jsonify({
+            'success': True,
+            **asdict(session)
+        })
+    
+    except Exception as e:
+        logger.error(f"Error getting upload session: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to retrieve upload session'
+        }), 500
+
+
+@data_upload_bp.route('/sessions/<session_id>/chunks/<int:chunk_index>', methods=['PUT'])
+def put_upload_chunk(session_id: str, chunk_index: int):
+    """
+    Store a chunk of an upload session.
+    The body is a JSON array of records, or of rows for a columnar session. The optional
+    X-Content-SHA256 header carries the hex SHA-256 of the body, which is verified.
+    """
+    try:
+        content = request.get_data(cache=False)
+        digest = request.headers.get('X-Content-SHA256')
+        
+        try:
+            chunk, created = get_service_container().upload_session_service().put_chunk(
+                session_id, chunk_index, content, digest
+            )
+        except UploadSessionNotFoundError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 404
+        except UploadSessionConflictError as e:
+            return jsonify({
+                'success': False,
+                'error': e.message
+            }), 409
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        
+        return jsonify({
+            'success': True,
+            'created': created,
+            **asdict(chunk)
+        }), 201 if created else 200
+    
+    except HTTPException as e:
+        return jsonify({
+            'success': False,
+            'error': e.description
+        }), e.code
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in put_upload_chunk: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Failed to store upload chunk'
+        }), 500
+
+
+@data_upload_bp.route('/sessions/<session_id>/commit', methods=['POST'])
+def commit_upload_session(session_id: str):
+    """
+    Submit the chunks of an upload session as one upload.
+    Requires an Idempotency-Key header; committing again with the same key returns the
+    original upload instead of forwarding the records again.
+    """
+    try:
+        idempotency_key = request.headers.get('Idempotency-Key')
+        service = get_service_container().upload_session_service()
+        try:
+            result = service.commit(session_id, idempotency_key)
+        except UploadSessionNotFoundError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 404
+        except UploadSessionConflictError as e:
+            response = {
+                'success': False,
+                'error': e.message
+            }
+            if e.missing_chunks is not None:
+                response['missing_chunks'] = e.missing_chunks
+            return jsonify(response), 409
+        except UploadValidationError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e),
+                'error_count': e.error_count,
+                'errors': [asdict(error) for error in e.errors]
+            }), 400
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+        except UploadQueueFullError as e:
+            logger.warning(f"Rejected upload session commit: {e}")
+            return jsonify({
+                'success': False,
+                'error': 'Too many uploads in progress, please retry later'
+            }), 503
+        
+        upload = result.upload
+        response = jsonify({
+            'success': True,
+            'session_id': result.session_id,
+            'upload_id': result.upload_id,
+            'replayed': result.replayed,
+            'status': upload.status if upload is not None else None,
+            'record_count': upload.record_count if upload is not None else None,
+            'data_type': upload.data_type if upload is not None else None
+        })
+        if result.replayed:
+            response.headers['Idempotent-Replayed'] = 'true'
+        return response, 202
+    
+    except Exception as e:
+        logger.error(f"Unexpected error in commit_upload_session: {str(e)}")
+        return jsonify({
+            'success': False,
+            'error': 'Internal server error during upload processing'
+        }), 500
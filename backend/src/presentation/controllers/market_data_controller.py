@@ -2,22 +2,33 @@
 Flask controller for market data endpoints.
 """
 from flask import Blueprint, request, jsonify
-from typing import Dict, Any
+from typing import Any, Dict, Optional, Tuple
 import logging
 
-from ...application.services.market_data_service import MarketDataService
-from ...application.dtos.data_dtos import MarketDataDownloadRequestDto
+from ...application.dtos.data_dtos import MarketDataDownloadRequestDto, BulkMarketDataDownloadRequestDto
+from ...infrastructure.cache.snapshot_cache import SnapshotNotFoundError
+from ...infrastructure.config.app_config import AppConfig
+from ...infrastructure.service_container import get_service_container
+from ..serializers.ndjson import is_stream_requested, ndjson_response
+from ..serializers.options import get_request_option
+from ..serializers.columnar import ROWS_FORMAT, SUPPORTED_FORMATS, apply_response_format
+from ..serializers.excel import EXCEL_ENCODING, JSON_ENCODING, SUPPORTED_ENCODINGS, apply_value_encoding
+from ..serializers.wide import LONG_LAYOUT, WIDE_LAYOUT, group_records, to_wide, validate_layout
+from ..serializers.arrow import export_response, is_export_available, resolve_export_format
 
 logger = logging.getLogger(__name__)
 
 market_data_bp = Blueprint('market_data', __name__, url_prefix='/api/market-data')
 
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 200
+
 
 @market_data_bp.route('/securities', methods=['GET'])
 def get_securities():
     """Get securities for dropdown menu."""
     try:
-        service = MarketDataService()
+        service = get_service_container().market_data_service()
         securities = service.get_securities()
         
         # Convert to simple list for frontend dropdown
@@ -36,19 +47,62 @@ def get_securities():
         }), 500
 
 
+@market_data_bp.route('/securities/search', methods=['GET'])
+def search_securities():
+    """Typeahead search for securities."""
+    try:
+        query = request.args.get('q', '')
+        try:
+            limit = int(request.args.get('limit', DEFAULT_SEARCH_LIMIT))
+        except ValueError:
+            return jsonify({
+                'success': False,
+                'error': 'limit must be an integer'
+            }), 400
+        
+        if limit < 1 or limit > MAX_SEARCH_LIMIT:
+            return jsonify({
+                'success': False,
+                'error': f'limit must be between 1 and {MAX_SEARCH_LIMIT}'
+            }), 400
+        
+        service = get_service_container().market_data_service()
+        securities = service.search_securities(query, limit)
+        
+        return jsonify({
+            'success': True,
+            'data': [security.security for security in securities]
+        })
+        
+    except Exception as e:
+        logger.error(f"Error searching securities: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
 @market_data_bp.route('/fields/<string:security>', methods=['GET'])
 def get_fields(security: str):
     """Get fields for a specific security."""
     try:
-        service = MarketDataService()
+        service = get_service_container().market_data_service()
         fields = service.get_fields_by_security(security)
         
         # Convert to simple list for frontend dropdown
         field_list = [field.field for field in fields]
         
+        # Date coverage per field lets the add-in clamp its date pickers
+        coverage = {
+            field.field: {'min_date': field.min_date, 'max_date': field.max_date}
+            for field in fields
+            if field.min_date is not None or field.max_date is not None
+        }
+        
         return jsonify({
             'success': True,
-            'data': field_list
+            'data': field_list,
+            'coverage': coverage
         })
         
     except Exception as e:
@@ -71,55 +125,106 @@ def download_market_data():
                 'error': 'No data provided'
             }), 400
         
-        # Validate required fields
-        required_fields = ['security', 'field', 'start_date', 'end_date']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'success': False,
-                    'error': f'Missing required field: {field}'
-                }), 400
+        request_dto, error = _build_request_dto(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
         
-        # Create request DTO
-        request_dto = MarketDataDownloadRequestDto(
-            security=data['security'],
-            field=data['field'],
-            start_date=data['start_date'],
-            end_date=data['end_date']
+        layout = get_request_option(data, 'layout', LONG_LAYOUT)
+        layout_error = validate_layout(
+            layout, get_request_option(data, 'format', ROWS_FORMAT),
+            batched=data.get('batch_id') is not None, streamed=is_stream_requested(data)
         )
+        if layout_error:
+            return jsonify({
+                'success': False,
+                'error': layout_error
+            }), 400
+        
+        encoding = get_request_option(data, 'encoding', JSON_ENCODING)
+        if encoding not in SUPPORTED_ENCODINGS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported encoding: {encoding}'
+            }), 400
+        if encoding == EXCEL_ENCODING and (
+            is_stream_requested(data) or data.get('batch_id') is not None
+            or get_request_option(data, 'format', ROWS_FORMAT) != ROWS_FORMAT
+        ):
+            return jsonify({
+                'success': False,
+                'error': 'encoding=excel is not supported for streamed, batched or columnar downloads'
+            }), 400
         
-        service = MarketDataService()
+        service = get_service_container().market_data_service()
+        
+        if is_stream_requested(data):
+            # Stream rows as newline-delimited JSON through a server-side cursor
+            return ndjson_response(service.stream_market_data(request_dto))
+        
+        response_format = get_request_option(data, 'format', ROWS_FORMAT)
+        if response_format not in SUPPORTED_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported format: {response_format}'
+            }), 400
         
         # Check if batching is requested
         batch_size = data.get('batch_size', 1000)
         batch_id = data.get('batch_id', None)
         
         if batch_id is not None:
-            # Return batched response
-            result = service.download_market_data_batched(request_dto, batch_size, batch_id)
-            return jsonify({
+            # Return batched response, served from a snapshot materialized on the first batch
+            try:
+                result = service.download_market_data_batched(
+                    request_dto, batch_size, batch_id, data.get('snapshot_id')
+                )
+            except SnapshotNotFoundError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 410
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            return jsonify(apply_response_format({
                 'success': True,
                 'batch_id': result.batch_id,
                 'total_batches': result.total_batches,
                 'has_more': result.has_more,
+                'snapshot_id': result.snapshot_id,
                 'data': result.data
-            })
+            }, response_format))
         else:
             # Return all data
-            records = service.download_market_data(request_dto)
+            # Excel serials are computed from native datetime values
+            records = service.download_market_data(request_dto, native_types=encoding == EXCEL_ENCODING)
             data_list = [record.data for record in records]
             
+            if layout == WIDE_LAYOUT:
+                # Pivot server-side into a date x security/field matrix
+                return jsonify(apply_value_encoding({
+                    'success': True,
+                    'count': len(data_list),
+                    **to_wide(group_records(data_list))
+                }, encoding))
+            
             # Get column names from first record to preserve order
             columns = []
             if data_list:
                 columns = list(data_list[0].keys())
             
-            return jsonify({
+            return jsonify(apply_value_encoding(apply_response_format({
                 'success': True,
                 'count': len(data_list),
                 'columns': columns,  # Preserve column order from database
                 'data': data_list
-            })
+            }, response_format), encoding))
     
     except Exception as e:
         logger.error(f"Error downloading market data: {e}")
@@ -129,6 +234,178 @@ def download_market_data():
         }), 500
 
 
+@market_data_bp.route('/download/bulk', methods=['POST'])
+def download_bulk_market_data():
+    """Download market data for lists of securities and fields in a single query."""
+    try:
+        data = request.get_json()
+        
+        if not data:
+            return jsonify({
+                'success': False,
+                'error': 'No data provided'
+            }), 400
+        
+        request_dto, error = _build_bulk_request_dto(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        layout = get_request_option(data, 'layout', LONG_LAYOUT)
+        layout_error = validate_layout(layout)
+        if layout_error:
+            return jsonify({
+                'success': False,
+                'error': layout_error
+            }), 400
+        
+        encoding = get_request_option(data, 'encoding', JSON_ENCODING)
+        if encoding not in SUPPORTED_ENCODINGS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported encoding: {encoding}'
+            }), 400
+        if encoding == EXCEL_ENCODING and layout != WIDE_LAYOUT:
+            return jsonify({
+                'success': False,
+                'error': 'encoding=excel requires layout=wide for bulk downloads'
+            }), 400
+        
+        service = get_service_container().market_data_service()
+        series = service.download_bulk_market_data(request_dto, native_types=encoding == EXCEL_ENCODING)
+        
+        if layout == WIDE_LAYOUT:
+            # One column per requested pair, in request order, aligned on the union of dates
+            return jsonify(apply_value_encoding({
+                'success': True,
+                'count': sum(len(item.data) for item in series),
+                **to_wide(((item.security, item.field), item.data) for item in series)
+            }, encoding))
+        
+        return jsonify({
+            'success': True,
+            'count': sum(len(item.data) for item in series),
+            'series': [
+                {
+                    'security': item.security,
+                    'field': item.field,
+                    'count': len(item.data),
+                    'data': item.data
+                }
+                for item in series
+            ]
+        })
+    
+    except Exception as e:
+        logger.error(f"Error downloading bulk market data: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+@market_data_bp.route('/export', methods=['GET', 'POST'])
+def export_market_data():
+    """
+    Export market data as an Apache Arrow IPC stream or Parquet file.
+    Filters are read from the JSON body (POST) or the query string (GET); the format is
+    chosen by the `format` parameter or the Accept header.
+    """
+    try:
+        if not is_export_available():
+            return jsonify({
+                'success': False,
+                'error': 'Arrow export is not available, pyarrow is not installed'
+            }), 501
+        
+        data = request.get_json(silent=True) or request.args.to_dict()
+        
+        request_dto, error = _build_request_dto(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        export_format = resolve_export_format(data)
+        if not export_format:
+            return jsonify({
+                'success': False,
+                'error': 'Unsupported export format, use arrow or parquet'
+            }), 406
+        
+        service = get_service_container().market_data_service()
+        filename = f"{request_dto.security}_{request_dto.field}".replace(' ', '_')
+        return export_response(
+            service.stream_market_data(request_dto, native_types=True), export_format, filename
+        )
+    
+    except Exception as e:
+        logger.error(f"Error exporting market data: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _build_request_dto(data: Dict[str, Any]) -> Tuple[Optional[MarketDataDownloadRequestDto], Optional[str]]:
+    """
+    Validate download parameters and build the request DTO.
+    
+    Returns:
+        Tuple of (request DTO, error message), exactly one of which is set
+    """
+    # Validate required fields
+    required_fields = ['security', 'field', 'start_date', 'end_date']
+    for field in required_fields:
+        if field not in data:
+            return None, f'Missing required field: {field}'
+    
+    # Create request DTO
+    request_dto = MarketDataDownloadRequestDto(
+        security=data['security'],
+        field=data['field'],
+        start_date=data['start_date'],
+        end_date=data['end_date']
+    )
+    return request_dto, None
+
+
+def _build_bulk_request_dto(data: Dict[str, Any]) -> Tuple[Optional[BulkMarketDataDownloadRequestDto], Optional[str]]:
+    """
+    Validate bulk download parameters and build the request DTO.
+    Duplicate securities and fields are dropped, keeping the first occurrence.
+    
+    Returns:
+        Tuple of (request DTO, error message), exactly one of which is set
+    """
+    required_fields = ['securities', 'fields', 'start_date', 'end_date']
+    for field in required_fields:
+        if field not in data:
+            return None, f'Missing required field: {field}'
+    
+    lists = {}
+    for name in ('securities', 'fields'):
+        values = data[name]
+        if not isinstance(values, list) or not values or not all(isinstance(v, str) and v for v in values):
+            return None, f'{name} must be a non-empty list of strings'
+        lists[name] = list(dict.fromkeys(values))
+    
+    item_count = len(lists['securities']) + len(lists['fields'])
+    if item_count > AppConfig.MARKET_DATA_BULK_MAX_ITEMS:
+        return None, f'Too many securities and fields: {item_count} (maximum {AppConfig.MARKET_DATA_BULK_MAX_ITEMS})'
+    
+    request_dto = BulkMarketDataDownloadRequestDto(
+        securities=lists['securities'],
+        fields=lists['fields'],
+        start_date=data['start_date'],
+        end_date=data['end_date']
+    )
+    return request_dto, None
+
+
 @market_data_bp.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
@@ -2,23 +2,31 @@
 Flask controller for raw data endpoints.
 """
 from flask import Blueprint, request, jsonify
-from typing import Dict, Any
+from typing import Any, Dict, Optional, Tuple
 import logging
 
-from ...application.services.raw_data_service import RawDataService
 from ...application.dtos.data_dtos import RawDataDownloadRequestDto
 from ...infrastructure.config.fund_mappings import has_fund_filtering
+from ...infrastructure.service_container import get_service_container
+from ..serializers.ndjson import is_stream_requested, ndjson_response
+from ..serializers.options import get_request_option
+from ..serializers.columnar import ROWS_FORMAT, SUPPORTED_FORMATS, apply_response_format
+from ..serializers.excel import EXCEL_ENCODING, JSON_ENCODING, SUPPORTED_ENCODINGS, apply_value_encoding
+from ..serializers.arrow import export_response, is_export_available, resolve_export_format
 
 logger = logging.getLogger(__name__)
 
 raw_data_bp = Blueprint('raw_data', __name__, url_prefix='/api/raw-data')
 
+# Supported representations of date and datetime values in downloads
+DATE_FORMATS = ('iso', 'epoch')
+
 
 @raw_data_bp.route('/categories', methods=['GET'])
 def get_categories():
     """Get file categories for dropdown menu."""
     try:
-        service = RawDataService()
+        service = get_service_container().raw_data_service()
         categories = service.get_file_categories()
         
         # Convert to simple list for frontend dropdown
@@ -49,16 +57,14 @@ def get_funds(catalog: str):
                 'fund_filtering_available': False
             })
         
-        service = RawDataService()
-        funds = service.get_funds_by_catalog(catalog)
-        
-        # Convert to simple list for frontend dropdown
-        fund_list = [fund.fund for fund in funds]
+        service = get_service_container().raw_data_service()
+        fund_list = service.get_fund_list(catalog)
         
         return jsonify({
             'success': True,
-            'data': fund_list,
-            'fund_filtering_available': True
+            'data': fund_list.funds,
+            'fund_filtering_available': True,
+            'refreshed_at': fund_list.refreshed_at
         })
         
     except Exception as e:
@@ -81,47 +87,88 @@ def download_raw_data():
                 'error': 'No data provided'
             }), 400
         
-        # Check required fields
-        required_fields = ['catalog', 'start_date', 'end_date']
-        for field in required_fields:
-            if field not in data:
+        request_dto, error = _build_request_dto(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        encoding = get_request_option(data, 'encoding', JSON_ENCODING)
+        if encoding not in SUPPORTED_ENCODINGS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported encoding: {encoding}'
+            }), 400
+        
+        service = get_service_container().raw_data_service()
+        
+        if is_stream_requested(data):
+            if encoding == EXCEL_ENCODING:
                 return jsonify({
                     'success': False,
-                    'error': f'Missing required field: {field}'
+                    'error': 'encoding=excel is not supported for streamed downloads'
                 }), 400
+            # Stream rows as newline-delimited JSON through a server-side cursor
+            return ndjson_response(service.stream_raw_data(request_dto))
         
-        # Check if fund is required for this catalog
-        if has_fund_filtering(data['catalog']):
-            if 'fund' not in data or not data['fund']:
+        response_format = get_request_option(data, 'format', ROWS_FORMAT)
+        if response_format not in SUPPORTED_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported format: {response_format}'
+            }), 400
+        
+        if encoding == EXCEL_ENCODING:
+            if response_format != ROWS_FORMAT:
                 return jsonify({
                     'success': False,
-                    'error': 'Fund is required for this catalog'
+                    'error': f'encoding=excel cannot be combined with format={response_format}'
                 }), 400
-        
-        # Create request DTO - use empty string for fund if not available
-        request_dto = RawDataDownloadRequestDto(
-            catalog=data['catalog'],
-            fund=data.get('fund', ''),
-            start_date=data['start_date'],
-            end_date=data['end_date']
-        )
-        
-        service = RawDataService()
+            # Excel serials are computed from the native datetime and Decimal values
+            request_dto.native_types = True
         
         # Check if batching is requested
         batch_size = data.get('batch_size', 1000)
         batch_id = data.get('batch_id', None)
+        continuation_token = data.get('continuation_token')
         
-        if batch_id is not None:
+        if data.get('pagination') == 'keyset' or continuation_token:
+            if type(batch_size) is not int or batch_size <= 0:
+                return jsonify({
+                    'success': False,
+                    'error': 'batch_size must be a positive integer'
+                }), 400
+            
+            # Return a keyset page, each page runs a single bounded query
+            try:
+                page = service.download_raw_data_page(request_dto, batch_size, continuation_token)
+            except ValueError as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 400
+            
+            return jsonify(apply_value_encoding(apply_response_format({
+                'success': True,
+                'count': len(page.data),
+                'columns': list(page.data[0].keys()) if page.data else [],
+                'has_more': page.has_more,
+                'continuation_token': page.continuation_token,
+                'total_records': page.total_records,
+                'total_batches': page.total_batches,
+                'data': page.data
+            }, response_format), encoding))
+        elif batch_id is not None:
             # Return batched response
             result = service.download_raw_data_batched(request_dto, batch_size, batch_id)
-            return jsonify({
+            return jsonify(apply_value_encoding(apply_response_format({
                 'success': True,
                 'batch_id': result.batch_id,
                 'total_batches': result.total_batches,
                 'has_more': result.has_more,
                 'data': result.data
-            })
+            }, response_format), encoding))
         else:
             # Return all data
             records = service.download_raw_data(request_dto)
@@ -132,12 +179,19 @@ def download_raw_data():
             if data_list:
                 columns = list(data_list[0].keys())
             
-            return jsonify({
+            return jsonify(apply_value_encoding(apply_response_format({
                 'success': True,
                 'count': len(data_list),
                 'columns': columns,  # Preserve column order from database
                 'data': data_list
-            })
+            }, response_format), encoding))
+    
+    except ValueError as e:
+        # Unknown catalog or columns, or filter values not matching the column type
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
     
     except Exception as e:
         logger.error(f"Error downloading raw data: {e}")
@@ -147,6 +201,131 @@ def download_raw_data():
         }), 500
 
 
+@raw_data_bp.route('/export', methods=['GET', 'POST'])
+def export_raw_data():
+    """
+    Export raw data as an Apache Arrow IPC stream or Parquet file.
+    Filters are read from the JSON body (POST) or the query string (GET); the format is
+    chosen by the `format` parameter or the Accept header.
+    """
+    try:
+        if not is_export_available():
+            return jsonify({
+                'success': False,
+                'error': 'Arrow export is not available, pyarrow is not installed'
+            }), 501
+        
+        data = request.get_json(silent=True) or request.args.to_dict()
+        
+        request_dto, error = _build_request_dto(data)
+        if error:
+            return jsonify({
+                'success': False,
+                'error': error
+            }), 400
+        
+        export_format = resolve_export_format(data)
+        if not export_format:
+            return jsonify({
+                'success': False,
+                'error': 'Unsupported export format, use arrow or parquet'
+            }), 406
+        
+        service = get_service_container().raw_data_service()
+        return export_response(
+            service.stream_raw_data(request_dto, native_types=True), export_format, request_dto.catalog
+        )
+    
+    except ValueError as e:
+        # Unknown catalog or columns, or filter values not matching the column type
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 400
+    
+    except Exception as e:
+        logger.error(f"Error exporting raw data: {e}")
+        return jsonify({
+            'success': False,
+            'error': str(e)
+        }), 500
+
+
+def _build_request_dto(data: Dict[str, Any]) -> Tuple[Optional[RawDataDownloadRequestDto], Optional[str]]:
+    """
+    Validate download parameters and build the request DTO.
+    
+    Returns:
+        Tuple of (request DTO, error message), exactly one of which is set
+    """
+    # Check required fields
+    required_fields = ['catalog', 'start_date', 'end_date']
+    for field in required_fields:
+        if field not in data:
+            return None, f'Missing required field: {field}'
+    
+    # Check if fund is required for this catalog
+    if has_fund_filtering(data['catalog']):
+        if 'fund' not in data or not data['fund']:
+            return None, 'Fund is required for this catalog'
+    
+    # Optional column projection, given as a list or a comma-separated string (query string)
+    columns = data.get('columns')
+    if isinstance(columns, str):
+        columns = [column.strip() for column in columns.split(',') if column.strip()]
+    if columns is not None and (not isinstance(columns, list) or not all(isinstance(c, str) for c in columns)):
+        return None, 'columns must be a list of column names'
+    
+    filters = data.get('filters')
+    if filters is not None:
+        if not isinstance(filters, list) or not all(isinstance(f, dict) for f in filters):
+            return None, 'filters must be a list of objects'
+        for row_filter in filters:
+            if 'column' not in row_filter or 'op' not in row_filter:
+                return None, 'Each filter needs a column and an op'
+            if 'values' in row_filter and not isinstance(row_filter['values'], list):
+                return None, f"Filter values for column {row_filter['column']} must be a list"
+    
+    order_by = data.get('order_by')
+    if order_by is not None:
+        if not isinstance(order_by, list):
+            return None, 'order_by must be a list'
+        # Plain column names sort ascending
+        order_by = [{'column': item} if isinstance(item, str) else item for item in order_by]
+        for item in order_by:
+            if not isinstance(item, dict) or 'column' not in item:
+                return None, 'Each order_by entry needs a column'
+            if str(item.get('direction', 'asc')).lower() not in ('asc', 'desc'):
+                return None, 'order_by direction must be asc or desc'
+    
+    limit = data.get('limit')
+    if limit is not None:
+        try:
+            limit = int(limit)
+        except (TypeError, ValueError):
+            limit = 0
+        if limit <= 0:
+            return None, 'limit must be a positive integer'
+    
+    date_format = data.get('date_format', 'iso')
+    if date_format not in DATE_FORMATS:
+        return None, f"date_format must be one of: {', '.join(DATE_FORMATS)}"
+    
+    # Create request DTO - use empty string for fund if not available
+    request_dto = RawDataDownloadRequestDto(
+        catalog=data['catalog'],
+        fund=data.get('fund', ''),
+        start_date=data['start_date'],
+        end_date=data['end_date'],
+        columns=columns,
+        filters=filters,
+        order_by=order_by,
+        limit=limit,
+        date_format=date_format
+    )
+    return request_dto, None
+
+
 @raw_data_bp.errorhandler(404)
 def not_found(error):
     """Handle 404 errors."""
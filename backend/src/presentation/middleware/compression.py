@@ -0,0 +1,186 @@
+"""
+Response compression middleware.
+
+Negotiates the content encoding through the Accept-Encoding header and compresses
+eligible responses. Streaming responses are compressed chunk by chunk, flushing after
+every chunk so the client keeps receiving data as it is produced.
+
+gzip and deflate are always available; brotli (`br`) and zstd are used when the optional
+`brotli` / `zstandard` packages are installed.
+"""
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+import logging
+import zlib
+
+from flask import Flask, Response, request
+
+from ...infrastructure.config.app_config import AppConfig
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Mimetypes worth compressing; binary formats like Parquet are already compressed
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'application/xml',
+    'application/vnd.apache.arrow.stream',
+}
+
+
+class _ZlibCompressor:
+    """Incremental gzip/deflate compressor."""
+    
+    def __init__(self, level: int, wbits: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliCompressor:
+    """Incremental brotli compressor."""
+    
+    def __init__(self, level: int):
+        self._compressor = brotli.Compressor(quality=min(max(level, 0), 11))
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+    
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdCompressor:
+    """Incremental zstd compressor."""
+    
+    def __init__(self, level: int):
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+    
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+    
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+def _available_compressors() -> Dict[str, Callable[[int], object]]:
+    """Map content encodings to compressor factories for the installed libraries."""
+    compressors = {
+        'gzip': lambda level: _ZlibCompressor(level, 16 + zlib.MAX_WBITS),
+        'deflate': lambda level: _ZlibCompressor(level, zlib.MAX_WBITS),
+    }
+    if brotli is not None:
+        compressors['br'] = _BrotliCompressor
+    if zstandard is not None:
+        compressors['zstd'] = _ZstdCompressor
+    return compressors
+
+
+class CompressionMiddleware:
+    """Flask extension compressing responses according to Accept-Encoding."""
+    
+    def __init__(self, app: Flask = None, algorithms: List[str] = None,
+                 min_size: int = None, level: int = None):
+        """
+        Args:
+            app: Flask application to register with
+            algorithms: Content encodings in server preference order
+            min_size: Minimum body size in bytes for non-streaming responses to be compressed
+            level: Compression level passed to the compressor
+        """
+        compressors = _available_compressors()
+        algorithms = algorithms or AppConfig.COMPRESSION_ALGORITHMS
+        self._algorithms = [name for name in algorithms if name in compressors]
+        self._compressors = compressors
+        self._min_size = AppConfig.COMPRESSION_MIN_SIZE if min_size is None else min_size
+        self._level = AppConfig.COMPRESSION_LEVEL if level is None else level
+        
+        if app is not None:
+            self.init_app(app)
+    
+    def init_app(self, app: Flask) -> None:
+        """Register the compression hook on the application."""
+        app.after_request(self._after_request)
+        app.extensions['compression'] = self
+        logger.info(f"Response compression enabled: {', '.join(self._algorithms)} "
+                    f"(min size {self._min_size} bytes, level {self._level})")
+    
+    def negotiate(self, accept_encodings) -> Optional[str]:
+        """Pick the preferred supported encoding acceptable to the client."""
+        for name in self._algorithms:
+            if accept_encodings.quality(name) > 0:
+                return name
+        return None
+    
+    def _after_request(self, response: Response) -> Response:
+        if not self._is_compressible(response):
+            return response
+        
+        encoding = self.negotiate(request.accept_encodings)
+        response.vary.add('Accept-Encoding')
+        if encoding is None:
+            return response
+        
+        compressor = self._compressors[encoding](self._level)
+        
+        if response.is_streamed:
+            response.response = self._compress_stream(response.iter_encoded(), response.response, compressor)
+            response.headers.pop('Content-Length', None)
+        else:
+            body = response.get_data()
+            if len(body) < self._min_size:
+                return response
+            response.set_data(compressor.compress(body) + compressor.finish())
+        
+        response.direct_passthrough = False
+        response.headers['Content-Encoding'] = encoding
+        return response
+    
+    @staticmethod
+    def _compress_stream(chunks: Iterator[bytes], source: Iterable, compressor) -> Iterator[bytes]:
+        """Compress a streamed body chunk by chunk, flushing after every chunk."""
+        try:
+            for chunk in chunks:
+                data = compressor.compress(chunk) + compressor.flush()
+                if data:
+                    yield data
+            yield compressor.finish()
+        finally:
+            if hasattr(source, 'close'):
+                source.close()
+    
+    @staticmethod
+    def _is_compressible(response: Response) -> bool:
+        if request.method == 'HEAD':
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers:
+            return False
+        if 'no-transform' in response.headers.get('Cache-Control', ''):
+            return False
+        mimetype = response.mimetype or ''
+        return mimetype.startswith('text/') or mimetype in COMPRESSIBLE_MIMETYPES
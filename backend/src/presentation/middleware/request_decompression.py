@@ -0,0 +1,198 @@
+"""
+Request body decompression middleware.
+
+Decodes request bodies sent with a Content-Encoding header (gzip and deflate, plus zstd
+when the optional `zstandard` package is installed) as a stream: the WSGI input is
+replaced by a reader that decompresses while the application reads it, so the body
+is never held in memory in both forms. The decompressed size is limited to guard
+against decompression bombs. Only upload endpoints, which handle the resulting 400 and
+413 errors, accept compressed bodies; other endpoints answer them with 415.
+"""
+from typing import Callable, Dict, Iterable, List, Sequence
+import abc
+import io
+import json
+import logging
+import zlib
+
+from flask import Flask
+from werkzeug.exceptions import BadRequest, RequestEntityTooLarge
+
+from ...infrastructure.config.app_config import AppConfig
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+# Compressed bytes read from the client per step
+READ_SIZE = 64 * 1024
+
+# Paths of the endpoints accepting compressed request bodies
+DECOMPRESSED_PATH_PREFIXES = ('/api/data-upload/',)
+
+
+class _DecompressingReader(io.RawIOBase):
+    """Readable stream decompressing a WSGI input, raising once limit decompressed bytes are exceeded."""
+    
+    def __init__(self, source, encoding: str, limit: int):
+        self._source = source
+        self._encoding = encoding
+        self._limit = limit
+        self._total = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, buffer) -> int:
+        try:
+            data = self._decompress(len(buffer))
+        except (zlib.error, EOFError) as e:
+            raise BadRequest(f'Invalid {self._encoding} request body: {e}')
+        except Exception as e:
+            if zstandard is not None and isinstance(e, zstandard.ZstdError):
+                raise BadRequest(f'Invalid {self._encoding} request body: {e}')
+            raise
+        
+        self._total += len(data)
+        if self._total > self._limit:
+            logger.warning(f"Rejected {self._encoding} request body exceeding {self._limit} bytes decompressed")
+            raise RequestEntityTooLarge(f'Decompressed request body exceeds {self._limit} bytes')
+        
+        buffer[:len(data)] = data
+        return len(data)
+    
+    @abc.abstractmethod
+    def _decompress(self, size: int) -> bytes:
+        """Return up to size decompressed bytes, or b'' at the end of the body."""
+
+
+class _ZlibReader(_DecompressingReader):
+    """Streaming gzip/deflate decoder."""
+    
+    def __init__(self, source, encoding: str, limit: int, wbits: int):
+        super().__init__(source, encoding, limit)
+        self._decompressor = zlib.decompressobj(wbits)
+        self._pending = b''  # Compressed input not yet fed to the decompressor
+    
+    def _decompress(self, size: int) -> bytes:
+        while not self._decompressor.eof:
+            if not self._pending:
+                self._pending = self._source.read(READ_SIZE)
+                if not self._pending:
+                    raise EOFError('compressed stream ended unexpectedly')
+            
+            data = self._decompressor.decompress(self._pending, size)
+            self._pending = self._decompressor.unconsumed_tail
+            if data:
+                return data
+        return b''
+
+
+class _ZstdReader(_DecompressingReader):
+    """Streaming zstd decoder."""
+    
+    def __init__(self, source, encoding: str, limit: int):
+        super().__init__(source, encoding, limit)
+        self._reader = zstandard.ZstdDecompressor().stream_reader(source, read_size=READ_SIZE)
+    
+    def _decompress(self, size: int) -> bytes:
+        return self._reader.read(size)
+
+
+class _LengthLimitedInput:
+    """Reads at most length bytes from a WSGI input."""
+    
+    def __init__(self, source, length: int):
+        self._source = source
+        self._remaining = length
+    
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b''
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._source.read(size)
+        self._remaining -= len(data)
+        return data
+
+
+def _available_decoders() -> Dict[str, Callable[[object, int], _DecompressingReader]]:
+    """Map content encodings to stream decoders for the installed libraries."""
+    decoders = {
+        'gzip': lambda source, limit: _ZlibReader(source, 'gzip', limit, 16 + zlib.MAX_WBITS),
+        'deflate': lambda source, limit: _ZlibReader(source, 'deflate', limit, zlib.MAX_WBITS),
+    }
+    if zstandard is not None:
+        decoders['zstd'] = lambda source, limit: _ZstdReader(source, 'zstd', limit)
+    return decoders
+
+
+class RequestDecompressionMiddleware:
+    """WSGI middleware decoding compressed request bodies according to Content-Encoding."""
+    
+    def __init__(self, app: Flask = None, max_size: int = None,
+                 path_prefixes: Sequence[str] = DECOMPRESSED_PATH_PREFIXES):
+        """
+        Args:
+            app: Flask application to register with
+            max_size: Maximum decompressed body size in bytes
+            path_prefixes: Paths of the endpoints accepting compressed bodies
+        """
+        self._decoders = _available_decoders()
+        self._max_size = AppConfig.REQUEST_MAX_DECOMPRESSED_BYTES if max_size is None else max_size
+        self._path_prefixes = tuple(path_prefixes)
+        self._wsgi_app = None
+        
+        if app is not None:
+            self.init_app(app)
+    
+    @property
+    def encodings(self) -> List[str]:
+        """Content encodings accepted on request bodies."""
+        return list(self._decoders)
+    
+    def init_app(self, app: Flask) -> None:
+        """Wrap the application's WSGI callable."""
+        self._wsgi_app = app.wsgi_app
+        app.wsgi_app = self
+        app.extensions['request_decompression'] = self
+        logger.info(f"Request decompression enabled: {', '.join(self._decoders)} "
+                    f"(max {self._max_size} bytes decompressed)")
+    
+    def __call__(self, environ: dict, start_response) -> Iterable[bytes]:
+        encoding = environ.get('HTTP_CONTENT_ENCODING', '').strip().lower()
+        if not encoding or encoding == 'identity':
+            return self._wsgi_app(environ, start_response)
+        
+        if not environ.get('PATH_INFO', '').startswith(self._path_prefixes):
+            return self._unsupported(start_response, 'Compressed request bodies are only accepted by upload endpoints')
+        
+        decoder = self._decoders.get(encoding)
+        if decoder is None:
+            return self._unsupported(
+                start_response,
+                f"Unsupported Content-Encoding '{encoding}', supported: {', '.join(self._decoders)}"
+            )
+        
+        source = environ['wsgi.input']
+        content_length = environ.get('CONTENT_LENGTH')
+        if content_length and not environ.get('wsgi.input_terminated'):
+            # Bound the compressed read by the declared length, as the server may not
+            source = _LengthLimitedInput(source, int(content_length))
+        
+        environ['wsgi.input'] = io.BufferedReader(decoder(source, self._max_size), buffer_size=READ_SIZE)
+        environ['wsgi.input_terminated'] = True
+        environ.pop('CONTENT_LENGTH', None)
+        environ.pop('HTTP_CONTENT_ENCODING', None)
+        return self._wsgi_app(environ, start_response)
+    
+    @staticmethod
+    def _unsupported(start_response, error: str) -> List[bytes]:
+        body = json.dumps({'success': False, 'error': error}).encode()
+        start_response('415 Unsupported Media Type', [
+            ('Content-Type', 'application/json'), ('Content-Length', str(len(body)))
+        ])
+        return [body]
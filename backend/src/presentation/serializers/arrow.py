@@ -0,0 +1,209 @@
+"""
+Apache Arrow IPC stream and Parquet export responses.
+
+pyarrow is an optional dependency; install it with `poetry run pip install pyarrow`.
+Without it the export endpoints respond with 501.
+Rows are converted into Arrow record batches chunk by chunk while they are read from the
+database cursor and written to the response as they are produced.
+"""
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+from flask import Response, request, stream_with_context
+from werkzeug.utils import secure_filename
+
+from ...infrastructure.config.app_config import AppConfig
+from .options import get_request_option
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+    pq = None
+
+logger = logging.getLogger(__name__)
+
+ARROW_FORMAT = 'arrow'
+PARQUET_FORMAT = 'parquet'
+
+ARROW_STREAM_MIMETYPE = 'application/vnd.apache.arrow.stream'
+PARQUET_MIMETYPE = 'application/vnd.apache.parquet'
+
+EXPORT_MIMETYPES = {
+    ARROW_STREAM_MIMETYPE: ARROW_FORMAT,
+    PARQUET_MIMETYPE: PARQUET_FORMAT,
+    'application/x-parquet': PARQUET_FORMAT,
+}
+
+FILE_EXTENSIONS = {
+    ARROW_FORMAT: 'arrows',
+    PARQUET_FORMAT: 'parquet',
+}
+
+
+def is_export_available() -> bool:
+    """Check whether the optional pyarrow dependency is installed."""
+    return pa is not None
+
+
+def resolve_export_format(data: Optional[Dict[str, Any]] = None) -> Optional[str]:
+    """
+    Resolve the export format from the `format` option or the Accept header.
+    Defaults to the Arrow IPC stream format.
+    
+    Returns:
+        'arrow', 'parquet', or None if the requested format is not supported
+    """
+    requested = get_request_option(data, 'format')
+    if requested:
+        requested = str(requested).lower()
+        return requested if requested in FILE_EXTENSIONS else None
+    
+    best_match = request.accept_mimetypes.best_match(list(EXPORT_MIMETYPES))
+    if best_match:
+        return EXPORT_MIMETYPES[best_match]
+    return ARROW_FORMAT
+
+
+class _ChunkSink:
+    """Write-only file object collecting written bytes until drained, tracking the absolute position."""
+    
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+        self.closed = False
+    
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        self.closed = True
+    
+    def writable(self) -> bool:
+        return True
+    
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _infer_schema(rows: List[Dict[str, Any]]) -> 'pa.Schema':
+    """
+    Infer the export schema from the first chunk, widened so later chunks can be cast to it:
+    all-null columns are exported as strings and decimals with the maximum precision.
+    """
+    schema = pa.RecordBatch.from_pylist(rows).schema
+    for index, schema_field in enumerate(schema):
+        if pa.types.is_null(schema_field.type):
+            schema = schema.set(index, pa.field(schema_field.name, pa.string()))
+        elif pa.types.is_decimal(schema_field.type):
+            # The inferred precision only covers the digits of the first chunk's values
+            schema = schema.set(index, pa.field(schema_field.name, pa.decimal128(38, schema_field.type.scale)))
+    return schema
+
+
+def _to_array(values: List[Any], schema_field: 'pa.Field') -> 'pa.Array':
+    """
+    Build a column array of the schema type from the types inferred for the chunk.
+    
+    Types that differ from the first chunk, e.g. ints in a float column or decimals of another
+    precision or scale, are cast; the cast is safe, so values that do not fit fail the export
+    instead of being truncated. Values of string columns are converted with str().
+    
+    Raises:
+        ValueError: If the values cannot be converted to the schema type without loss
+    """
+    if pa.types.is_string(schema_field.type):
+        try:
+            return pa.array(values, type=pa.string())
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            return pa.array([None if value is None else str(value) for value in values], type=pa.string())
+    try:
+        array = pa.array(values)
+        return array if array.type == schema_field.type else array.cast(schema_field.type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"Values of column {schema_field.name} do not fit its type {schema_field.type}: {e}") from e
+
+
+def _to_record_batch(rows: List[Dict[str, Any]], schema: 'pa.Schema') -> 'pa.RecordBatch':
+    """Build a record batch of the export schema, casting every column to its schema type."""
+    arrays = [_to_array([row.get(schema_field.name) for row in rows], schema_field) for schema_field in schema]
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _iter_chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def export_response(rows: Iterator[Dict[str, Any]], export_format: str, filename: str,
+                    batch_rows: int = None) -> Response:
+    """
+    Build a streaming Arrow IPC or Parquet response from an iterator of row dicts.
+    
+    The first chunk is read before the response is returned, so query errors
+    surface as regular error responses.
+    
+    Args:
+        rows: Iterator of row dictionaries, typically backed by a server-side cursor
+        export_format: 'arrow' or 'parquet'
+        filename: Download file name without extension, sanitized before it is sent
+        batch_rows: Rows per record batch (Parquet row group)
+    """
+    batch_rows = batch_rows or AppConfig.EXPORT_BATCH_ROWS
+    chunks = _iter_chunks(iter(rows), batch_rows)
+    first_chunk = next(chunks, [])
+    schema = _infer_schema(first_chunk) if first_chunk else pa.schema([])
+    
+    def generate():
+        sink = _ChunkSink()
+        if export_format == PARQUET_FORMAT:
+            writer = pq.ParquetWriter(sink, schema, compression=AppConfig.EXPORT_PARQUET_COMPRESSION)
+            write = writer.write_batch
+        else:
+            writer = pa.ipc.new_stream(sink, schema)
+            write = writer.write_batch
+        
+        row_count = 0
+        try:
+            if first_chunk:
+                write(_to_record_batch(first_chunk, schema))
+                row_count += len(first_chunk)
+                yield sink.drain()
+            for chunk in chunks:
+                write(_to_record_batch(chunk, schema))
+                row_count += len(chunk)
+                yield sink.drain()
+        except Exception as e:
+            # The status code is already sent; the truncated file will fail to read on the client
+            logger.error(f"Error while exporting rows after {row_count} rows: {e}")
+            raise
+        
+        writer.close()
+        yield sink.drain()
+        logger.info(f"Exported {row_count} rows as {export_format}")
+    
+    mimetype = PARQUET_MIMETYPE if export_format == PARQUET_FORMAT else ARROW_STREAM_MIMETYPE
+    response = Response(stream_with_context(generate()), mimetype=mimetype)
+    # The name is built from request parameters; keep it to a safe ASCII file name
+    filename = secure_filename(filename) or 'export'
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename="{filename}.{FILE_EXTENSIONS[export_format]}"'
+    )
+    response.headers['Vary'] = 'Accept'
+    return response
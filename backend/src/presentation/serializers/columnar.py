@@ -0,0 +1,97 @@
+"""
+Columnar, dictionary-encoded response format for downloads.
+
+Instead of a list of row dicts, the payload carries the column names once and one value
+array per column. Low-cardinality string columns (fund, currency, security, ...) are
+dictionary encoded: the column array holds integer codes into `dictionaries[column]`.
+
+Example:
+    {
+        "format": "columnar",
+        "columns": ["FUND", "AMOUNT"],
+        "data": [[0, 0, 1], [10.5, 3.2, 7.0]],
+        "dictionaries": {"FUND": ["FUND_A", "FUND_B"]}
+    }
+"""
+from typing import Any, Dict, List, Optional
+
+COLUMNAR_FORMAT = 'columnar'
+ROWS_FORMAT = 'rows'
+SUPPORTED_FORMATS = (ROWS_FORMAT, COLUMNAR_FORMAT)
+
+# A string column is dictionary encoded when its distinct values are at most this share of the rows
+MAX_DICTIONARY_RATIO = 0.5
+
+
+def _dictionary_encode(values: List[Any], max_distinct: int) -> Optional[tuple]:
+    """
+    Dictionary encode a column of strings.
+    
+    Returns:
+        Tuple of (codes, dictionary), or None if the column is not a
+        low-cardinality string column
+    """
+    dictionary: Dict[str, int] = {}
+    codes = []
+    for value in values:
+        if value is None:
+            codes.append(None)
+            continue
+        if not isinstance(value, str):
+            return None
+        code = dictionary.get(value)
+        if code is None:
+            if len(dictionary) >= max_distinct:
+                return None
+            code = len(dictionary)
+            dictionary[value] = code
+        codes.append(code)
+    
+    if not dictionary:
+        return None
+    return codes, list(dictionary)
+
+
+def to_columnar(rows: List[Dict[str, Any]], columns: Optional[List[str]] = None,
+                max_dictionary_ratio: float = MAX_DICTIONARY_RATIO) -> Dict[str, Any]:
+    """
+    Convert row dicts into the columnar response layout.
+    
+    Args:
+        rows: List of row dictionaries
+        columns: Column order, defaults to the key order of the first row
+        max_dictionary_ratio: Maximum distinct/rows ratio for dictionary encoding
+    
+    Returns:
+        Dict with `format`, `columns`, `data` (one array per column) and `dictionaries`
+    """
+    if columns is None:
+        columns = list(rows[0].keys()) if rows else []
+    
+    max_distinct = max(1, int(len(rows) * max_dictionary_ratio))
+    data = []
+    dictionaries = {}
+    
+    for column in columns:
+        values = [row.get(column) for row in rows]
+        encoded = _dictionary_encode(values, max_distinct)
+        if encoded is not None:
+            values, dictionaries[column] = encoded
+        data.append(values)
+    
+    return {
+        'format': COLUMNAR_FORMAT,
+        'columns': columns,
+        'data': data,
+        'dictionaries': dictionaries
+    }
+
+
+def apply_response_format(payload: Dict[str, Any], response_format: str) -> Dict[str, Any]:
+    """
+    Re-shape the `data` rows of a download response payload into the requested format.
+    Row format payloads are returned unchanged.
+    """
+    if response_format == COLUMNAR_FORMAT:
+        payload.update(to_columnar(payload['data'], payload.get('columns')))
+    return payload
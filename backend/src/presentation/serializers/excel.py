@@ -0,0 +1,151 @@
+"""
+Excel-ready value encoding for downloads.
+
+With `encoding=excel` the rows of a download response are replaced by a 2-D `values`
+matrix the add-in can assign to `range.values` as is, plus one number format per column
+for `range.numberFormat`. Values are converted column by column: datetimes and dates
+become Excel serial numbers, times fractions of a day, Decimals floats and NULLs empty
+strings.
+
+Example:
+    {
+        "encoding": "excel",
+        "columns": ["date", "value"],
+        "values": [[45322.0, 184.4], [45351.0, ""]],
+        "number_formats": ["yyyy-mm-dd", "General"]
+    }
+"""
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+JSON_ENCODING = 'json'
+EXCEL_ENCODING = 'excel'
+SUPPORTED_ENCODINGS = (JSON_ENCODING, EXCEL_ENCODING)
+
+# Day zero of the Excel 1900 date system, as used for serials from 1900-03-01 on
+EXCEL_EPOCH = datetime(1899, 12, 30)
+SECONDS_PER_DAY = 86400.0
+
+DATETIME_FORMAT = 'yyyy-mm-dd hh:mm:ss'
+DATE_FORMAT = 'yyyy-mm-dd'
+TIME_FORMAT = 'hh:mm:ss'
+NUMBER_FORMAT = 'General'
+TEXT_FORMAT = '@'
+
+
+def _datetime_serial(value: datetime) -> float:
+    # Excel has no time zones, keep the wall-clock time
+    return (value.replace(tzinfo=None) - EXCEL_EPOCH).total_seconds() / SECONDS_PER_DAY
+
+
+def _date_serial(value: date) -> float:
+    return float((value - EXCEL_EPOCH.date()).days)
+
+
+def _time_fraction(value: time) -> float:
+    return (value.hour * 3600 + value.minute * 60 + value.second + value.microsecond / 1e6) / SECONDS_PER_DAY
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, (bytes, bytearray)):
+        return '0x' + bytes(value).hex().upper()
+    return str(value)
+
+
+def _excel_value(value: Any) -> Any:
+    """Convert a single value of any type, for columns with mixed types."""
+    if value is None:
+        return ''
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return _datetime_serial(value)
+    if isinstance(value, date):
+        return _date_serial(value)
+    if isinstance(value, time):
+        return _time_fraction(value)
+    return _text(value)
+
+
+def _column_encoder(sample: Any) -> Tuple[Callable[[Any], Any], str]:
+    """Pick the converter and number format of a column from its first non-null value."""
+    if isinstance(sample, datetime):
+        return _datetime_serial, DATETIME_FORMAT
+    if isinstance(sample, date):
+        return _date_serial, DATE_FORMAT
+    if isinstance(sample, time):
+        return _time_fraction, TIME_FORMAT
+    if isinstance(sample, Decimal):
+        return float, NUMBER_FORMAT
+    if isinstance(sample, (bool, int, float)):
+        return None, NUMBER_FORMAT
+    return _text, TEXT_FORMAT
+
+
+def _encode_column(values: Sequence[Any]) -> Tuple[List[Any], str]:
+    """Convert one column of values and return it with its number format."""
+    sample = next((value for value in values if value is not None), None)
+    if sample is None:
+        return [''] * len(values), NUMBER_FORMAT
+    
+    convert, number_format = _column_encoder(sample)
+    if number_format == DATETIME_FORMAT and all(
+        value is None or (isinstance(value, datetime) and value.time() == time()) for value in values
+    ):
+        # Month-end and daily series are stored as midnight datetimes
+        number_format = DATE_FORMAT
+    try:
+        if convert is None:
+            return ['' if value is None else value for value in values], number_format
+        return ['' if value is None else convert(value) for value in values], number_format
+    except (TypeError, AttributeError, ValueError):
+        # The column mixes types, convert value by value
+        return [_excel_value(value) for value in values], NUMBER_FORMAT
+
+
+def to_excel_values(columns: Sequence[str], rows: Sequence[Sequence[Any]]) -> Dict[str, Any]:
+    """
+    Encode a row matrix for Excel.
+    
+    Args:
+        columns: Column names
+        rows: Row value lists in column order
+    
+    Returns:
+        Dict with `encoding`, `columns`, `values` and `number_formats`
+    """
+    encoded_columns = []
+    number_formats = []
+    for column_values in zip(*rows) if rows else [() for _ in columns]:
+        values, number_format = _encode_column(column_values)
+        encoded_columns.append(values)
+        number_formats.append(number_format)
+    
+    return {
+        'encoding': EXCEL_ENCODING,
+        'columns': list(columns),
+        'values': [list(row) for row in zip(*encoded_columns)] if rows else [],
+        'number_formats': number_formats
+    }
+
+
+def apply_value_encoding(payload: Dict[str, Any], encoding: str) -> Dict[str, Any]:
+    """
+    Re-encode the `data` rows of a download response payload for Excel.
+    Rows may be dicts or value lists in `columns` order; JSON encoded payloads are returned unchanged.
+    """
+    if encoding != EXCEL_ENCODING:
+        return payload
+    
+    rows = payload.pop('data')
+    columns = payload.get('columns')
+    if columns is None:
+        columns = list(rows[0].keys()) if rows and isinstance(rows[0], dict) else []
+    if rows and isinstance(rows[0], dict):
+        rows = [[row.get(column) for column in columns] for row in rows]
+    
+    payload.update(to_excel_values(columns, rows))
+    return payload
@@ -0,0 +1,129 @@
+"""
+Flask JSON provider backed by orjson.
+
+orjson encodes in native code and handles datetime, UUID, dataclasses and NumPy arrays
+itself. The provider keeps the output of Flask's default provider for the response
+shapes of this API: keys are sorted, datetimes and dates use the HTTP date format,
+Decimals are written as strings and dataclasses as dicts. Non-ASCII characters are
+written as UTF-8 instead of \\u escapes, which decodes to the same values. NaN and
+Infinity become null, where the stdlib writes NaN tokens that JSON.parse rejects.
+
+Calls with json.dumps options orjson does not reproduce, and values orjson cannot encode
+(e.g. integers beyond 64 bits), fall back to the stdlib encoder.
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Any
+import dataclasses
+import logging
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.http import http_date
+
+from ...infrastructure.config.app_config import AppConfig
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+ORJSON_PROVIDER = 'orjson'
+STDLIB_PROVIDER = 'stdlib'
+
+# json.dumps options whose effect orjson reproduces, for the values checked in _dumps_bytes
+_COMPATIBLE_OPTIONS = {'indent', 'separators', 'sort_keys', 'ensure_ascii', 'default'}
+# Separators orjson writes without and with indentation
+_COMPACT_SEPARATORS = (',', ':')
+_INDENT_SEPARATORS = (',', ': ')
+
+
+def _default(value: Any) -> Any:
+    """Serialize the types orjson leaves to the caller, matching Flask's default provider."""
+    if isinstance(value, date):
+        return http_date(value)
+    if isinstance(value, Decimal):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider encoding with orjson and decoding request bodies with orjson."""
+    
+    # orjson writes UTF-8; the stdlib fallback is configured to match
+    ensure_ascii = False
+    
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        """Serialize to a string, falling back to json.dumps for unsupported options."""
+        data = self._dumps_bytes(obj, kwargs)
+        if data is None:
+            return super().dumps(obj, **kwargs)
+        return data.decode('utf-8')
+    
+    def loads(self, s, **kwargs: Any) -> Any:
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+    
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        """Serialize the arguments as a JSON response, writing orjson's bytes directly."""
+        obj = self._prepare_response_obj(args, kwargs)
+        dump_args = {}
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            dump_args['indent'] = 2
+        else:
+            dump_args['separators'] = _COMPACT_SEPARATORS
+        
+        data = self._dumps_bytes(obj, dump_args)
+        if data is None:
+            return super().response(*args, **kwargs)
+        return self._app.response_class(data + b'\n', mimetype=self.mimetype)
+    
+    def _dumps_bytes(self, obj: Any, kwargs: dict):
+        """Encode with orjson, or return None if the options or values need the stdlib encoder."""
+        if set(kwargs) - _COMPATIBLE_OPTIONS or kwargs.get('ensure_ascii', self.ensure_ascii):
+            return None
+        indent = kwargs.get('indent')
+        separators = kwargs.get('separators')
+        separators = tuple(separators) if separators is not None else None
+        if indent is None:
+            # json.dumps defaults to ', ' and ': ', which orjson cannot write
+            if separators != _COMPACT_SEPARATORS:
+                return None
+        elif indent != 2 or separators not in (None, _INDENT_SEPARATORS):
+            return None
+        
+        option = (orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+                  | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+        if kwargs.get('sort_keys', self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        
+        try:
+            return orjson.dumps(obj, default=kwargs.get('default', _default), option=option)
+        except orjson.JSONEncodeError as e:
+            logger.debug(f"orjson cannot encode the value, using the stdlib encoder: {e}")
+            return None
+
+
+def configure_json_provider(app: Flask, provider: str = None) -> None:
+    """
+    Install the configured JSON provider on the application.
+    orjson is used when requested and installed, otherwise Flask's stdlib provider stays in place.
+    """
+    provider = provider or AppConfig.JSON_PROVIDER
+    if provider == ORJSON_PROVIDER:
+        if orjson is None:
+            logger.warning("JSON_PROVIDER is orjson but orjson is not installed, using the stdlib provider")
+            return
+        app.json = OrjsonProvider(app)
+        logger.info("Using orjson JSON provider")
+    elif provider != STDLIB_PROVIDER:
+        logger.warning(f"Unknown JSON_PROVIDER '{provider}', using the stdlib provider")
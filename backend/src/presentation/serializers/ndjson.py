@@ -0,0 +1,66 @@
+"""
+Newline-delimited JSON streaming responses.
+"""
+from itertools import chain
+from typing import Any, Dict, Iterator, Optional
+import logging
+
+from flask import Response, current_app, stream_with_context
+
+from ...infrastructure.config.app_config import AppConfig
+from .options import get_request_option, is_flag_set
+
+logger = logging.getLogger(__name__)
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def is_stream_requested(data: Optional[Dict[str, Any]] = None) -> bool:
+    """Check whether streaming was requested via the JSON body or the `stream` query parameter."""
+    return is_flag_set(get_request_option(data, 'stream', False))
+
+
+def ndjson_response(rows: Iterator[Dict[str, Any]], rows_per_chunk: int = None) -> Response:
+    """
+    Build a chunked streaming response with one JSON document per line.
+    
+    The first row is fetched before the response is returned, so query errors still
+    surface as regular error responses. Errors after streaming has started are reported
+    as a final `{"success": false, "error": ...}` line, since the status code is already sent.
+    
+    Args:
+        rows: Iterator of row dictionaries, typically backed by a server-side cursor
+        rows_per_chunk: Number of rows written per chunk
+    """
+    rows_per_chunk = rows_per_chunk or AppConfig.STREAM_ROWS_PER_CHUNK
+    rows = iter(rows)
+    
+    try:
+        first_row = next(rows)
+        rows = chain([first_row], rows)
+    except StopIteration:
+        rows = iter(())
+    
+    def generate():
+        json_provider = current_app.json
+        buffer = []
+        row_count = 0
+        try:
+            for row in rows:
+                # Keep the column order of the query instead of the provider's sorted keys
+                buffer.append(json_provider.dumps(row, separators=(',', ':'), sort_keys=False))
+                if len(buffer) >= rows_per_chunk:
+                    row_count += len(buffer)
+                    yield '\n'.join(buffer) + '\n'
+                    buffer = []
+            if buffer:
+                row_count += len(buffer)
+                yield '\n'.join(buffer) + '\n'
+            logger.info(f"Streamed {row_count} rows")
+        except Exception as e:
+            logger.error(f"Error while streaming rows after {row_count} rows: {e}")
+            yield json_provider.dumps({'success': False, 'error': str(e)}) + '\n'
+    
+    response = Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+    response.headers['X-Content-Type-Options'] = 'nosniff'
+    return response
@@ -0,0 +1,20 @@
+"""
+Helpers for reading response shaping options from download requests.
+"""
+from typing import Any, Dict, Optional
+
+from flask import request
+
+
+def get_request_option(data: Optional[Dict[str, Any]], name: str, default: Any = None) -> Any:
+    """Read an option from the JSON body, falling back to the query string."""
+    if data and data.get(name) is not None:
+        return data[name]
+    return request.args.get(name, default)
+
+
+def is_flag_set(value: Any) -> bool:
+    """Interpret a boolean option given as JSON boolean or query string."""
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('true', '1', 'yes')
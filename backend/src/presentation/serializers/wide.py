@@ -0,0 +1,88 @@
+"""
+Wide (pivoted) layout for market data downloads.
+
+Long-format records (security, field, date, value) are pivoted into a date x series
+matrix: one row per date, one column per (security, field) pair, with null where a
+series has no value for a date. The add-in can write the matrix to a range directly.
+
+Example:
+    {
+        "layout": "wide",
+        "columns": ["date", "AAPL US Equity|PX_LAST", "MSFT US Equity|PX_LAST"],
+        "series": [{"security": "AAPL US Equity", "field": "PX_LAST"}, ...],
+        "data": [["2024-01-31T00:00:00", 184.4, 397.58], ["2024-02-29T00:00:00", 180.75, null]]
+    }
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .columnar import ROWS_FORMAT
+
+LONG_LAYOUT = 'long'
+WIDE_LAYOUT = 'wide'
+SUPPORTED_LAYOUTS = (LONG_LAYOUT, WIDE_LAYOUT)
+
+# Separator between security and field in wide column names
+COLUMN_SEPARATOR = '|'
+
+SeriesKey = Tuple[str, str]
+
+
+def to_wide(series: Iterable[Tuple[SeriesKey, List[Dict[str, Any]]]]) -> Dict[str, Any]:
+    """
+    Pivot market data series into the wide layout.
+    
+    Args:
+        series: (security, field) keys with their date/value records, in column order
+    
+    Returns:
+        Dict with `layout`, `columns`, `series` and `data` (one row per date, ascending)
+    """
+    keys: List[SeriesKey] = []
+    values_by_key: List[Dict[Any, Any]] = []
+    all_dates = set()
+    
+    for key, records in series:
+        values = {record['date']: record['value'] for record in records}
+        keys.append(key)
+        values_by_key.append(values)
+        all_dates.update(values)
+    
+    # Dates within a response share one type (ISO strings or datetimes), so they sort chronologically
+    dates = sorted(all_dates)
+    data = [
+        [date_value] + [values.get(date_value) for values in values_by_key]
+        for date_value in dates
+    ]
+    
+    return {
+        'layout': WIDE_LAYOUT,
+        'columns': ['date'] + [f'{security}{COLUMN_SEPARATOR}{field}' for security, field in keys],
+        'series': [{'security': security, 'field': field} for security, field in keys],
+        'data': data
+    }
+
+
+def group_records(records: Iterable[Dict[str, Any]]) -> List[Tuple[SeriesKey, List[Dict[str, Any]]]]:
+    """Group long-format record dicts by (security, field), keeping first-seen order."""
+    groups: Dict[SeriesKey, List[Dict[str, Any]]] = {}
+    for record in records:
+        groups.setdefault((record['security'], record['field']), []).append(record)
+    return list(groups.items())
+
+
+def validate_layout(layout: Optional[str], response_format: Optional[str] = None,
+                    batched: bool = False, streamed: bool = False) -> Optional[str]:
+    """
+    Check the requested layout against the other response options.
+    
+    Returns:
+        Error message, or None if the combination is supported
+    """
+    if layout not in SUPPORTED_LAYOUTS:
+        return f'Unsupported layout: {layout}'
+    if layout == WIDE_LAYOUT:
+        if streamed or batched:
+            return 'layout=wide is not supported for streamed or batched downloads'
+        if response_format not in (None, ROWS_FORMAT):
+            return f'layout=wide cannot be combined with format={response_format}'
+    return None
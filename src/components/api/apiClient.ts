@@ -64,7 +64,10 @@ interface DataUploadParams {
   dataType: string;
   skipDuplicateCheck: boolean;
   deliveryDate?: string;
-  data: any[];
+  format?: 'records' | 'columnar';
+  data?: any[];       // Record objects (records format)
+  columns?: string[]; // Column names (columnar format)
+  rows?: any[][];     // One value array per row (columnar format)
 }
 
 // Raw Data Endpoints
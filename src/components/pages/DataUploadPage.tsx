@@ -1,6 +1,6 @@
 /* global Office, Excel */
 
-import React, { useState } from 'react';
+import React, { useState, useEffect } from 'react';
 import {
   Container,
   Typography,
@@ -20,7 +20,89 @@ import {
 } from '@mui/material';
 import { DatePicker } from '@mui/x-date-pickers/DatePicker';
 import dayjs, { Dayjs } from 'dayjs';
-import { uploadData } from '../api/apiClient';
+import { uploadData, getDataUploadTypes, getUploadStatus } from '../api/apiClient';
+
+interface UploadColumn {
+  name: string;
+  type: 'text' | 'number' | 'date';
+  required: boolean;
+}
+
+interface UploadType {
+  id: string;
+  name: string;
+  description: string;
+  columns: UploadColumn[];
+}
+
+interface UploadValidationError {
+  row: number | null; // Index of the data row, without the header row
+  column: string;
+  message: string;
+}
+
+interface UploadStatus {
+  upload_id: string;
+  status: 'queued' | 'sending' | 'done' | 'failed';
+  data_type: string;
+  record_count: number;
+  error: string | null;
+  duplicate_count: number | null; // Records already uploaded before, null when not checked
+  duplicate_rows: number[];       // Indexes of the first duplicate data rows
+  repeated_count: number | null;  // Rows repeating an earlier row of the upload, null when not checked
+  repeated_rows: number[];        // Indexes of the first repeated data rows
+  forwarded_count: number | null; // Records NiFi accepted, without dropped duplicates, once finished
+}
+
+const DEFAULT_TEMPLATE_HEADERS = ['Security', 'Cost', 'Performance', 'Date', 'Identifier'];
+
+// Validation errors listed in the notification
+const MAX_SHOWN_ERRORS = 5;
+
+const formatValidationErrors = (errors: UploadValidationError[], errorCount: number): string => {
+  // Sheet rows are 1-based and start below the header row
+  const lines = errors.slice(0, MAX_SHOWN_ERRORS).map((error) =>
+    error.row !== null
+      ? `Row ${error.row + 2}, ${error.column}: ${error.message}`
+      : `${error.column}: ${error.message}`
+  );
+  const more = errorCount > lines.length ? ` (and ${errorCount - lines.length} more)` : '';
+  return `Upload rejected: ${lines.join('; ')}${more}`;
+};
+
+// Uploads are queued by the backend; their status is polled until NiFi accepted or rejected them
+const STATUS_POLL_INTERVAL_MS = 1000;
+const STATUS_POLL_TIMEOUT_MS = 10 * 60 * 1000;
+
+const waitForUpload = async (uploadId: string): Promise<UploadStatus | null> => {
+  const deadline = Date.now() + STATUS_POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    const response = await getUploadStatus(uploadId);
+    if (response.status === 'done' || response.status === 'failed') {
+      return response as UploadStatus;
+    }
+    await new Promise((resolve) => setTimeout(resolve, STATUS_POLL_INTERVAL_MS));
+  }
+  return null;
+};
+
+const formatRows = (count: number, indexes: number[]): string => {
+  // Sheet rows are 1-based and start below the header row
+  const rows = indexes.slice(0, MAX_SHOWN_ERRORS).map((row) => row + 2);
+  const more = count > rows.length ? ', ...' : '';
+  return `rows ${rows.join(', ')}${more}`;
+};
+
+const formatDuplicates = (status: UploadStatus): string => {
+  let message = '';
+  if (status.duplicate_count) {
+    message += ` ${status.duplicate_count} records were uploaded before (${formatRows(status.duplicate_count, status.duplicate_rows)}).`;
+  }
+  if (status.repeated_count) {
+    message += ` ${status.repeated_count} rows repeat an earlier row (${formatRows(status.repeated_count, status.repeated_rows)}).`;
+  }
+  return message;
+};
 
 const DataUploadPage: React.FC = () => {
   const [dataUploadType, setDataUploadType] = useState<string>('');
@@ -28,6 +110,7 @@ const DataUploadPage: React.FC = () => {
   const [deliveryDate, setDeliveryDate] = useState<Dayjs | null>(null);
   const [readyToUpload, setReadyToUpload] = useState<boolean>(false);
   const [loading, setLoading] = useState<boolean>(false);
+  const [uploadTypes, setUploadTypes] = useState<UploadType[]>([]);
 
   // Notification state
   const [notification, setNotification] = useState<{
@@ -52,6 +135,23 @@ const DataUploadPage: React.FC = () => {
     setNotification(prev => ({ ...prev, open: false }));
   };
 
+  useEffect(() => {
+    // Load upload types and their columns when component mounts
+    loadUploadTypes();
+  }, []);
+
+  const loadUploadTypes = async () => {
+    try {
+      const response = await getDataUploadTypes();
+      if (response.success) {
+        setUploadTypes(response.upload_types);
+      }
+    } catch (error) {
+      console.error('Error loading upload types:', error);
+      showNotification('Failed to load upload types from the backend.', 'error');
+    }
+  };
+
   const handleDataUploadTypeChange = (event: SelectChangeEvent) => {
     setDataUploadType(event.target.value);
   };
@@ -69,9 +169,10 @@ const DataUploadPage: React.FC = () => {
         const sheets = context.workbook.worksheets;
         const newSheet = sheets.add(dataUploadType);
         
-        // Add headers
-        const headers = ['Security', 'Cost', 'Performance', 'Date', 'Identifier'];
-        const headerRange = newSheet.getRange('A1:E1');
+        // Add headers from the upload type's columns
+        const uploadType = uploadTypes.find((type) => type.name === dataUploadType);
+        const headers = uploadType ? uploadType.columns.map((column) => column.name) : DEFAULT_TEMPLATE_HEADERS;
+        const headerRange = newSheet.getRangeByIndexes(0, 0, 1, headers.length);
         headerRange.values = [headers];
         
         // Format headers
@@ -134,21 +235,14 @@ const DataUploadPage: React.FC = () => {
         const headers = values[0] as string[];
         const dataRows = values.slice(1);
         
-        // Convert to JSON format
-        const jsonData = dataRows.map(row => {
-          const obj: any = {};
-          headers.forEach((header, index) => {
-            obj[header] = row[index];
-          });
-          return obj;
-        });
-
-        // Prepare upload payload
+        // Prepare upload payload in columnar format: headers once, rows as arrays
         const uploadPayload = {
           dataType: dataUploadType,
           skipDuplicateCheck,
           deliveryDate: deliveryDate?.toISOString(),
-          data: jsonData
+          format: 'columnar' as const,
+          columns: headers,
+          rows: dataRows
         };
 
         // Send to backend upload endpoint which will forward to NiFi
@@ -156,10 +250,27 @@ const DataUploadPage: React.FC = () => {
           const response = await uploadData(uploadPayload);
           
           if (response.success) {
-            showNotification(
-              `Successfully uploaded ${response.record_count} records to ${response.data_type}!`, 
-              'success'
-            );
+            // The upload is only queued at this point
+            showNotification(`Sending ${response.record_count} records to ${response.data_type}...`, 'info');
+            const status = await waitForUpload(response.upload_id);
+            if (status === null) {
+              showNotification(
+                `Upload ${response.upload_id} is still in progress, check its status later.`,
+                'warning'
+              );
+            } else if (status.status === 'done' && status.forwarded_count === 0) {
+              showNotification(`Nothing uploaded to ${status.data_type}:${formatDuplicates(status)}`, 'warning');
+            } else if (status.status === 'done') {
+              showNotification(
+                `Successfully uploaded ${status.forwarded_count ?? status.record_count} records to ${status.data_type}!${formatDuplicates(status)}`,
+                status.duplicate_count || status.repeated_count ? 'warning' : 'success'
+              );
+            } else {
+              showNotification(
+                `Upload failed: ${status.error ?? 'unknown error'}${formatDuplicates(status)}`,
+                'error'
+              );
+            }
           } else {
             showNotification(
               `Upload failed: ${response.error}`, 
@@ -171,7 +282,9 @@ const DataUploadPage: React.FC = () => {
           
           // Extract error message from API response
           let errorMessage = 'Upload failed due to server error';
-          if (apiError.response?.data?.error) {
+          if (apiError.response?.data?.errors?.length) {
+            errorMessage = formatValidationErrors(apiError.response.data.errors, apiError.response.data.error_count);
+          } else if (apiError.response?.data?.error) {
             errorMessage = apiError.response.data.error;
           } else if (apiError.message) {
             errorMessage = apiError.message;
@@ -188,11 +301,7 @@ const DataUploadPage: React.FC = () => {
     }
   };
 
-  const dataUploadTypes = [
-    'Windmill Statistics',
-    'Financial Outperformance', 
-    'Excellence Accounting'
-  ];
+  const dataUploadTypes = uploadTypes.map((type) => type.name);
 
   return (
     <Container maxWidth="md" sx={{ mt: 4 }}>